@@ -2,9 +2,11 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from app.config import config
+from app.replica import RoutingSession
 import os
 
-db = SQLAlchemy()
+#Το RoutingSession στέλνει τα reads των GET requests στο read replica (αν υπάρχει)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
 def create_app(config_name=None):
@@ -20,6 +22,30 @@ def create_app(config_name=None):
     # ΔΙΟΡΘΩΣΗ: Πρέπει να περάσουμε το db object στο migrate
     migrate.init_app(app, db)
 
+    from app.token_cache import token_cache
+    from app.retry import retry_stats
+    from app.pool_metrics import pool_metrics
+    from app.group_commit import group_committer
+    from app.account_numbers import account_number_allocator
+    from app.replica import replica_router, REPLICA_BIND
+    token_cache.configure(app.config['TOKEN_CACHE_SIZE'], app.config['TOKEN_CACHE_TTL'])
+    account_number_allocator.reset()
+    replica_router.configure(REPLICA_BIND in app.config['SQLALCHEMY_BINDS'], app.config['REPLICA_STICKY_SECONDS'])
+    #Read-your-writes cookie μετά από writes (μόνο με read replica)
+    app.after_request(replica_router.set_sticky_cookie)
+    group_committer.configure(
+        app,
+        app.config['GROUP_COMMIT_ENABLED'],
+        app.config['GROUP_COMMIT_MAX_WAIT_MS'],
+        app.config['GROUP_COMMIT_MAX_BATCH']
+    )
+
+    # Pool events για checkouts/in-use/overflow (αναφέρονται στο /health)
+    with app.app_context():
+        engines = list(db.engines.values())
+        for engine in engines:
+            pool_metrics.install(engine)
+
     #4.εισάγουμε τα models
     from app import models
 
@@ -40,6 +66,35 @@ def create_app(config_name=None):
     from app.savings import savings_calc_bp
     app.register_blueprint(savings_calc_bp)
 
+    #Per-request metrics (/metrics) - μόνο αν METRICS_ENABLED
+    from app.metrics import init_metrics
+    from app.slow_queries import init_slow_query_log
+    from app.query_budget import init_query_budget
+    with app.app_context():
+        init_metrics(app, *engines)
+        #Slow-query log - μόνο αν SLOW_QUERY_THRESHOLD_MS > 0
+        init_slow_query_log(app, *engines)
+        #Query budgets ανά endpoint (raise στο testing)
+        init_query_budget(app, *engines)
+
+    #CLI commands (flask stats backfill)
+    from app.rollups import stats_cli
+    app.cli.add_command(stats_cli)
+    #flask seed - synthetic δεδομένα για benchmarks
+    from app.seed import seed_command
+    app.cli.add_command(seed_command)
+    #flask idempotency purge - TTL cleanup των Idempotency-Key
+    from app.idempotency import idempotency_cli
+    app.cli.add_command(idempotency_cli)
+    #flask partitions create/detach/list - monthly partitions του transactions
+    from app.partitions import partitions_cli
+    app.cli.add_command(partitions_cli)
+    #flask counters reconcile - rebuild των denormalized counters
+    from app.counters import counters_cli
+    app.cli.add_command(counters_cli)
+    #flask replica sync - αντιγραφή primary -> replica (SQLite)
+    from app.replica import replica_cli
+    app.cli.add_command(replica_cli)
     
     #6 Error handlers - gloabal exception handling
     @app.errorhandler(404)
@@ -56,7 +111,12 @@ def create_app(config_name=None):
         return {
             'status':'healthy',
             'service':'bank-api',
-            'environment':config_name
+            'environment':config_name,
+            'token_cache':token_cache.stats(),
+            'db_retries':retry_stats.stats(),
+            'db_pool':pool_metrics.stats(db.engine),
+            'group_commit':group_committer.stats(),
+            'db_replica':replica_router.stats()
         }, 200
     
     return app
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Account number allocator για την Bank API
+
+Αντί για random αριθμό + SELECT μέχρι να βρεθεί ελεύθερος (collisions που
+αυξάνονται όσο γεμίζει ο πίνακας και race ανάμεσα σε ταυτόχρονα creates),
+κάθε worker process δεσμεύει από τη βάση ένα block αριθμών (hi/lo):
+
+- PostgreSQL: nextval('account_number_seq'), με INCREMENT BY 100
+- SQLite/άλλα: atomic UPDATE στον πίνακα account_number_counters
+
+Η δέσμευση γίνεται σε ΞΕΧΩΡΙΣΤΟ connection/transaction, ώστε ένα
+rollback του request να μην επιστρέφει αριθμούς (κενά είναι αποδεκτά,
+διπλοί αριθμοί όχι) και το counter row να μην μένει κλειδωμένο. Το
+connection ανοίγει εκτός του pool (NullPool), αλλιώς ένα γεμάτο pool από
+requests που περιμένουν το ίδιο block θα κολλούσε μέχρι το pool timeout.
+Μέσα στο block ΔΕΝ γίνεται κανένα DB round-trip.
+
+Μορφή: <TYPE><9 ψηφία><Luhn check digit>, π.χ. SAV0000012344
+"""
+import os
+import threading
+from sqlalchemy import create_engine, update, select, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import NullPool
+from app import db
+from app.models import AccountNumberCounter, account_number_seq
+
+ACCOUNT_NUMBER_BLOCK_SIZE = account_number_seq.increment
+COUNTER_NAME = 'account_number'
+NUMBER_DIGITS = 9
+
+def luhn_check_digit(digits):
+    """Luhn check digit για ένα string από ψηφία"""
+    total = 0
+    # Από δεξιά: κάθε δεύτερο ψηφίο (ξεκινώντας από το πρώτο) διπλασιάζεται
+    for index, digit in enumerate(reversed(digits)):
+        value = int(digit)
+        if index % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+def format_account_number(account_type, number):
+    """'savings', 1234 -> 'SAV0000012344'"""
+    digits = f'{number:0{NUMBER_DIGITS}d}'
+    return f'{account_type[:3].upper()}{digits}{luhn_check_digit(digits)}'
+
+def is_valid_account_number(account_number):
+    """Έλεγχος check digit (μόνο για αριθμούς του allocator)"""
+    digits = account_number[3:]
+    if len(digits) != NUMBER_DIGITS + 1 or not digits.isdigit():
+        return False
+    return luhn_check_digit(digits[:-1]) == digits[-1]
+
+def _reserve_from_counter(conn, blocks):
+    """Atomic UPDATE στο counter row - επιστρέφει την αρχή του πρώτου block"""
+    size = blocks * ACCOUNT_NUMBER_BLOCK_SIZE
+    stmt = update(AccountNumberCounter).where(
+        AccountNumberCounter.name == COUNTER_NAME
+    ).values(next_value=AccountNumberCounter.next_value + size)
+
+    for _ in range(2):
+        if conn.dialect.update_returning:
+            end = conn.execute(stmt.returning(AccountNumberCounter.next_value)).scalar()
+        else:
+            # Το UPDATE κλειδώνει το row, οπότε το SELECT βλέπει τη δική μας τιμή
+            end = None
+            if conn.execute(stmt).rowcount:
+                end = conn.execute(
+                    select(AccountNumberCounter.next_value).where(AccountNumberCounter.name == COUNTER_NAME)
+                ).scalar()
+        if end is not None:
+            return end - size
+
+        # Πρώτη χρήση: δημιουργία του counter row (ένας από τους ταυτόχρονους κερδίζει)
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(AccountNumberCounter).values(name=COUNTER_NAME, next_value=1))
+        except IntegrityError:
+            pass
+    raise RuntimeError('Could not reserve account numbers')
+
+_allocator_engines = {}
+
+def _allocator_engine():
+    """
+    Engine χωρίς pool για τις δεσμεύσεις (ένα connection ανά block)
+    Η in-memory SQLite υπάρχει μόνο στο connection του app, οπότε εκεί
+    χρησιμοποιείται το ίδιο το db.engine
+    """
+    engine = db.engine
+    if engine.url.get_backend_name() == 'sqlite' and engine.url.database in (None, '', ':memory:'):
+        return engine
+    key = engine.url.render_as_string(hide_password=False)
+    if key not in _allocator_engines:
+        _allocator_engines[key] = create_engine(engine.url, poolclass=NullPool)
+    return _allocator_engines[key]
+
+def reserve_blocks(blocks=1):
+    """
+    Δεσμεύει blocks x ACCOUNT_NUMBER_BLOCK_SIZE αριθμούς σε δικό του transaction
+    Επιστρέφει λίστα με τις αρχές των blocks
+    """
+    with _allocator_engine().begin() as conn:
+        if conn.dialect.supports_sequences:
+            return list(conn.execute(
+                select(account_number_seq.next_value()).select_from(
+                    db.func.generate_series(1, blocks).table_valued('n')
+                )
+            ).scalars())
+        start = _reserve_from_counter(conn, blocks)
+        return [start + i * ACCOUNT_NUMBER_BLOCK_SIZE for i in range(blocks)]
+
+def reserve_numbers(count):
+    """Δεσμεύει count αριθμούς (π.χ. για το flask seed) - επιστρέφει λίστα"""
+    blocks = -(-count // ACCOUNT_NUMBER_BLOCK_SIZE)
+    numbers = []
+    for start in reserve_blocks(blocks):
+        numbers.extend(range(start, start + ACCOUNT_NUMBER_BLOCK_SIZE))
+    return numbers[:count]
+
+class AccountNumberAllocator:
+    """Thread-safe allocator με ένα block αριθμών ανά process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Πετάει το τρέχον block (καλείται από το create_app - νέα βάση)"""
+        self._next = 0
+        self._end = 0
+        self._pid = None
+
+    def next_number(self, account_type):
+        with self._lock:
+            # Μετά από fork (gunicorn) το block του parent δεν πρέπει να
+            # ξαναχρησιμοποιηθεί από τα children
+            if self._pid != os.getpid() or self._next >= self._end:
+                self._next = reserve_blocks(1)[0]
+                self._end = self._next + ACCOUNT_NUMBER_BLOCK_SIZE
+                self._pid = os.getpid()
+            number = self._next
+            self._next += 1
+        return format_account_number(account_type, number)
+
+account_number_allocator = AccountNumberAllocator()
@@ -2,20 +2,55 @@ from flask import Blueprint, request, jsonify, current_app, g
 from app import db
 from app.models import User, Account, Transaction
 from app.decorators import token_required
+from app.query_budget import query_budget
+from app.serializers import serialize_accounts, serialize_transactions
+from app.account_numbers import account_number_allocator
+from app.token_cache import token_cache
+from app.etags import compute_etag, etag_matches, not_modified, with_etag
 import jwt
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import func, desc , or_ , and_
+from sqlalchemy import func, desc , or_ , and_, select, update
 from decimal import Decimal
-import random
 
 accounts_bp =  Blueprint('accounts',__name__, url_prefix='/api/accounts')
 
+def _change_account_counts(user_id, active_delta, total_delta=0):
+    """
+    Atomic +/- στα users.active_accounts_count / accounts_count
+    (και νέο version για το ETag)
+    """
+    db.session.execute(
+        update(User).where(User.id == user_id).values(
+            active_accounts_count=User.active_accounts_count + active_delta,
+            accounts_count=User.accounts_count + total_delta,
+            version=User.version + 1
+        )
+    )
+
+def _accounts_list_etag(user_id, versions):
+    """ETag της λίστας ενεργών λογαριασμών από τα (id, version)"""
+    return compute_etag('accounts', user_id, *sorted(f'{account_id}.{version}' for account_id, version in versions))
+
 @accounts_bp.route('/',methods = ['GET'])
+# 3 + το version lookup όταν υπάρχει If-None-Match
+@query_budget(4)
 @token_required
 def get_user_accounts():
     try:
         user = g.current_user
 
+        # Conditional GET: μόνο τα (id, version) - 304 αν δεν άλλαξε τίποτα
+        if request.if_none_match:
+            versions = db.session.execute(
+                select(Account.id, Account.version).where(
+                    Account.user_id == user.id,
+                    Account.is_active == True
+                )
+            ).all()
+            etag = _accounts_list_etag(user.id, versions)
+            if etag_matches(etag):
+                return not_modified(etag)
+
         #1.τρόπος explicit queure
         #accounts = Account.query.filter_by(user_id=user.id).all() 
 
@@ -24,16 +59,17 @@ def get_user_accounts():
             Account.user_id == user.id,
             Account.is_active == True
         ).all()
+        etag = _accounts_list_etag(user.id, [(account.id, account.version) for account in accounts])
 
         if not accounts:
-            return jsonify({
+            return with_etag((jsonify({
                 'status' : 'success',
                 'message': 'No active accounts found for this user'
-                }), 200
+                }), 200), etag)
 
-        return jsonify({
-            'accounts': [account.to_dict() for account in accounts]
-        }), 200
+        return with_etag((jsonify({
+            'accounts': serialize_accounts(accounts)
+        }), 200), etag)
         
     except Exception as e:
         current_app.logger.error(f"Registration error: {str(e)}")
@@ -42,11 +78,26 @@ def get_user_accounts():
         }), 500
 
 @accounts_bp.route('/<int:account_id>',methods = ['GET'])
+# 4 + το version lookup όταν υπάρχει If-None-Match
+@query_budget(5)
 @token_required
 def get_account_details(account_id):
     try:
         user = g.current_user
 
+        # Conditional GET: κάθε αλλαγή balance/activation αυξάνει το version
+        if request.if_none_match:
+            version = db.session.execute(
+                select(Account.version).where(
+                    Account.id == account_id,
+                    Account.user_id == user.id
+                )
+            ).scalar()
+            if version is not None:
+                etag = compute_etag('account', account_id, version)
+                if etag_matches(etag):
+                    return not_modified(etag)
+
         account = Account.query.filter_by(
             id = account_id,
             user_id = user.id,
@@ -59,24 +110,23 @@ def get_account_details(account_id):
             }), 404
         
         # Πάρε τις 5 πιο πρόσφατες συναλλαγές για τον λογαριασμό
-        last_five_transactions = Transaction.query.filter_by(account_id=account_id).order_by(desc(Transaction.created_at)).limit(5).all()
+        # (το count είναι denormalized - χωρίς COUNT(*) στο ledger)
+        last_five_transactions = []
+        if account.transaction_count:
+            last_five_transactions = Transaction.query.filter_by(account_id=account_id).order_by(desc(Transaction.created_at)).limit(5).all()
 
-        # Query για count των transactions χωρίς να τα φορτώσεις όλα
-        transaction_count = db.session.query(func.count()).select_from(Transaction).filter_by(
-            account_id=account_id
-        ).scalar()
-
-        return jsonify({
+        return with_etag((jsonify({
             'account' : account.to_dict(),
-            'transactions_count' : transaction_count,
-            'five_last_transactions' : [tnx.to_dict() for tnx in last_five_transactions]
-        }),200
+            'transactions_count' : account.transaction_count,
+            'five_last_transactions' : serialize_transactions(last_five_transactions)
+        }),200), compute_etag('account', account_id, account.version))
 
     except Exception as e:
         current_app.logger.error(f"Get account details error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @accounts_bp.route('/high_value', methods = ['GET'])
+@query_budget(3)
 @token_required
 def get_high_value_account():
     try:
@@ -100,7 +150,7 @@ def get_high_value_account():
         ).order_by(Account.balance.desc()).all()
 
         return jsonify({
-            'high_value_accounts' : [account.to_dict() for account in high_value_accounts],
+            'high_value_accounts' : serialize_accounts(high_value_accounts),
             'theshold' : threshold,
             'count': len(high_value_accounts)
         })
@@ -110,6 +160,7 @@ def get_high_value_account():
         return jsonify({'error': 'Internal server error'}), 500
 
 @accounts_bp.route('/search', methods=['GET'])
+@query_budget(3)
 @token_required
 def search_accounts():
     """Αναζήτηση λογαριασμών με φίλτρα"""
@@ -166,7 +217,7 @@ def search_accounts():
         accounts = query.all()
         
         return jsonify({
-            'accounts': [account.to_dict() for account in accounts],
+            'accounts': serialize_accounts(accounts),
             'total_found': len(accounts),
             'filters_applied': {
                 'account_type': account_type,
@@ -181,6 +232,8 @@ def search_accounts():
         return jsonify({'error': 'Internal server error'}), 500
 
 @accounts_bp.route('/create', methods = ['POST'])
+# 6 + η δέσμευση νέου block αριθμών (1 στα 100 creates, έως 5 statements)
+@query_budget(11)
 @token_required
 def create_account():
     try:
@@ -212,10 +265,8 @@ def create_account():
                 'error': f'User already has an active {account_type} account'
             }), 409
         
-        account_number = f"{account_type[:3].upper()}{random.randint(100000,9999999)}"
-
-        while Account.query.filter_by(account_number=account_number).first():
-            account_number = f"{account_type[:3].upper()}{random.randint(100000, 999999)}"
+        # Μοναδικός αριθμός από το block του worker - χωρίς lookup στη βάση
+        account_number = account_number_allocator.next_number(account_type)
         
         # Δημιουργία νέου account
         new_account = Account(
@@ -227,7 +278,11 @@ def create_account():
         )
         
         db.session.add(new_account)
+        # Ο user έχει έναν (ενεργό) λογαριασμό παραπάνω - νέο ETag του profile
+        _change_account_counts(user.id, 1, total_delta=1)
         db.session.commit()
+        # Τα cached snapshots έχουν πλέον παλιό version
+        token_cache.invalidate_user(user.id)
         
         return jsonify({
             'message': 'Account created successfully',
@@ -241,6 +296,7 @@ def create_account():
         return jsonify({'error': 'Internal server error'}), 500
     
 @accounts_bp.route('/deactivate_account', methods = ['POST'])
+@query_budget(3)
 @token_required
 def deactivate():
     try:
@@ -254,18 +310,29 @@ def deactivate():
             except Exception:
                 return jsonify({'error': 'Invalid account_id format'}), 400
         
-        account = Account.query.filter_by(
-            id=account_id,
-            user_id=user.id,
-            is_active=True
-        ).first()
+        # Ένα conditional UPDATE: από δύο ταυτόχρονα requests μόνο το ένα
+        # βρίσκει is_active=True, οπότε ο counter αλλάζει μία φορά
+        result = db.session.execute(
+            update(Account).where(
+                Account.id == account_id,
+                Account.user_id == user.id,
+                Account.is_active == True
+            ).values(
+                is_active=False,
+                version=Account.version + 1
+            ).execution_options(synchronize_session=False)
+        )
 
-        if not account:
+        if result.rowcount != 1:
+            db.session.rollback()
             return jsonify({'error': f'Account with id: {account_id} not found'}), 400
 
-        account.is_active = False
+        user_id = user.id
+        _change_account_counts(user_id, -1)
 
         db.session.commit()
+        # user_id και όχι user.id - μετά το commit θα ξαναφόρτωνε τον user
+        token_cache.invalidate_user(user_id)
         
         return jsonify({
             'status' : 'success',
@@ -277,6 +344,7 @@ def deactivate():
         return jsonify({'error': 'Internal server error'}), 500  
 
 @accounts_bp.route('/activate_account', methods = ['POST'])
+@query_budget(3)
 @token_required
 def activate_account():
     try:
@@ -290,18 +358,29 @@ def activate_account():
             except Exception:
                 return jsonify({'error': 'Invalid account_id format'}), 400
         
-        account = Account.query.filter_by(
-            id=account_id,
-            user_id=user.id,
-            is_active=False
-        ).first()
+        # Ένα conditional UPDATE: από δύο ταυτόχρονα requests μόνο το ένα
+        # βρίσκει is_active=False, οπότε ο counter αλλάζει μία φορά
+        result = db.session.execute(
+            update(Account).where(
+                Account.id == account_id,
+                Account.user_id == user.id,
+                Account.is_active == False
+            ).values(
+                is_active=True,
+                version=Account.version + 1
+            ).execution_options(synchronize_session=False)
+        )
 
-        if not account:
+        if result.rowcount != 1:
+            db.session.rollback()
             return jsonify({'error': f'Account with id: {account_id} not found'}), 400
-    
-        account.is_active = True
+
+        user_id = user.id
+        _change_account_counts(user_id, 1)
 
         db.session.commit()
+        # user_id και όχι user.id - μετά το commit θα ξαναφόρτωνε τον user
+        token_cache.invalidate_user(user_id)
 
         return jsonify({
             'status' : 'success',
@@ -6,6 +6,9 @@ from flask import Blueprint, request, jsonify, current_app, g
 from app import db
 from app.models import User
 from app.decorators import token_required
+from app.query_budget import query_budget
+from app.token_cache import token_cache
+from app.etags import compute_etag, etag_matches, not_modified, with_etag
 import jwt
 from datetime import datetime, timedelta, timezone
 import re
@@ -52,6 +55,7 @@ def generate_token(user_id):
         return None
 
 @auth_bp.route('/register',methods=['POST'])
+@query_budget(4)
 def register():
     try:
         #λήψη δεδομένων από το request
@@ -130,6 +134,7 @@ def register():
         }), 500
 
 @auth_bp.route('/login', methods=['POST'])
+@query_budget(2)
 def login():
     try:
         data = request.get_json()
@@ -172,6 +177,9 @@ def login():
         }), 500
     
 @auth_bp.route('/profile', methods=['GET'])
+# 1 read του user (cache miss: στο token_required, cache hit: εδώ)
+# + το fallback στο primary για νέο user που δεν έφτασε στο replica
+@query_budget(2)
 @token_required
 def get_profile():
     """
@@ -181,10 +189,20 @@ def get_profile():
     """
     try:
         user  = g.current_user
-        return jsonify({
+
+        # Body και ETag από τη βάση, όχι από το token cache: ένα update του
+        # profile ή των λογαριασμών σε άλλο worker δεν κάνει invalidate το
+        # snapshot αυτού του process
+        if g.token_cache_hit:
+            db.session.refresh(user)
+        etag = compute_etag('profile', user.id, user.version)
+        if etag_matches(etag):
+            return not_modified(etag)
+
+        return with_etag((jsonify({
             'message': 'Profile retrieved successfully',
             'user': user.to_dict()
-        }), 200
+        }), 200), etag)
     except Exception as e:
         current_app.logger.error(f"Profile error: {str(e)}")
         return jsonify({
@@ -192,6 +210,7 @@ def get_profile():
         }), 500
 
 @auth_bp.route('/update', methods=['POST'])
+@query_budget(3)
 @token_required
 def update_profile():
     try:
@@ -210,7 +229,10 @@ def update_profile():
         
         if updated:
             user.updated_at = datetime.now(timezone.utc)
+            user.version = User.version + 1
             db.session.commit()
+            # Τα cached snapshots του user είναι πλέον stale
+            token_cache.invalidate_user(user.id)
             return jsonify({
                 'status' : 'success',
                 'message' : 'Profile updated successfully'
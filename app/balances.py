@@ -0,0 +1,77 @@
+"""
+Atomic balance updates για την Bank API
+
+Αντί για read-modify-write μέσω ORM (account.balance -= amount), κάθε
+αλλαγή υπολοίπου είναι ΕΝΑ conditional UPDATE:
+
+    UPDATE accounts SET balance = balance - :amt
+    WHERE id = :id AND is_active AND balance >= :amt
+    RETURNING balance
+
+Η βάση κάνει τον έλεγχο και την αλλαγή ατομικά, οπότε δεν χάνονται
+updates σε concurrent requests. Κάθε αλλαγή υπολοίπου γράφει ακριβώς μία
+Transaction γραμμή για τον λογαριασμό, οπότε το ίδιο UPDATE ενημερώνει
+και τα transaction_count / last_transaction_at. Σε dialects χωρίς RETURNING κάνουμε
+UPDATE + SELECT μέσα στο ίδιο DB transaction.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import update, select
+from app import db
+from app.models import Account
+
+def _apply_balance_change(account_id, delta, user_id=None, require_funds=None, at=None):
+    """
+    Εκτελεί το conditional UPDATE και επιστρέφει το νέο balance
+    ή None αν καμία γραμμή δεν ταίριαξε (ανύπαρκτο/inactive account,
+    λάθος owner ή ανεπαρκές υπόλοιπο)
+    at: το created_at της Transaction που θα γραφτεί (last_transaction_at)
+    """
+    if at is None:
+        at = datetime.now(timezone.utc)
+    conditions = [Account.id == account_id, Account.is_active == True]
+    if user_id is not None:
+        conditions.append(Account.user_id == user_id)
+    if require_funds is not None:
+        conditions.append(Account.balance >= require_funds)
+
+    stmt = update(Account).where(*conditions).values(
+        balance=Account.balance + delta,
+        # Κάθε αλλαγή υπολοίπου ακυρώνει τα ETags του λογαριασμού
+        version=Account.version + 1,
+        transaction_count=Account.transaction_count + 1,
+        last_transaction_at=at,
+        updated_at=at
+    ).execution_options(synchronize_session=False)
+
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(stmt.returning(Account.balance)).scalar()
+
+    # Fallback: χωρίς RETURNING - το SELECT βλέπει το δικό μας uncommitted UPDATE
+    result = db.session.execute(stmt)
+    if result.rowcount == 0:
+        return None
+    return db.session.execute(
+        select(Account.balance).where(Account.id == account_id)
+    ).scalar()
+
+def credit_account(account_id, amount, user_id=None, at=None):
+    """Πίστωση λογαριασμού. Επιστρέφει το νέο balance ή None"""
+    return _apply_balance_change(account_id, amount, user_id=user_id, at=at)
+
+def debit_account(account_id, amount, user_id=None, at=None):
+    """
+    Χρέωση λογαριασμού μόνο αν υπάρχει επαρκές υπόλοιπο
+    Επιστρέφει το νέο balance ή None
+    """
+    return _apply_balance_change(account_id, -amount, user_id=user_id, require_funds=amount, at=at)
+
+def lock_accounts(account_ids):
+    """
+    SELECT ... FOR UPDATE στους λογαριασμούς με ΑΥΞΟΥΣΑ σειρά id
+    Η σταθερή σειρά κλειδώματος αποκλείει deadlocks μεταξύ αντίθετων transfers
+    (στο SQLite το FOR UPDATE παραλείπεται - εκεί ο writer lock είναι database-wide)
+    """
+    for account_id in sorted(set(account_ids)):
+        db.session.execute(
+            select(Account.id).where(Account.id == account_id).with_for_update()
+        )
@@ -4,6 +4,22 @@ from dotenv import load_dotenv
 # Φορτώνουμε τις environment variables από το .env αρχείο
 load_dotenv()
 
+def engine_options(pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS για το connection pool
+    Τα defaults ανά environment μπορούν να αλλάξουν από env vars (DB_POOL_*)
+    Σαν το spring.datasource.hikari.* στο Spring Boot
+    """
+    from app.pool_metrics import InstrumentedQueuePool
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.environ.get('DB_POOL_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', pool_timeout)),  # seconds αναμονής για connection
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),  # seconds πριν ανανεωθεί ένα connection
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', str(pool_pre_ping)).lower() == 'true'
+    }
+
 class Config:
     """
     Βασική κλάση configuration - κοινές ρυθμίσεις για όλα τα environments
@@ -18,12 +34,71 @@ class Config:
     # Σαν το spring.datasource.url
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     
+    # Read replica (optional): τα GET requests με token διαβάζουν από εδώ,
+    # εκτός από όσους users έγραψαν τα τελευταία REPLICA_STICKY_SECONDS
+    SQLALCHEMY_BINDS = {'replica': os.environ['DATABASE_REPLICA_URL']} if os.environ.get('DATABASE_REPLICA_URL') else {}
+    REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    
     # Απενεργοποιεί το SQLAlchemy event system (performance optimization)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # JWT settings
     JWT_SECRET_KEY = os.environ.get('SECRET_KEY') or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 ώρα σε seconds
+    
+    # Cache για decoded tokens + user snapshots στο token_required
+    # TOKEN_CACHE_SIZE=0 το απενεργοποιεί
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+    TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 60))  # seconds
+    
+    # Retry για deadlocks / serialization failures στα transfers
+    DB_RETRY_MAX_ATTEMPTS = int(os.environ.get('DB_RETRY_MAX_ATTEMPTS', 5))
+    DB_RETRY_BASE_DELAY = float(os.environ.get('DB_RETRY_BASE_DELAY', 0.01))  # seconds
+    
+    # Μέγιστος αριθμός items σε ένα POST /api/transactions/batch
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 1000))
+    
+    # Idempotency-Key: πόσο κρατάμε τις αποθηκευμένες απαντήσεις
+    # (flask idempotency purge) και πόσες γραμμές σβήνονται ανά batch
+    IDEMPOTENCY_KEY_TTL_HOURS = int(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+    IDEMPOTENCY_PURGE_BATCH_SIZE = int(os.environ.get('IDEMPOTENCY_PURGE_BATCH_SIZE', 1000))
+    
+    # Monthly partitions του transactions (μόνο PostgreSQL): πόσους μήνες
+    # μπροστά δημιουργεί το `flask partitions create` και πόσους κρατάει το
+    # `flask partitions detach`
+    TRANSACTION_PARTITIONS_AHEAD = int(os.environ.get('TRANSACTION_PARTITIONS_AHEAD', 3))
+    TRANSACTION_PARTITION_RETENTION_MONTHS = int(os.environ.get('TRANSACTION_PARTITION_RETENTION_MONTHS', 24))
+    
+    # Description search: indexed path (pg_trgm / FTS5) όταν υπάρχει. Στο SQLite,
+    # πάνω από SEARCH_FTS_MAX_CANDIDATES matches στον FTS5 index (όλων των
+    # users) γίνεται ILIKE στο ledger του user
+    SEARCH_INDEX_ENABLED = os.environ.get('SEARCH_INDEX_ENABLED', 'true').lower() == 'true'
+    SEARCH_FTS_MAX_CANDIDATES = int(os.environ.get('SEARCH_FTS_MAX_CANDIDATES', 1000))
+    
+    # Group commit για deposit/withdraw: τα ταυτόχρονα requests ενός worker
+    # γίνονται commit μαζί (max αναμονή GROUP_COMMIT_MAX_WAIT_MS)
+    GROUP_COMMIT_ENABLED = os.environ.get('GROUP_COMMIT_ENABLED', 'false').lower() == 'true'
+    GROUP_COMMIT_MAX_WAIT_MS = float(os.environ.get('GROUP_COMMIT_MAX_WAIT_MS', 2))
+    GROUP_COMMIT_MAX_BATCH = int(os.environ.get('GROUP_COMMIT_MAX_BATCH', 64))
+    
+    # Savings calculator: 'sql' (aggregates στη βάση) ή 'vectorized' (numpy/array)
+    SAVINGS_CALC_MODE = os.environ.get('SAVINGS_CALC_MODE', 'sql')
+    
+    # Per-request latency / SQL metrics σε Prometheus format στο /metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    
+    # Slow-query log: statements πάνω από το threshold (0 = απενεργοποιημένο)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 0))
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE', 'logs/slow_queries.log')
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.environ.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUP_COUNT = int(os.environ.get('SLOW_QUERY_LOG_BACKUP_COUNT', 5))
+    # Ποσοστό (0-1) των slow queries για τα οποία κρατάμε EXPLAIN output
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0))
+    # EXPLAIN ANALYZE ξανατρέχει το SELECT - μόνο όταν χρειάζεται
+    SLOW_QUERY_EXPLAIN_ANALYZE = os.environ.get('SLOW_QUERY_EXPLAIN_ANALYZE', 'false').lower() == 'true'
+    
+    # Query budgets ανά endpoint (@query_budget): 'off', 'warn' ή 'raise'
+    QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'off')
 
 class DevelopmentConfig(Config):
     """
@@ -33,6 +108,10 @@ class DevelopmentConfig(Config):
     DEBUG = True
     # Εκτυπώνει τα SQL queries στο console (για debugging)
     SQLALCHEMY_ECHO = True
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        pool_size=5, max_overflow=5, pool_timeout=10, pool_recycle=1800, pool_pre_ping=True
+    )
+    QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'warn')
 
 class ProductionConfig(Config):
     """
@@ -41,12 +120,22 @@ class ProductionConfig(Config):
     """
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    # Ανά gunicorn worker: pool_size + max_overflow connections το πολύ
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        pool_size=10, max_overflow=20, pool_timeout=30, pool_recycle=1800, pool_pre_ping=True
+    )
 
 class TestingConfig(Config):
     """Configuration για unit tests"""
     TESTING = True
     # Χρησιμοποιούμε in-memory SQLite για tests
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # Ένα in-memory replica θα ήταν άλλη (άδεια) βάση
+    SQLALCHEMY_BINDS = {}
+    # Το in-memory SQLite χρειάζεται το StaticPool του Flask-SQLAlchemy
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # Στα tests κάθε υπέρβαση query budget είναι λάθος (N+1 regressions)
+    QUERY_BUDGET_MODE = 'raise'
 
 # Dictionary για εύκολη επιλογή configuration
 # Στο Spring Boot αυτό γίνεται με profiles
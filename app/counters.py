@@ -0,0 +1,94 @@
+"""
+Denormalized counters για την Bank API
+
+- accounts.transaction_count / last_transaction_at: στο ίδιο UPDATE με
+  το balance (app/balances.py) ή στο write-back του batch
+- users.accounts_count: create account
+- users.active_accounts_count: create/activate/deactivate account
+
+Όλα ενημερώνονται μέσα στο ίδιο DB transaction με την αλλαγή. Το
+`flask counters reconcile` τα ξαναϋπολογίζει από τα transactions/accounts
+(π.χ. μετά από χειροκίνητες αλλαγές ή restore) και διορθώνει μόνο όσες
+γραμμές διαφέρουν - καλύτερα σε ήσυχη ώρα, γιατί ένα deposit που γίνεται
+commit την ίδια στιγμή μπορεί να μη μετρηθεί.
+"""
+import click
+from flask.cli import AppGroup
+from sqlalchemy import update, select, func, or_
+from app import db
+from app.models import User, Account, Transaction
+
+RECONCILE_BATCH_SIZE = 1000
+
+counters_cli = AppGroup('counters', help='Denormalized counter maintenance commands')
+
+def _reconcile_batches(model, fix, batch_size):
+    """Εκτελεί το fix(first_id, last_id) σε εύρη id - μικρά transactions"""
+    max_id = db.session.query(func.max(model.id)).scalar() or 0
+    fixed = 0
+    for first_id in range(1, max_id + 1, batch_size):
+        try:
+            result = db.session.execute(fix(first_id, first_id + batch_size - 1))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        fixed += result.rowcount
+    return fixed
+
+def reconcile_account_counters(batch_size=RECONCILE_BATCH_SIZE):
+    """Επιστρέφει πόσοι λογαριασμοί διορθώθηκαν"""
+    transaction_count = select(func.count(Transaction.id)).where(
+        Transaction.account_id == Account.id
+    ).scalar_subquery()
+    last_transaction_at = select(func.max(Transaction.created_at)).where(
+        Transaction.account_id == Account.id
+    ).scalar_subquery()
+
+    def fix(first_id, last_id):
+        return update(Account).where(
+            Account.id.between(first_id, last_id),
+            or_(
+                Account.transaction_count != transaction_count,
+                Account.last_transaction_at.is_distinct_from(last_transaction_at)
+            )
+        ).values(
+            transaction_count=transaction_count,
+            last_transaction_at=last_transaction_at,
+            version=Account.version + 1
+        ).execution_options(synchronize_session=False)
+
+    return _reconcile_batches(Account, fix, batch_size)
+
+def reconcile_user_counters(batch_size=RECONCILE_BATCH_SIZE):
+    """Επιστρέφει πόσοι users διορθώθηκαν"""
+    accounts_count = select(func.count(Account.id)).where(
+        Account.user_id == User.id
+    ).scalar_subquery()
+    active_accounts_count = select(func.count(Account.id)).where(
+        Account.user_id == User.id,
+        Account.is_active == True
+    ).scalar_subquery()
+
+    def fix(first_id, last_id):
+        return update(User).where(
+            User.id.between(first_id, last_id),
+            or_(
+                User.accounts_count != accounts_count,
+                User.active_accounts_count != active_accounts_count
+            )
+        ).values(
+            accounts_count=accounts_count,
+            active_accounts_count=active_accounts_count,
+            version=User.version + 1
+        ).execution_options(synchronize_session=False)
+
+    return _reconcile_batches(User, fix, batch_size)
+
+@counters_cli.command('reconcile')
+@click.option('--batch-size', type=int, default=RECONCILE_BATCH_SIZE, show_default=True, help='Γραμμές ανά transaction')
+def reconcile_command(batch_size):
+    """Ξαναϋπολογίζει τα denormalized counters και διορθώνει όσα διαφέρουν"""
+    accounts = reconcile_account_counters(batch_size)
+    users = reconcile_user_counters(batch_size)
+    click.echo(f'Reconciled {accounts} accounts and {users} users')
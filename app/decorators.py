@@ -5,7 +5,21 @@ Authentication Decorators για Bank API
 from functools import wraps
 from flask import request, jsonify, current_app, g
 import jwt
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
 from app.models import User
+from app.token_cache import token_cache
+from app.replica import replica_router, READ_ONLY_METHODS
+
+def user_from_snapshot(snapshot):
+    """
+    Ξαναφτιάχνει persistent User object από cached snapshot χωρίς query
+    Οι στήλες που δεν είναι στο snapshot (π.χ. password_hash) και τα
+    relationships φορτώνονται lazily μόνο αν τα χρειαστεί ο handler
+    """
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
 
 def token_required(f):
     """
@@ -36,16 +50,37 @@ def token_required(f):
             }), 401
         
         try:
-            # Decode και validate το JWT token
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user_id = data['user_id']
+            cached = token_cache.get(token)
+            if cached is not None:
+                # Cache hit: ούτε jwt.decode ούτε DB query
+                _, snapshot = cached
+                current_user_id = snapshot['id']
+            else:
+                # Decode και validate το JWT token
+                data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+                current_user_id = data['user_id']
             
-            # Βρες τον user στη βάση
-            current_user = User.query.get(current_user_id)
-            if not current_user:
-                return jsonify({
-                    'error': 'User not found'
-                }), 401
+            # GET/HEAD -> read replica, εκτός αν ο user έγραψε πρόσφατα
+            replica_router.route_request(current_user_id)
+            
+            if cached is not None:
+                current_user = user_from_snapshot(snapshot)
+            else:
+                # Βρες τον user στη βάση
+                current_user = User.query.get(current_user_id)
+                if not current_user and g.db_replica:
+                    # Νέος user που δεν έχει φτάσει ακόμα στο replica
+                    g.db_replica = False
+                    current_user = User.query.get(current_user_id)
+                if not current_user:
+                    return jsonify({
+                        'error': 'User not found'
+                    }), 401
+                
+                token_cache.put(token, data, current_user)
+            
+            # True αν ο user ήρθε από cached snapshot (όχι από τη βάση)
+            g.token_cache_hit = cached is not None
             
             # Αποθήκευσε τον current user στο Flask g object
             # Έτσι μπορούμε να τον χρησιμοποιήσουμε σε οποιαδήποτε protected route
@@ -66,7 +101,12 @@ def token_required(f):
             }), 401
         
         # Αν όλα πάνε καλά, κάλεσε την αρχική function
-        return f(*args, **kwargs)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            if request.method not in READ_ONLY_METHODS:
+                # Read-your-writes: τα επόμενα reads του user από το primary
+                replica_router.record_write(current_user_id)
     
     return decorated
 
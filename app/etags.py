@@ -0,0 +1,37 @@
+"""
+ETag / conditional GET για τα endpoints που κάνουν poll τα dashboards
+
+Τα Account και User έχουν version counter που αυξάνεται σε κάθε αλλαγή
+(balance, activation, profile update, νέο account). Το ETag βγαίνει από
+τα versions, οπότε ένα If-None-Match απαντιέται με 304 μετά από ΕΝΑ
+μικρό lookup των versions - χωρίς να φορτωθούν/σειριοποιηθούν δεδομένα.
+
+Η απόφαση για 304 παίρνεται πάντα με φρέσκα versions από τη βάση (ποτέ
+από το token cache), οπότε ένα παλιό ETag δεν κρατάει stale απάντηση.
+"""
+import hashlib
+from flask import request, make_response
+
+def compute_etag(*parts):
+    """Σταθερό ETag (χωρίς quotes) από scope + versions"""
+    raw = ':'.join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:32]
+
+def etag_matches(etag):
+    """True αν το If-None-Match του request περιέχει το etag (ή *)"""
+    return request.if_none_match.contains(etag) or request.if_none_match.star_tag
+
+def not_modified(etag):
+    """Κενή 304 απάντηση με το ETag"""
+    response = make_response('', 304)
+    return with_etag(response, etag)
+
+def with_etag(response, etag):
+    """
+    Βάζει ETag + Cache-Control σε (body, status) ή Response
+    no-cache: ο client κρατάει την απάντηση αλλά κάνει πάντα revalidate
+    """
+    response = make_response(response)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,175 @@
+"""
+Group commit για deposits/withdrawals
+
+Κάθε deposit/withdraw κάνει το δικό του commit, οπότε το throughput
+φράσσεται από το fsync latency της βάσης. Με GROUP_COMMIT_ENABLED τα
+ταυτόχρονα requests ενός worker process μπαίνουν σε ουρά και ένα
+background thread τα εκτελεί σε ΕΝΑ DB transaction:
+
+- το batch κλείνει μετά από GROUP_COMMIT_MAX_WAIT_MS από το πρώτο
+  request ή όταν φτάσει τα GROUP_COMMIT_MAX_BATCH items
+- κάθε operation επιστρέφει τη δική της απάντηση (body, status) - τα
+  business errors (404, insufficient funds) δεν αλλάζουν τίποτα στη βάση,
+  οπότε δεν επηρεάζουν τα υπόλοιπα items
+- αν μια operation πετάξει exception, γίνεται rollback ΟΛΟΥ του batch,
+  η operation απαντά 500 και το batch ξανατρέχει χωρίς αυτήν
+  (χωρίς savepoints - το pysqlite δεν τα υποστηρίζει σωστά)
+- αν αποτύχει το ίδιο το commit, όλα τα items του batch απαντούν 500
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from app import db
+
+logger = logging.getLogger('bank.group_commit')
+
+INTERNAL_ERROR = ({'error': 'Internal server error'}, 500)
+
+class _Operation:
+    __slots__ = ('func', 'args', 'result', 'done')
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+        self.result = None
+        self.done = threading.Event()
+
+    def finish(self, result):
+        self.result = result
+        self.done.set()
+
+class GroupCommitter:
+    """Batching queue + flusher thread (ένα ανά worker process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self.app = None
+        self.enabled = False
+        self.max_wait = 0.002
+        self.max_batch = 64
+        self.reset_stats()
+
+    def configure(self, app, enabled, max_wait_ms, max_batch):
+        """Ρυθμίσεις από το app config (καλείται από το create_app)"""
+        with self._lock:
+            self.app = app
+            self.enabled = enabled
+            self.max_wait = max_wait_ms / 1000.0
+            self.max_batch = max(1, max_batch)
+
+    def reset_stats(self):
+        self.batches = 0
+        self.operations = 0
+        self.failed_operations = 0
+        self.failed_commits = 0
+        self.largest_batch = 0
+
+    def submit(self, func, *args):
+        """
+        Εκτελεί func(*args) μέσα σε ένα κοινό DB transaction και περιμένει
+        το commit. Η func ΔΕΝ κάνει commit/rollback και επιστρέφει (body, status)
+        """
+        self._ensure_worker()
+        operation = _Operation(func, args)
+        self._queue.put(operation)
+        operation.done.wait()
+        return operation.result
+
+    def _ensure_worker(self):
+        # Μετά από fork (gunicorn) το thread του parent δεν υπάρχει στο child
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != pid or not self._thread.is_alive():
+                if self._pid != pid:
+                    self._queue = queue.Queue()
+                self._pid = pid
+                self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                with self.app.app_context():
+                    self._commit_batch(batch)
+            except Exception:
+                logger.exception('Group commit flusher error')
+                for operation in batch:
+                    if not operation.done.is_set():
+                        operation.finish(INTERNAL_ERROR)
+
+    def _commit_batch(self, batch):
+        pending = list(batch)
+        failed = []
+        try:
+            while pending:
+                results = []
+                try:
+                    for operation in pending:
+                        result = operation.func(*operation.args)
+                        # Flush ανά operation, ώστε ένα IntegrityError (π.χ. διπλό
+                        # Idempotency-Key) να χρεωθεί στην operation που το προκάλεσε
+                        db.session.flush()
+                        results.append(result)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('Group commit operation failed')
+                    failed.append(pending.pop(len(results)))
+                    self.failed_operations += 1
+                    continue
+
+                try:
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('Group commit failed for %d operations', len(pending))
+                    self.failed_commits += 1
+                    failed.extend(pending)
+                    return
+
+                self.batches += 1
+                self.operations += len(pending)
+                self.largest_batch = max(self.largest_batch, len(pending))
+                for operation, result in zip(pending, results):
+                    operation.finish(result)
+                return
+        finally:
+            # Οι αποτυχημένες απαντούν ΜΕΤΑ το commit των υπολοίπων, ώστε π.χ.
+            # ένα διπλό Idempotency-Key να βρει την αποθηκευμένη απάντηση
+            for operation in failed:
+                operation.finish(INTERNAL_ERROR)
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+            'max_batch': self.max_batch,
+            'batches': self.batches,
+            'operations': self.operations,
+            'avg_batch_size': round(self.operations / self.batches, 2) if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'failed_operations': self.failed_operations,
+            'failed_commits': self.failed_commits
+        }
+
+group_committer = GroupCommitter()
@@ -0,0 +1,141 @@
+"""
+Idempotency-Key για τα money-moving POST endpoints (deposit/withdraw/transfer)
+
+- Ο client στέλνει `Idempotency-Key: <uuid>` και επαναλαμβάνει το ίδιο
+  request με το ίδιο key σε timeout
+- Η επιτυχημένη απάντηση αποθηκεύεται στον πίνακα idempotency_keys μέσα
+  στο ΙΔΙΟ DB transaction με τη συναλλαγή (record_idempotent_response
+  πριν το commit), οπότε δεν υπάρχει παράθυρο double-post
+- Ένα retry απαντιέται από την αποθηκευμένη απάντηση με ένα lookup στο
+  unique index (user_id, key), χωρίς validation/locks/commit
+- Το ίδιο key με διαφορετικό body => 422
+- Οι απαντήσεις σφάλματος (400/404) δεν αποθηκεύονται: δεν άλλαξαν τίποτα
+  στη βάση, οπότε ένα retry απλώς ξαναελέγχεται
+- `flask idempotency purge` σβήνει τα keys παλαιότερα από το TTL σε batches
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+import click
+from flask import request, jsonify, current_app, g
+from flask.cli import AppGroup
+from sqlalchemy import delete, select
+from app import db
+from app.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+idempotency_cli = AppGroup('idempotency', help='Idempotency key maintenance commands')
+
+def request_fingerprint():
+    """sha256 του method + path + canonical JSON body"""
+    body = request.get_json(silent=True)
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f'{request.method} {request.path} {canonical}'.encode()).hexdigest()
+
+def _replay(stored):
+    response = jsonify(json.loads(stored.response_body))
+    response.status_code = stored.response_status
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def _find(user_id, key):
+    return db.session.execute(
+        select(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    ).scalar_one_or_none()
+
+def idempotent(f):
+    """
+    Decorator για POST endpoints - μπαίνει ΚΑΤΩ από το @token_required
+    Χωρίς Idempotency-Key header το endpoint τρέχει κανονικά
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return f(*args, **kwargs)
+
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters'}), 400
+
+        user_id = g.current_user.id
+        fingerprint = request_fingerprint()
+
+        stored = _find(user_id, key)
+        if stored is not None:
+            if stored.request_hash != fingerprint:
+                return jsonify({'error': f'{IDEMPOTENCY_HEADER} was already used with a different request'}), 422
+            return _replay(stored)
+
+        g.idempotency = (key, fingerprint)
+        result = f(*args, **kwargs)
+
+        # Δύο ταυτόχρονα requests με το ίδιο key: το δεύτερο commit αποτυγχάνει
+        # στο unique constraint (και κάνει rollback ΟΛΗ τη συναλλαγή), οπότε
+        # απαντάμε με ό,τι αποθήκευσε το πρώτο
+        response = current_app.make_response(result)
+        if response.status_code >= 500:
+            db.session.rollback()
+            stored = _find(user_id, key)
+            if stored is not None and stored.request_hash == fingerprint:
+                return _replay(stored)
+        return response
+
+    return decorated
+
+def record_idempotent_response(body, status):
+    """
+    Αποθηκεύει την απάντηση για το Idempotency-Key του request (αν υπάρχει)
+    Πρέπει να καλείται ΠΡΙΝ το db.session.commit() της συναλλαγής
+    """
+    store_idempotent_response(g.current_user.id, g.get('idempotency'), body, status)
+
+def store_idempotent_response(user_id, idempotency, body, status):
+    """
+    Όπως το record_idempotent_response, αλλά χωρίς request context
+    (π.χ. από το group-commit thread) - idempotency είναι το g.idempotency
+    """
+    if idempotency is None:
+        return
+    key, fingerprint = idempotency
+    db.session.add(IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=fingerprint,
+        response_status=status,
+        response_body=current_app.json.dumps(body)
+    ))
+
+def purge_expired_keys(ttl_hours, batch_size):
+    """
+    Σβήνει keys παλαιότερα από το TTL σε batches (μικρά transactions,
+    χωρίς μακριά locks). Επιστρέφει πόσες γραμμές σβήστηκαν
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
+    deleted = 0
+    while True:
+        batch = select(IdempotencyKey.id).where(IdempotencyKey.created_at < cutoff).limit(batch_size)
+        try:
+            result = db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(batch.scalar_subquery())))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+@idempotency_cli.command('purge')
+@click.option('--ttl-hours', type=int, default=None, help='Default: IDEMPOTENCY_KEY_TTL_HOURS')
+@click.option('--batch-size', type=int, default=None, help='Default: IDEMPOTENCY_PURGE_BATCH_SIZE')
+def purge_command(ttl_hours, batch_size):
+    """Σβήνει τα Idempotency-Key records που έληξαν"""
+    if ttl_hours is None:
+        ttl_hours = current_app.config.get('IDEMPOTENCY_KEY_TTL_HOURS', 24)
+    if batch_size is None:
+        batch_size = current_app.config.get('IDEMPOTENCY_PURGE_BATCH_SIZE', 1000)
+    deleted = purge_expired_keys(ttl_hours, batch_size)
+    click.echo(f'Purged {deleted} idempotency keys older than {ttl_hours}h')
@@ -0,0 +1,152 @@
+"""
+Per-request metrics για την Bank API (Prometheus text format στο /metrics)
+
+Ανά endpoint (blueprint.function) καταγράφουμε:
+- latency του request
+- πλήθος και συνολικό χρόνο SQL statements (before/after_cursor_execute)
+- χρόνο JSON serialization (μέσω instrumented JSON provider)
+- μέγεθος response
+
+Όταν METRICS_ENABLED=false δεν καταχωρείται κανένα hook, οπότε το
+overhead είναι μηδενικό.
+"""
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request, has_request_context, Response
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+class Histogram:
+    """Απλό Prometheus histogram με labels (thread-safe μέσω του registry lock)"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, label_names):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            base = ','.join(f'{k}="{v}"' for k, v in zip(label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{base}}} {total}')
+            lines.append(f'{self.name}_count{{{base}}} {count}')
+        return lines
+
+class MetricsRegistry:
+    """Όλα τα metrics του process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.latency = Histogram('bank_http_request_duration_seconds', 'Request latency per endpoint', LATENCY_BUCKETS)
+        self.sql_count = Histogram('bank_sql_statements_per_request', 'SQL statements executed per request', QUERY_COUNT_BUCKETS)
+        self.sql_time = Histogram('bank_sql_duration_seconds_per_request', 'Total SQL time per request', LATENCY_BUCKETS)
+        self.serialization = Histogram('bank_serialization_duration_seconds', 'JSON serialization time per request', LATENCY_BUCKETS)
+        self.response_size = Histogram('bank_http_response_size_bytes', 'Response body size per endpoint', SIZE_BUCKETS)
+
+    def record(self, endpoint, method, status, latency, sql_count, sql_time, serialization, size):
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            labels = (endpoint,)
+            self.latency.observe(labels, latency)
+            self.sql_count.observe(labels, sql_count)
+            self.sql_time.observe(labels, sql_time)
+            self.serialization.observe(labels, serialization)
+            if size is not None:
+                self.response_size.observe(labels, size)
+
+    def render(self):
+        with self._lock:
+            lines = ['# HELP bank_http_requests_total Requests per endpoint, method and status',
+                     '# TYPE bank_http_requests_total counter']
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'bank_http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}'
+                )
+            for histogram in (self.latency, self.sql_count, self.sql_time, self.serialization, self.response_size):
+                lines.extend(histogram.render(('endpoint',)))
+        return '\n'.join(lines) + '\n'
+
+metrics_registry = MetricsRegistry()
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """JSON provider που μετράει τον χρόνο serialization του jsonify()"""
+
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            if has_request_context() and hasattr(g, 'metrics_serialization'):
+                g.metrics_serialization += time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context() and hasattr(g, 'metrics_sql_count'):
+        g.metrics_sql_count += 1
+        g.metrics_sql_time += elapsed
+
+def init_metrics(app, *engines):
+    """Καταχωρεί hooks και /metrics endpoint - μόνο αν METRICS_ENABLED"""
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    app.json = InstrumentedJSONProvider(app)
+
+    for engine in engines:
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        g.metrics_sql_count = 0
+        g.metrics_sql_time = 0.0
+        g.metrics_serialization = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        if not hasattr(g, 'metrics_start') or request.endpoint == 'metrics':
+            return response
+        metrics_registry.record(
+            endpoint=request.endpoint or 'unmatched',
+            method=request.method,
+            status=response.status_code,
+            latency=time.perf_counter() - g.metrics_start,
+            sql_count=g.metrics_sql_count,
+            sql_time=g.metrics_sql_time,
+            serialization=g.metrics_serialization,
+            size=None if response.is_streamed else response.calculate_content_length()
+        )
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
@@ -6,6 +6,7 @@ SQLAlchemy ORM models - παρόμοια με @Entity classes στο Spring Boot
 
 from datetime import datetime, timezone
 from decimal import Decimal
+from sqlalchemy import event, DDL
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 
@@ -26,6 +27,15 @@ class User(db.Model):
     last_name = db.Column(db.String(50), nullable=False)
     phone = db.Column(db.String(20), unique=True, nullable=True)
     
+    # Version counter για τα ETags του profile (+1 σε κάθε update/νέο account)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    # Denormalized: όλοι οι λογαριασμοί (create) και οι ενεργοί
+    # (create/activate/deactivate), στο ίδιο transaction με την αλλαγή -
+    # flask counters reconcile για rebuild
+    accounts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    active_accounts_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     # Timestamps - χρήση του νέου datetime.now(timezone.utc)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, 
@@ -44,8 +54,14 @@ class User(db.Model):
         """Ελέγχει αν το password είναι σωστό"""
         return check_password_hash(self.password_hash, password)
     
-    def to_dict(self):
-        """Μετατρέπει το model σε dictionary για JSON response"""
+    def to_dict(self, accounts_count=None):
+        """
+        Μετατρέπει το model σε dictionary για JSON response
+        accounts_count: όλοι οι λογαριασμοί, και οι inactive (default το
+        denormalized accounts_count - χωρίς να φορτωθούν οι λογαριασμοί)
+        """
+        if accounts_count is None:
+            accounts_count = self.accounts_count
         return {
             'id': self.id,
             'email': self.email,
@@ -53,7 +69,8 @@ class User(db.Model):
             'last_name': self.last_name,
             'phone': self.phone,
             'created_at': self.created_at.isoformat(),
-            'accounts_count': len(self.accounts)
+            'accounts_count': accounts_count,
+            'active_accounts_count': self.active_accounts_count
         }
     
     def __repr__(self):
@@ -80,6 +97,13 @@ class Account(db.Model):
     # Account Status
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     
+    # Version counter για τα ETags (+1 σε κάθε αλλαγή balance ή activation)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
+    # Denormalized: ενημερώνονται στο ίδιο UPDATE με το balance (βλ. app/balances.py)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_transaction_at = db.Column(db.DateTime, nullable=True)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, 
@@ -90,16 +114,25 @@ class Account(db.Model):
     # Ένας λογαριασμός έχει πολλές συναλλαγές
     transactions = db.relationship('Transaction', backref='account', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
-        """Μετατρέπει το model σε dictionary"""
+    def to_dict(self, user_emails=None):
+        """
+        Μετατρέπει το model σε dictionary
+        user_emails: προαιρετικό {user_id: email} από bulk serialization
+        """
+        if user_emails is not None and self.user_id in user_emails:
+            user_email = user_emails[self.user_id]
+        else:
+            user_email = self.user.email
         return {
             'id': self.id,
             'account_number': self.account_number,
             'account_type': self.account_type,
             'balance': str(self.balance),  # Decimal to string για JSON
             'is_active': self.is_active,
+            'transaction_count': self.transaction_count,
+            'last_transaction_at': self.last_transaction_at.isoformat() if self.last_transaction_at else None,
             'created_at': self.created_at.isoformat(),
-            'user_email': self.user.email
+            'user_email': user_email
         }
     
     def __repr__(self):
@@ -109,6 +142,10 @@ class Transaction(db.Model):
     """
     Transaction model για όλες τις συναλλαγές
     Deposit, Withdrawal, Transfer
+    
+    Στο PostgreSQL ο πίνακας είναι partitioned ανά μήνα του created_at
+    (βλ. app/partitions.py) με PK (id, created_at) - το id μένει μοναδικό
+    από το sequence, οπότε το ORM συνεχίζει να το χρησιμοποιεί ως PK
     """
     __tablename__ = 'transactions'
     
@@ -141,9 +178,19 @@ class Transaction(db.Model):
             return Account.query.get(self.to_account_id)
         return None
     
-    def to_dict(self):
-        """Μετατρέπει το model σε dictionary"""
-        to_account = self.get_to_account()
+    def to_dict(self, account_numbers=None):
+        """
+        Μετατρέπει το model σε dictionary
+        account_numbers: προαιρετικό {account_id: account_number} από bulk
+        serialization - αποφεύγει το lazy load του account και το get_to_account()
+        """
+        if account_numbers is not None:
+            account_number = account_numbers.get(self.account_id)
+            to_account_number = account_numbers.get(self.to_account_id) if self.to_account_id else None
+        else:
+            to_account = self.get_to_account()
+            account_number = self.account.account_number
+            to_account_number = to_account.account_number if to_account else None
         return {
             'id': self.id,
             'transaction_type': self.transaction_type,
@@ -151,9 +198,136 @@ class Transaction(db.Model):
             'description': self.description,
             'balance_after': str(self.balance_after),
             'created_at': self.created_at.isoformat(),
-            'account_number': self.account.account_number,
-            'to_account_number': to_account.account_number if to_account else None
+            'account_number': account_number,
+            'to_account_number': to_account_number
         }
     
     def __repr__(self):
-        return f'<Transaction {self.transaction_type} {self.amount}>'
\ No newline at end of file
+        return f'<Transaction {self.transaction_type} {self.amount}>'
+
+class TransactionDailyStat(db.Model):
+    """
+    Rollup γραμμή: ημερήσια στατιστικά ανά account και transaction_type
+    Ενημερώνεται στο ίδιο DB transaction με κάθε deposit/withdraw/transfer
+    ώστε το /api/transactions/stats να μη σκανάρει όλο το ledger
+    """
+    __tablename__ = 'transaction_daily_stats'
+    __table_args__ = (
+        db.UniqueConstraint('account_id', 'day', 'transaction_type', name='uq_transaction_daily_stats_account_day_type'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    transaction_type = db.Column(db.String(20), nullable=False)
+    
+    # Aggregates της ημέρας
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(precision=14, scale=2), nullable=False, default=Decimal('0.00'))
+    min_amount = db.Column(db.Numeric(precision=12, scale=2), nullable=False)
+    max_amount = db.Column(db.Numeric(precision=12, scale=2), nullable=False)
+    
+    def __repr__(self):
+        return f'<TransactionDailyStat {self.account_id} {self.day} {self.transaction_type}>'
+
+class IdempotencyKey(db.Model):
+    """
+    Αποθηκευμένη απάντηση ενός money-moving POST ανά (user, Idempotency-Key)
+    Γράφεται στο ίδιο DB transaction με τη συναλλαγή, οπότε ένα retry είτε
+    βρίσκει την απάντηση είτε η αρχική συναλλαγή δεν έγινε ποτέ
+    """
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_id_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    
+    # sha256 του method + path + body, για να εντοπίζεται reuse του key
+    request_hash = db.Column(db.String(64), nullable=False)
+    response_status = db.Column(db.Integer, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    
+    # Index για το TTL cleanup
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<IdempotencyKey {self.user_id} {self.key}>'
+
+class AccountNumberCounter(db.Model):
+    """
+    Counter για τα account numbers σε dialects χωρίς sequences (SQLite)
+    Κάθε worker κρατάει ένα block από ACCOUNT_NUMBER_BLOCK_SIZE αριθμούς
+    (βλ. app/account_numbers.py) - στο PostgreSQL χρησιμοποιείται το
+    account_number_seq
+    """
+    __tablename__ = 'account_number_counters'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False, default=1)
+    
+    def __repr__(self):
+        return f'<AccountNumberCounter {self.name} {self.next_value}>'
+
+# Hi/lo sequence: κάθε nextval() δεσμεύει ένα block 100 account numbers
+# (το increment πρέπει να ταιριάζει με το ACCOUNT_NUMBER_BLOCK_SIZE)
+account_number_seq = db.Sequence('account_number_seq', start=1, increment=100, metadata=db.metadata)
+
+# ==================== COMPOSITE INDEXES ====================
+# Ταιριάζουν με τα πραγματικά query shapes (βλ. migration 9d41c7e2b6f0)
+
+# Όλα τα hot queries φιλτράρουν account_id και ταξινομούν κατά created_at
+db.Index(
+    'ix_transactions_account_id_created_at_id',
+    Transaction.account_id, Transaction.created_at.desc(), Transaction.id
+)
+
+# Λίστες λογαριασμών του user (user_id, is_active)
+db.Index('ix_accounts_user_id_is_active', Account.user_id, Account.is_active)
+
+# Partial index μόνο στους ενεργούς λογαριασμούς (π.χ. έλεγχος τύπου στο create_account)
+db.Index(
+    'ix_accounts_active_user_id_account_type',
+    Account.user_id, Account.account_type,
+    postgresql_where=Account.is_active.is_(True),
+    sqlite_where=Account.is_active.is_(True)
+)
+
+# ==================== TEXT SEARCH ====================
+# Substring search στο Transaction.description (βλ. app/search.py)
+# PostgreSQL: pg_trgm GIN index - το ILIKE '%...%' τον χρησιμοποιεί αυτόματα
+# SQLite: FTS5 shadow table με trigram tokenizer, συγχρονισμένος με triggers
+
+def _sqlite_trigram_fts(ddl, target, bind, **kw):
+    # Ο trigram tokenizer υπάρχει από το SQLite 3.34
+    return bind.dialect.name == 'sqlite' and bind.dialect.dbapi.sqlite_version_info >= (3, 34, 0)
+
+TRANSACTIONS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description); END",
+)
+
+for _statement in TRANSACTIONS_FTS_DDL:
+    event.listen(Transaction.__table__, 'after_create', DDL(_statement).execute_if(callable_=_sqlite_trigram_fts))
+event.listen(
+    Transaction.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS transactions_fts').execute_if(callable_=_sqlite_trigram_fts)
+)
+
+event.listen(
+    Transaction.__table__, 'after_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+event.listen(
+    Transaction.__table__, 'after_create',
+    DDL(
+        'CREATE INDEX IF NOT EXISTS ix_transactions_description_trgm '
+        'ON transactions USING gin (description gin_trgm_ops)'
+    ).execute_if(dialect='postgresql')
+)
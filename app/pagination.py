@@ -0,0 +1,78 @@
+"""
+Keyset (cursor) pagination για την Bank API
+
+Αντί για OFFSET (που σκανάρει όλες τις προηγούμενες σελίδες) κάνουμε seek
+πάνω στο index με βάση το τελευταίο (created_at, id) της προηγούμενης σελίδας.
+Το cursor που επιστρέφεται στον client είναι opaque (base64) string.
+"""
+import base64
+from datetime import datetime
+from sqlalchemy import tuple_, asc, desc
+from app.models import Transaction
+
+MAX_PER_PAGE = 100
+
+def encode_cursor(created_at, row_id):
+    """Κωδικοποιεί το (created_at, id) σε opaque cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Αποκωδικοποιεί ένα cursor σε (created_at, id)
+    Πετάει ValueError αν το cursor δεν είναι έγκυρο
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        created_at, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def is_cursor_mode(args):
+    """Cursor mode ενεργοποιείται με ?pagination=cursor ή με την παρουσία του ?cursor="""
+    return args.get('pagination') == 'cursor' or 'cursor' in args
+
+def keyset_paginate(query, per_page, cursor=None, order='desc', include_total=False):
+    """
+    Εφαρμόζει keyset pagination σε ένα Transaction query
+
+    Το query ΔΕΝ πρέπει να έχει ήδη order_by - το ordering ορίζεται εδώ
+    ώστε να ταιριάζει με το seek predicate (created_at, id).
+    Φέρνουμε per_page + 1 γραμμές για να ξέρουμε αν υπάρχει επόμενη σελίδα
+    χωρίς COUNT(*).
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+    seek_key = tuple_(Transaction.created_at, Transaction.id)
+
+    # Το total κοστίζει ένα COUNT(*) - το τρέχουμε μόνο αν ζητηθεί
+    total = query.order_by(None).count() if include_total else None
+
+    if cursor:
+        if order == 'asc':
+            query = query.filter(seek_key > (last_created_at, last_id))
+        else:
+            query = query.filter(seek_key < (last_created_at, last_id))
+
+    direction = asc if order == 'asc' else desc
+    rows = query.order_by(
+        direction(Transaction.created_at), direction(Transaction.id)
+    ).limit(per_page + 1).all()
+
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_next else None
+
+    pagination = {
+        'mode': 'cursor',
+        'per_page': per_page,
+        'has_next': has_next,
+        'next_cursor': next_cursor
+    }
+    if include_total:
+        pagination['total'] = total
+
+    return items, pagination
@@ -0,0 +1,166 @@
+"""
+Monthly range partitioning του transactions (μόνο PostgreSQL)
+
+Το migration b8d2f4a61c07 μετατρέπει το transactions σε declaratively
+partitioned table (PARTITION BY RANGE (created_at)) με ένα partition ανά
+μήνα (transactions_YYYY_MM) και ένα transactions_default για ό,τι πέσει
+εκτός. Όλα τα queries φιλτράρουν created_at, οπότε ο planner κάνει
+partition pruning και κάθε index μένει στο μέγεθος ενός μήνα.
+
+Συντήρηση (cron, π.χ. μία φορά τη μέρα):
+    flask partitions create --months-ahead 3
+    flask partitions detach --retain-months 24 [--drop]
+    flask partitions list
+
+Στο SQLite (και σε μη partitioned PostgreSQL, π.χ. db.create_all) όλα
+είναι no-op: το model δεν αλλάζει και το ORM βλέπει τον ίδιο πίνακα.
+"""
+import re
+from datetime import datetime, timezone
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import text
+from app import db
+
+PARENT_TABLE = 'transactions'
+DEFAULT_PARTITION = 'transactions_default'
+PARTITION_NAME = re.compile(r'^transactions_(\d{4})_(\d{2})$')
+
+partitions_cli = AppGroup('partitions', help='Transactions partition maintenance commands')
+
+def month_start(value):
+    """Αρχή του μήνα (naive, UTC όπως το created_at)"""
+    return datetime(value.year, value.month, 1)
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def partition_name(month):
+    return f'{PARENT_TABLE}_{month.year:04d}_{month.month:02d}'
+
+def is_partitioned(conn):
+    """True μόνο σε PostgreSQL όπου το transactions είναι partitioned table"""
+    if conn.dialect.name != 'postgresql':
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {'table': PARENT_TABLE}).scalar()
+
+def monthly_partitions(conn):
+    """{μήνας: όνομα} για τα attached μηνιαία partitions"""
+    names = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+    ), {'table': PARENT_TABLE}).scalars()
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[datetime(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+def create_partition(conn, month):
+    """
+    Δημιουργεί το partition του μήνα. Αν το default partition έχει ήδη
+    γραμμές αυτού του μήνα, μεταφέρονται πρώτα σε standalone πίνακα που
+    γίνεται ATTACH (αλλιώς το CREATE ... PARTITION OF αποτυγχάνει)
+    """
+    name = partition_name(month)
+    bounds = {'start': month, 'end': add_months(month, 1)}
+    in_range = 'created_at >= :start AND created_at < :end'
+
+    has_rows = conn.execute(text(
+        f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})'
+    ), bounds).scalar()
+    if not has_rows:
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+        ))
+        return
+
+    conn.execute(text(f'CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)'))
+    conn.execute(text(f'INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}'), bounds)
+    conn.execute(text(f'DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}'), bounds)
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+    ))
+
+def ensure_partitions(first_month, last_month):
+    """
+    Partitions για κάθε μήνα από first_month έως last_month (inclusive)
+    Επιστρέφει τα ονόματα που δημιουργήθηκαν (κενή λίστα αν δεν είναι partitioned)
+    """
+    created = []
+    with db.engine.begin() as conn:
+        if not is_partitioned(conn):
+            return created
+        existing = monthly_partitions(conn)
+        month = month_start(first_month)
+        while month <= month_start(last_month):
+            if month not in existing:
+                create_partition(conn, month)
+                created.append(partition_name(month))
+            month = add_months(month, 1)
+    return created
+
+def detach_partitions(retain_months, drop=False):
+    """
+    Κάνει DETACH τα partitions παλαιότερα από retain_months μήνες
+    Οι πίνακες μένουν (archive/pg_dump) εκτός αν drop=True
+    """
+    cutoff = add_months(month_start(datetime.now(timezone.utc)), -retain_months)
+    detached = []
+    with db.engine.begin() as conn:
+        if not is_partitioned(conn):
+            return detached
+        for month, name in sorted(monthly_partitions(conn).items()):
+            if month >= cutoff:
+                break
+            conn.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}'))
+            if drop:
+                conn.execute(text(f'DROP TABLE {name}'))
+            detached.append(name)
+    return detached
+
+@partitions_cli.command('create')
+@click.option('--months-ahead', type=int, default=None, help='Default: TRANSACTION_PARTITIONS_AHEAD')
+def create_command(months_ahead):
+    """Δημιουργεί τα partitions του τρέχοντος και των επόμενων μηνών"""
+    if months_ahead is None:
+        months_ahead = current_app.config.get('TRANSACTION_PARTITIONS_AHEAD', 3)
+    current = month_start(datetime.now(timezone.utc))
+    created = ensure_partitions(current, add_months(current, months_ahead))
+    click.echo(f'Created {len(created)} partitions' + (f': {", ".join(created)}' if created else ''))
+
+@partitions_cli.command('detach')
+@click.option('--retain-months', type=int, default=None, help='Default: TRANSACTION_PARTITION_RETENTION_MONTHS')
+@click.option('--drop', is_flag=True, help='DROP των detached πινάκων (αλλιώς μένουν για archive)')
+def detach_command(retain_months, drop):
+    """Αφαιρεί από το transactions τα partitions εκτός retention"""
+    if retain_months is None:
+        retain_months = current_app.config.get('TRANSACTION_PARTITION_RETENTION_MONTHS', 24)
+    if retain_months < 1:
+        raise click.BadParameter('must be at least 1', param_hint='--retain-months')
+    detached = detach_partitions(retain_months, drop)
+    action = 'Dropped' if drop else 'Detached'
+    click.echo(f'{action} {len(detached)} partitions' + (f': {", ".join(detached)}' if detached else ''))
+
+@partitions_cli.command('list')
+def list_command():
+    """Τα μηνιαία partitions και οι γραμμές του default partition"""
+    with db.engine.connect() as conn:
+        if not is_partitioned(conn):
+            click.echo(f'{PARENT_TABLE} is not partitioned ({conn.dialect.name})')
+            return
+        for month, name in sorted(monthly_partitions(conn).items()):
+            click.echo(f'{name}  {month:%Y-%m}')
+        default_rows = conn.execute(text(f'SELECT count(*) FROM {DEFAULT_PARTITION}')).scalar()
+        click.echo(f'{DEFAULT_PARTITION}  {default_rows} rows')
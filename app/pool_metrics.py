@@ -0,0 +1,99 @@
+"""
+Connection pool metrics για την Bank API
+
+- InstrumentedQueuePool: QueuePool που μετράει πόσο περιμένει κάθε checkout
+  (χρόνος μέχρι να δοθεί connection, μαζί με τα pool timeouts)
+- pool events (connect/checkout/checkin/invalidate) για counters
+- snapshot in-use / overflow / idle connections για το /health
+
+Με αυτά μπορούμε να διαστασιολογήσουμε gunicorn workers x (pool_size +
+max_overflow) απέναντι στο max_connections του PostgreSQL.
+"""
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    """Thread-safe counters για όλα τα instrumented pools του process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def install(self, engine):
+        """Καταχωρεί τα pool events στο engine (μία φορά ανά engine)"""
+        pool = engine.pool
+        if getattr(pool, '_bank_metrics_installed', False):
+            return
+        pool._bank_metrics_installed = True
+        event.listen(pool, 'connect', lambda *args: self.incr('connects'))
+        event.listen(pool, 'checkout', lambda *args: self.incr('checkouts'))
+        event.listen(pool, 'checkin', lambda *args: self.incr('checkins'))
+        event.listen(pool, 'invalidate', lambda *args: self.incr('invalidations'))
+
+    def stats(self, engine=None):
+        with self._lock:
+            report = {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'checkout_wait_ms': {
+                    'count': self.wait_count,
+                    'avg': round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                    'max': round(self.wait_max * 1000, 3)
+                }
+            }
+
+        if engine is not None:
+            pool = engine.pool
+            report['pool_class'] = type(pool).__name__
+            if isinstance(pool, QueuePool):
+                report.update({
+                    'size': pool.size(),
+                    'in_use': pool.checkedout(),
+                    'idle': pool.checkedin(),
+                    'overflow': max(pool.overflow(), 0),
+                    'max_overflow': pool._max_overflow,
+                    'timeout_seconds': pool.timeout()
+                })
+        return report
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool που καταγράφει τον χρόνο αναμονής κάθε checkout"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.incr('timeouts')
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
@@ -0,0 +1,103 @@
+"""
+Query budgets ανά endpoint για την Bank API
+
+Κάθε route δηλώνει πόσα SQL statements επιτρέπεται να εκτελέσει:
+
+    @accounts_bp.route('/', methods=['GET'])
+    @query_budget(3)
+    @token_required
+    def get_user_accounts(): ...
+
+Το @query_budget μπαίνει ΠΑΝΩ από το @token_required ώστε να μετράει και
+το lookup του user. Συμπεριφορά ανά QUERY_BUDGET_MODE:
+- 'raise' (testing): QueryBudgetExceeded όταν ξεπεραστεί το budget
+- 'warn' (development): warning στο log
+- 'off' (production): κανένα overhead, ούτε engine listener
+
+Για endpoints με κόστος ανάλογο του input (π.χ. /batch) το budget μπορεί
+να είναι callable που υπολογίζεται μέσα στο request.
+
+Στα streaming responses (π.χ. /export) μετράνε μόνο τα statements πριν
+ξεκινήσει το streaming.
+"""
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import event
+
+class QueryBudgetExceeded(RuntimeError):
+    """Ένα endpoint εκτέλεσε περισσότερα SQL statements από το budget του"""
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+_local = threading.local()
+
+def _active_counters():
+    if not hasattr(_local, 'counters'):
+        _local.counters = []
+    return _local.counters
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_counters():
+        counter.count += 1
+
+@contextmanager
+def count_queries():
+    """
+    Μετράει τα SQL statements που εκτελούνται στο τρέχον thread
+        with count_queries() as counter:
+            ...
+        counter.count
+    """
+    counter = QueryCounter()
+    counters = _active_counters()
+    counters.append(counter)
+    try:
+        yield counter
+    finally:
+        counters.remove(counter)
+
+def query_budget(max_queries):
+    """
+    Decorator που επιβάλλει μέγιστο αριθμό SQL statements ανά request
+    max_queries: int ή callable χωρίς arguments που επιστρέφει int
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            mode = current_app.config.get('QUERY_BUDGET_MODE', 'off')
+            if mode == 'off':
+                return f(*args, **kwargs)
+
+            with count_queries() as counter:
+                result = f(*args, **kwargs)
+
+            budget = max_queries() if callable(max_queries) else max_queries
+            if counter.count > budget:
+                message = (
+                    f"Query budget exceeded on {request.endpoint}: "
+                    f"{counter.count} statements, budget is {budget}"
+                )
+                if mode == 'raise':
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(message)
+            return result
+
+        decorated.query_budget = max_queries
+        return decorated
+    return decorator
+
+def install_query_counter(engine):
+    """Καταχωρεί τον listener του count_queries() στο engine (μία φορά)"""
+    if not event.contains(engine, 'before_cursor_execute', _count_statement):
+        event.listen(engine, 'before_cursor_execute', _count_statement)
+
+def init_query_budget(app, *engines):
+    """Καταχωρεί τον engine listener - μόνο αν QUERY_BUDGET_MODE != 'off'"""
+    if app.config.get('QUERY_BUDGET_MODE', 'off') == 'off':
+        return
+    for engine in engines:
+        install_query_counter(engine)
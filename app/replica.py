@@ -0,0 +1,166 @@
+"""
+Read-replica routing για την Bank API
+
+Με DATABASE_REPLICA_URL ορίζεται το bind 'replica' στο SQLALCHEMY_BINDS.
+Τα GET/HEAD requests με token (@token_required) διαβάζουν από το replica:
+το RoutingSession επιστρέφει το replica engine στο get_bind, εκτός από
+flush και INSERT/UPDATE/DELETE που πάνε πάντα στο primary.
+
+Read-your-writes: μετά από κάθε request που γράφει (POST/PUT/PATCH/DELETE)
+ο user μένει στο primary για REPLICA_STICKY_SECONDS - πρέπει να είναι
+μεγαλύτερο από το replication lag. Η προθεσμία στέλνεται στον client ως
+signed cookie (db_primary_until, SECRET_KEY), οπότε την βλέπει όποιος
+worker πάρει το επόμενο request.
+
+Τοπικά αρκούν δύο SQLite αρχεία: το `flask replica sync` αντιγράφει το
+primary στο replica (backup API). Στο PostgreSQL το replica είναι ένας
+streaming standby και το sync δεν χρειάζεται.
+"""
+import math
+import sqlite3
+import threading
+import time
+import click
+from flask import current_app, g, has_request_context, request
+from flask.cli import AppGroup
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND = 'replica'
+READ_ONLY_METHODS = ('GET', 'HEAD')
+STICKY_COOKIE = 'db_primary_until'
+
+def _sticky_serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='replica-sticky')
+
+class ReplicaRouter:
+    """Ποια requests διαβάζουν από το replica + sticky παράθυρο ανά user"""
+
+    def __init__(self, enabled=False, sticky_seconds=5):
+        self._lock = threading.Lock()
+        self.configure(enabled, sticky_seconds)
+
+    def configure(self, enabled, sticky_seconds):
+        with self._lock:
+            self.enabled = enabled
+            self.sticky_seconds = sticky_seconds
+            self.replica_reads = 0
+            self.primary_reads = 0
+
+    def sticky_until(self, user_id):
+        """Η προθεσμία (epoch seconds) από το cookie του request, αν ανήκει στον user"""
+        value = request.cookies.get(STICKY_COOKIE)
+        if not value:
+            return None
+        try:
+            data = _sticky_serializer().loads(value)
+        except BadSignature:
+            return None
+        if not isinstance(data, dict) or data.get('user_id') != user_id:
+            return None
+        return data.get('until')
+
+    def use_replica(self, user_id):
+        """True αν το τρέχον read του user μπορεί να πάει στο replica"""
+        if not self.enabled:
+            return False
+        until = self.sticky_until(user_id)
+        sticky = until is not None and until > time.time()
+        with self._lock:
+            if sticky:
+                self.primary_reads += 1
+            else:
+                self.replica_reads += 1
+        return not sticky
+
+    def record_write(self, user_id):
+        """Ο user έγραψε - τα reads του μένουν στο primary για sticky_seconds"""
+        if not self.enabled or self.sticky_seconds <= 0:
+            return
+        # Wall clock και όχι monotonic: τη συγκρίνουν και άλλα processes
+        g.db_sticky = (user_id, time.time() + self.sticky_seconds)
+
+    def route_request(self, user_id):
+        """Καλείται από το @token_required μόλις είναι γνωστός ο user"""
+        g.db_replica = request.method in READ_ONLY_METHODS and self.use_replica(user_id)
+
+    def set_sticky_cookie(self, response):
+        """after_request: στέλνει την προθεσμία του record_write στον client"""
+        sticky = g.get('db_sticky')
+        if sticky is None:
+            return response
+        user_id, until = sticky
+        response.set_cookie(
+            STICKY_COOKIE,
+            _sticky_serializer().dumps({'user_id': user_id, 'until': until}),
+            max_age=math.ceil(self.sticky_seconds),
+            secure=request.is_secure,
+            httponly=True,
+            samesite='Lax'
+        )
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'sticky_seconds': self.sticky_seconds,
+                'replica_reads': self.replica_reads,
+                'primary_reads': self.primary_reads
+            }
+
+replica_router = ReplicaRouter()
+
+def reading_from_replica():
+    """True αν το τρέχον request έχει δρομολογηθεί στο replica"""
+    return has_request_context() and g.get('db_replica', False)
+
+class RoutingSession(Session):
+    """db.session που στέλνει τα reads των read-only requests στο replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not isinstance(clause, UpdateBase) and reading_from_replica():
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _sqlite_path(engine):
+    """Το αρχείο ενός SQLite engine (None για :memory:)"""
+    path = engine.url.database
+    if path and path.startswith('file:'):
+        # sqlite:///file:/path?mode=ro&uri=true
+        path = path[len('file:'):]
+    if not path or path == ':memory:':
+        return None
+    return path
+
+replica_cli = AppGroup('replica', help='Read replica commands')
+
+@replica_cli.command('sync')
+def sync_command():
+    """Αντιγράφει το primary στο replica (μόνο SQLite, για τοπικά tests)"""
+    from app import db
+
+    replica = db.engines.get(REPLICA_BIND)
+    if replica is None:
+        raise click.ClickException('DATABASE_REPLICA_URL is not configured')
+    if db.engine.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        raise click.ClickException('sync is only supported for SQLite; use streaming replication on PostgreSQL')
+
+    source_path = _sqlite_path(db.engine)
+    target_path = _sqlite_path(replica)
+    if not source_path or not target_path:
+        raise click.ClickException('sync needs file-based SQLite databases')
+
+    # Τα connections του replica pool δεν πρέπει να κρατάνε παλιά pages
+    replica.dispose()
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    click.echo(f'Copied {source_path} to {target_path}')
@@ -0,0 +1,82 @@
+"""
+Retry με jitter για transient DB errors
+
+Deadlocks (40P01), serialization failures (40001) και "database is locked"
+στο SQLite δεν είναι πραγματικά λάθη του request - η βάση απλώς μας ζητάει
+να ξαναπροσπαθήσουμε. Το run_with_retry κάνει rollback και ξανατρέχει
+ολόκληρο το DB transaction με εκθετικό backoff και full jitter.
+"""
+import random
+import threading
+import time
+from flask import current_app
+from sqlalchemy.exc import DBAPIError
+from app import db
+
+DEADLOCK_CODES = {'40P01'}
+SERIALIZATION_CODES = {'40001'}
+
+class RetryStats:
+    """Thread-safe counters για retries/deadlocks (αναφέρονται στο /health)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            'retries': 0,
+            'deadlocks': 0,
+            'serialization_failures': 0,
+            'lock_timeouts': 0,
+            'exhausted': 0
+        }
+
+    def incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+retry_stats = RetryStats()
+
+def classify_error(error):
+    """
+    Επιστρέφει το είδος του transient error ή None αν δεν είναι retryable
+    """
+    if not isinstance(error, DBAPIError):
+        return None
+    pgcode = getattr(error.orig, 'pgcode', None)
+    if pgcode in DEADLOCK_CODES:
+        return 'deadlocks'
+    if pgcode in SERIALIZATION_CODES:
+        return 'serialization_failures'
+    if 'database is locked' in str(error.orig):
+        return 'lock_timeouts'
+    return None
+
+def run_with_retry(func, *args, **kwargs):
+    """
+    Τρέχει το func (που κάνει ένα ολόκληρο DB transaction μαζί με commit)
+    και το ξανατρέχει σε deadlock/serialization errors
+    """
+    max_attempts = current_app.config.get('DB_RETRY_MAX_ATTEMPTS', 5)
+    base_delay = current_app.config.get('DB_RETRY_BASE_DELAY', 0.01)
+
+    attempt = 1
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except DBAPIError as e:
+            db.session.rollback()
+            kind = classify_error(e)
+            if kind is None:
+                raise
+            retry_stats.incr(kind)
+            if attempt >= max_attempts:
+                retry_stats.incr('exhausted')
+                raise
+            retry_stats.incr('retries')
+            current_app.logger.warning(f"Retrying after {kind} (attempt {attempt}/{max_attempts})")
+            # Full jitter: τυχαία αναμονή στο [0, base * 2^attempt]
+            time.sleep(random.uniform(0, base_delay * (2 ** attempt)))
+            attempt += 1
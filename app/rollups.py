@@ -0,0 +1,152 @@
+"""
+Stats rollups για την Bank API
+
+Κρατάμε ημερήσια aggregates (count/sum/min/max) ανά account και
+transaction_type στον πίνακα transaction_daily_stats. Οι γραμμές
+ενημερώνονται με upsert στο ίδιο DB transaction με τη συναλλαγή,
+και το `flask stats backfill` τις ξαναχτίζει από το ledger.
+"""
+from datetime import datetime, timezone
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func, insert, delete, select
+from app import db
+from app.models import Transaction, TransactionDailyStat
+
+stats_cli = AppGroup('stats', help='Transaction stats rollup commands')
+
+def _dialect_insert(dialect_name):
+    """Επιστρέφει (insert, least, greatest) για dialects με ON CONFLICT"""
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert, func.least, func.greatest
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        # Στο SQLite τα min()/max() με πολλά arguments είναι scalar functions
+        return sqlite_insert, func.min, func.max
+    return None, None, None
+
+def _upsert_daily_stat(account_id, day, transaction_type, count, total_amount, min_amount, max_amount):
+    """Προσθέτει aggregates σε μια γραμμή (account, day, type) του rollup"""
+    values = {
+        'account_id': account_id,
+        'day': day,
+        'transaction_type': transaction_type,
+        'transaction_count': count,
+        'total_amount': total_amount,
+        'min_amount': min_amount,
+        'max_amount': max_amount
+    }
+
+    dialect_insert, least, greatest = _dialect_insert(db.session.get_bind().dialect.name)
+
+    if dialect_insert is None:
+        # Fallback για dialects χωρίς ON CONFLICT - read-modify-write με row lock
+        stat = TransactionDailyStat.query.filter_by(
+            account_id=account_id,
+            day=day,
+            transaction_type=transaction_type
+        ).with_for_update().first()
+        if stat is None:
+            db.session.add(TransactionDailyStat(**values))
+        else:
+            stat.transaction_count += count
+            stat.total_amount += total_amount
+            stat.min_amount = min(stat.min_amount, min_amount)
+            stat.max_amount = max(stat.max_amount, max_amount)
+        return
+
+    # Atomic upsert - ασφαλές σε concurrent συναλλαγές στο ίδιο account
+    stmt = dialect_insert(TransactionDailyStat).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['account_id', 'day', 'transaction_type'],
+        set_={
+            'transaction_count': TransactionDailyStat.transaction_count + stmt.excluded.transaction_count,
+            'total_amount': TransactionDailyStat.total_amount + stmt.excluded.total_amount,
+            'min_amount': least(TransactionDailyStat.min_amount, stmt.excluded.min_amount),
+            'max_amount': greatest(TransactionDailyStat.max_amount, stmt.excluded.max_amount)
+        }
+    )
+    db.session.execute(stmt)
+
+def record_transaction_stats(transaction):
+    """
+    Προσθέτει μια συναλλαγή στο ημερήσιο rollup του account της
+    Πρέπει να καλείται ΠΡΙΝ το db.session.commit() της συναλλαγής
+    """
+    if transaction.created_at is None:
+        transaction.created_at = datetime.now(timezone.utc)
+
+    _upsert_daily_stat(
+        transaction.account_id,
+        transaction.created_at.date(),
+        transaction.transaction_type,
+        1,
+        transaction.amount,
+        transaction.amount,
+        transaction.amount
+    )
+
+def record_batch_stats(rows):
+    """
+    Rollup για bulk-inserted transaction rows (dicts με account_id,
+    created_at, transaction_type, amount) - ένα upsert ανά (account, day, type)
+    """
+    groups = {}
+    for row in rows:
+        key = (row['account_id'], row['created_at'].date(), row['transaction_type'])
+        amount = row['amount']
+        if key not in groups:
+            groups[key] = [1, amount, amount, amount]
+        else:
+            group = groups[key]
+            group[0] += 1
+            group[1] += amount
+            group[2] = min(group[2], amount)
+            group[3] = max(group[3], amount)
+
+    for (account_id, day, transaction_type), (count, total, minimum, maximum) in groups.items():
+        _upsert_daily_stat(account_id, day, transaction_type, count, total, minimum, maximum)
+
+def backfill_transaction_stats(account_id=None):
+    """
+    Ξαναχτίζει τα rollups από τον πίνακα transactions με ένα INSERT ... SELECT
+    Επιστρέφει τον αριθμό των rollup γραμμών που δημιουργήθηκαν
+    """
+    day = func.date(Transaction.created_at)
+    aggregate = select(
+        Transaction.account_id,
+        day,
+        Transaction.transaction_type,
+        func.count(Transaction.id),
+        func.sum(Transaction.amount),
+        func.min(Transaction.amount),
+        func.max(Transaction.amount)
+    ).group_by(Transaction.account_id, day, Transaction.transaction_type)
+
+    clear = delete(TransactionDailyStat)
+    if account_id is not None:
+        aggregate = aggregate.where(Transaction.account_id == account_id)
+        clear = clear.where(TransactionDailyStat.account_id == account_id)
+
+    try:
+        db.session.execute(clear)
+        result = db.session.execute(
+            insert(TransactionDailyStat).from_select(
+                ['account_id', 'day', 'transaction_type', 'transaction_count',
+                 'total_amount', 'min_amount', 'max_amount'],
+                aggregate
+            )
+        )
+        db.session.commit()
+        return result.rowcount
+    except Exception:
+        db.session.rollback()
+        raise
+
+@stats_cli.command('backfill')
+@click.option('--account-id', type=int, default=None, help='Backfill μόνο για ένα account')
+def backfill_command(account_id):
+    """Ξαναχτίζει τα transaction_daily_stats από το ledger"""
+    rows = backfill_transaction_stats(account_id)
+    click.echo(f'Backfilled {rows} daily stat rows')
@@ -7,14 +7,55 @@
 # 5. Consider performance for large datasets
 from flask import Blueprint, request, jsonify, g, current_app
 from app.decorators import token_required
+from app.query_budget import query_budget
 from decimal import Decimal, ROUND_UP
 from datetime import datetime, timedelta
 from app import db
 from app.models import Account, Transaction
-from sqlalchemy import and_
+from sqlalchemy import and_, func, cast, BigInteger
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional - χωρίς numpy χρησιμοποιούμε array module
+    np = None
 
 savings_calc_bp = Blueprint('savings_calc', __name__, url_prefix='/api/savings-calc')
 
+class SavingsMetrics:
+    """
+    Τα aggregates που χρειάζονται όλοι οι κανόνες και τα recommendations
+    Όλα τα ποσά σε ακέραια cents (χωρίς Decimal arithmetic ανά γραμμή)
+    """
+    def __init__(self, count, total_cents, roundup_cents):
+        self.count = count
+        self.total_cents = total_cents
+        self.roundup_cents = roundup_cents
+
+    @property
+    def total_spent(self):
+        # scaleb(-2) κρατάει exponent -2, όπως το άθροισμα Numeric(12,2) τιμών
+        return Decimal(self.total_cents).scaleb(-2)
+
+def compute_savings_metrics(cents):
+    """
+    Single pass πάνω στα |amount| σε cents (numpy array ή array('q'))
+    roundup ανά γραμμή: (100 - cents % 100) % 100
+    """
+    if np is not None:
+        cents = np.asarray(cents, dtype=np.int64)
+        if cents.size == 0:
+            return SavingsMetrics(0, 0, 0)
+        roundup = (100 - cents % 100) % 100
+        return SavingsMetrics(int(cents.size), int(cents.sum()), int(roundup.sum()))
+
+    total = 0
+    roundup = 0
+    for value in cents:
+        total += value
+        roundup += (100 - value % 100) % 100
+    return SavingsMetrics(len(cents), total, roundup)
+
 class SavingsCalculator:
     VALID_RULES = ['roundup','percentage','smart','rainy_day']
     def __init__(self, user, account_id, period_days):
@@ -32,6 +73,63 @@ class SavingsCalculator:
             )
         ).all()
     
+    def get_amount_cents(self):
+        """
+        Φέρνει μόνο τα |amount| σε ακέραια cents (όχι ORM objects)
+        Το round() στη βάση προστατεύει από float αναπαράσταση στο SQLite
+        """
+        rows = db.session.query(
+            cast(func.round(func.abs(Transaction.amount) * 100), BigInteger)
+        ).filter(
+            and_(
+                Transaction.account_id == self.account_id,
+                Transaction.created_at >= self.cutoff_date,
+                Transaction.transaction_type.in_(['deposit','withdraw','withdrawal'])
+            )
+        )
+        values = (row[0] for row in rows)
+        if np is not None:
+            return np.fromiter(values, dtype=np.int64)
+        return array('q', values)
+
+    def get_sql_metrics(self):
+        """
+        SQL-aggregate mode: η βάση επιστρέφει μόνο count, Σ cents και Σ roundup cents
+        Μνήμη και latency ανεξάρτητα από το πλήθος των transactions
+        """
+        cents = cast(func.round(func.abs(Transaction.amount) * 100), BigInteger)
+        count, total_cents, roundup_cents = db.session.query(
+            func.count(),
+            func.coalesce(func.sum(cents), 0),
+            func.coalesce(func.sum((100 - cents % 100) % 100), 0)
+        ).filter(
+            and_(
+                Transaction.account_id == self.account_id,
+                Transaction.created_at >= self.cutoff_date,
+                Transaction.transaction_type.in_(['deposit','withdraw','withdrawal'])
+            )
+        ).one()
+        return SavingsMetrics(int(count), int(total_cents), int(roundup_cents))
+
+    def roundup_from_metrics(self, metrics):
+        """Ίδιο αποτέλεσμα με το calc_roundup, από τα precomputed metrics"""
+        return Decimal(metrics.roundup_cents).scaleb(-2).quantize(Decimal('0.01'))
+
+    def percentage_from_metrics(self, metrics, perc):
+        """Ίδιο αποτέλεσμα με το calculate_perc (Σ|a|*p == p*Σ|a| ακριβώς)"""
+        if not 0 < perc <= 20:
+            raise ValueError("Percentage must be between 0 and 20")
+        percentage_decimal = Decimal(str(perc)) / Decimal('100')
+        return (metrics.total_spent * percentage_decimal).quantize(Decimal('0.01'))
+
+    def smart_from_metrics(self, metrics):
+        """Ίδιο αποτέλεσμα με το calculate_smart"""
+        if metrics.count == 0:
+            return Decimal('0.00')
+        avg_daily = metrics.total_spent / Decimal(str(self.period_days))
+        recomended_daiy = min(avg_daily * Decimal('0.10'), Decimal('10.00'))
+        return (recomended_daiy * Decimal(str(self.period_days)).quantize(Decimal('0.01')))
+
     def calc_roundup(self, transactions):
         """Calculate roundup savings"""
         total = Decimal('0.00')
@@ -72,6 +170,7 @@ class SavingsCalculator:
 
 
 @savings_calc_bp.route('/calculate', methods = ['POST'])
+@query_budget(3)
 @token_required
 def calculate_savings_potential():
     """
@@ -119,9 +218,14 @@ def calculate_savings_potential():
         #Initialize calc
         calculator = SavingsCalculator(user, account_id, period_days)
 
-        transactions = calculator.get_transactions()
+        # sql: τα aggregates υπολογίζονται στη βάση (default)
+        # vectorized: ένα query για τα cents και ένα pass στην Python
+        if current_app.config.get('SAVINGS_CALC_MODE', 'sql') == 'vectorized':
+            metrics = compute_savings_metrics(calculator.get_amount_cents())
+        else:
+            metrics = calculator.get_sql_metrics()
 
-        if not transactions:
+        if not metrics.count:
             return jsonify({
                 'status' : 'error',
                 'message' : 'No transactions found for the spesific period',
@@ -136,22 +240,22 @@ def calculate_savings_potential():
 
         for rule in rules:
             if rule.lower() == 'roundup':
-                amount = calculator.calc_roundup(transactions)
+                amount = calculator.roundup_from_metrics(metrics)
                 savings_breakdown['round_up'] = str(amount)
                 total_savings += amount
             elif rule.lower() == 'percentage':
                 percentage = Decimal(str(data.get('percentage', 5)))
-                amount = calculator.calculate_perc(transactions, percentage)
+                amount = calculator.percentage_from_metrics(metrics, percentage)
                 savings_breakdown[f'precentage_{percentage}'] = str(amount)
                 total_savings += amount
             elif rule == 'smart':
-                amount = calculator.calculate_smart(transactions)
+                amount = calculator.smart_from_metrics(metrics)
                 savings_breakdown['smart'] = str(amount)
                 total_savings += amount
         
         # Generate recommendations
-        recommendations = generate_recommendations(
-            transactions, 
+        recommendations = generate_recommendations_from_metrics(
+            metrics, 
             total_savings, 
             period_days
         )
@@ -161,7 +265,7 @@ def calculate_savings_potential():
                 **savings_breakdown,
                 'total': str(total_savings.quantize(Decimal('0.01')))
             },
-            'transactions_analyzed': len(transactions),
+            'transactions_analyzed': metrics.count,
             'period': f'{period_days} days',
             'average_per_week': str((total_savings / Decimal(str(period_days)) * Decimal('7')).quantize(Decimal('0.01'))),
             'recommendations': recommendations
@@ -200,10 +304,18 @@ def validate_savings_request(data, user):
         errors.append('period_days must be between 1 and 365')
 
 def generate_recommendations(transactions, total_savings, period_days):
-    recommendations = []
-
     #calc metrics 
     avg_trans = sum(abs(t.amount) for t in transactions) / len(transactions)
+    return _build_recommendations(avg_trans, len(transactions), total_savings, period_days)
+
+def generate_recommendations_from_metrics(metrics, total_savings, period_days):
+    """Ίδια recommendations με το generate_recommendations, από τα metrics"""
+    avg_trans = metrics.total_spent / metrics.count
+    return _build_recommendations(avg_trans, metrics.count, total_savings, period_days)
+
+def _build_recommendations(avg_trans, transactions_count, total_savings, period_days):
+    recommendations = []
+
     projected_annual = (total_savings / Decimal(str(period_days))) * Decimal('365')
 
     # Recommendation logic
@@ -221,7 +333,7 @@ def generate_recommendations(transactions, total_savings, period_days):
             'suggested_rules': ['roundup', 'percentage', 'smart']
         })
     
-    if len(transactions) > 100:
+    if transactions_count > 100:
         recommendations.append({
             'type': 'frequent_spender',
             'message': 'You make frequent transactions. Roundup savings could add up quickly!',
@@ -0,0 +1,89 @@
+"""
+Indexed substring search στο Transaction.description
+
+Το `description.ilike('%...%')` είναι full scan του ledger του user.
+Η συνθήκη του φίλτρου επιλέγεται αυτόματα ανά βάση:
+
+- PostgreSQL: το ILIKE μένει ως έχει - ο pg_trgm GIN index
+  (ix_transactions_description_trgm) χρησιμοποιείται από τον planner
+- SQLite: LIKE στον FTS5 trigram shadow table (transactions_fts), αν
+  υπάρχει στη βάση. Ο FTS index είναι global (όλοι οι users), οπότε για
+  συχνούς όρους το ILIKE στο ledger του user είναι φθηνότερο. Διαβάζουμε
+  έως SEARCH_FTS_MAX_CANDIDATES + 1 rowids: αν χωράνε, το φίλτρο γίνεται
+  id IN (rowids), αλλιώς ILIKE (ό,τι θα αποφάσιζε ο planner του PostgreSQL)
+- Αλλιώς (ή όροι με < 3 συνεχόμενους χαρακτήρες, που δεν έχουν trigram)
+  το αρχικό ILIKE
+
+Με SEARCH_INDEX_ENABLED=false γίνεται πάντα scan (π.χ. για σύγκριση στο
+benchmarks/description_search.py).
+
+Και τα δύο indexed paths έχουν την ίδια σημασία με το ILIKE (case-insensitive
+LIKE, τα % και _ του όρου λειτουργούν ως wildcards).
+"""
+import re
+import threading
+import weakref
+from flask import current_app
+from sqlalchemy import false, func, select, table, column, text
+from app import db
+from app.models import Transaction
+
+FTS_TABLE = 'transactions_fts'
+TRIGRAM_LENGTH = 3
+
+_fts_table = table(FTS_TABLE, column('rowid'), column('description'))
+_fts_available = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+def has_trigrams(term):
+    """True αν ο όρος έχει τουλάχιστον ένα trigram χωρίς wildcards"""
+    return any(len(part) >= TRIGRAM_LENGTH for part in re.split(r'[%_]', term))
+
+def fts_available(engine):
+    """Υπάρχει ο FTS5 shadow table; (cached ανά engine)"""
+    if engine.dialect.name != 'sqlite':
+        return False
+    with _lock:
+        if engine not in _fts_available:
+            # Μέσα στο session - ένα δεύτερο connection στο StaticPool (testing)
+            # θα έκανε rollback το transaction του request
+            _fts_available[engine] = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).first() is not None
+        return _fts_available[engine]
+
+def search_path(term):
+    """'trigram' (PostgreSQL), 'fts5' (SQLite) ή 'scan'"""
+    # Το engine του τρέχοντος request (primary ή read replica)
+    engine = db.session.get_bind()
+    if not current_app.config.get('SEARCH_INDEX_ENABLED', True) or not has_trigrams(term):
+        return 'scan'
+    if engine.dialect.name == 'postgresql':
+        return 'trigram'
+    if fts_available(engine):
+        return 'fts5'
+    return 'scan'
+
+def fts_candidates(pattern, limit):
+    """Έως limit + 1 rowids από τον FTS5 index"""
+    return db.session.execute(
+        select(_fts_table.c.rowid).where(_fts_table.c.description.like(pattern)).limit(limit + 1)
+    ).scalars().all()
+
+def description_condition(term):
+    """Φίλτρο 'description περιέχει term' για το πιο φθηνό διαθέσιμο path"""
+    pattern = f'%{term}%'
+    path = search_path(term)
+    if path == 'scan' and not current_app.config.get('SEARCH_INDEX_ENABLED', True):
+        # Expression χωρίς index - ούτε ο planner του PostgreSQL δεν χρησιμοποιεί τον GIN
+        return func.coalesce(Transaction.description, '').ilike(pattern)
+    if path == 'fts5':
+        limit = current_app.config.get('SEARCH_FTS_MAX_CANDIDATES', 1000)
+        rowids = fts_candidates(pattern, limit)
+        if not rowids:
+            # Κανένα match - σταθερό false, χωρίς scan του ledger
+            return false()
+        if len(rowids) <= limit:
+            return Transaction.id.in_(rowids)
+    return Transaction.description.ilike(pattern)
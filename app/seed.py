@@ -0,0 +1,326 @@
+"""
+Synthetic data seeding για την Bank API (`flask seed`)
+
+Παράγει users, accounts και transactions σε production κλίμακα:
+- ντετερμινιστικά: ίδιο --seed => ίδια δεδομένα, ανεξάρτητα από --workers
+  (κάθε account έχει δικό του RNG)
+- παράλληλα: η παραγωγή γίνεται σε processes που γράφουν CSV chunks
+- bulk load: COPY στο PostgreSQL, executemany σε μεγάλα batches στο SQLite
+- συνεπή balance_after chains: κάθε account ξεκινά από 0, τα withdrawals
+  δεν ξεπερνούν ποτέ το balance και το τελικό balance του account είναι
+  το balance_after της τελευταίας του συναλλαγής
+- ρεαλιστικό skew: Zipf κατανομή συναλλαγών ανά account (hot accounts)
+  και bursty ημέρες (paydays, bursts, λιγότερη κίνηση τα Σαββατοκύριακα)
+
+Παράγονται μόνο deposits/withdrawals: ένα transfer γράφει γραμμές σε δύο
+accounts, οπότε θα έδενε τα chains μεταξύ τους και δεν θα γινόταν η
+παραγωγή ανά account παράλληλα.
+
+Χρήση:
+    flask seed --users 100000 --transactions 10000000 --workers 8
+    flask seed --users 1000 --transactions 100000 --seed 7 --skew 0
+"""
+import csv
+import os
+import random
+import shutil
+import tempfile
+import time
+from bisect import bisect
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import User, Account, Transaction
+from app.account_numbers import format_account_number, reserve_numbers
+from app.partitions import ensure_partitions
+
+SEED_PASSWORD = 'SeedPass123'
+
+ACCOUNT_TYPES = ('checking', 'savings', 'business')
+ACCOUNT_TYPE_WEIGHTS = (55, 40, 5)
+ACCOUNTS_PER_USER = (1, 2, 3)
+ACCOUNTS_PER_USER_WEIGHTS = (50, 35, 15)
+
+DEPOSIT_DESCRIPTIONS = ('Salary', 'Cash deposit', 'Refund', 'Interest', 'Mobile deposit')
+WITHDRAWAL_DESCRIPTIONS = ('Groceries', 'Rent', 'Coffee', 'Utilities', 'Card payment', 'ATM withdrawal', 'Fuel')
+
+USER_COLUMNS = ('id', 'email', 'password_hash', 'first_name', 'last_name', 'accounts_count', 'active_accounts_count', 'created_at')
+ACCOUNT_COLUMNS = (
+    'id', 'account_number', 'account_type', 'balance', 'user_id', 'is_active',
+    'transaction_count', 'last_transaction_at', 'created_at'
+)
+TRANSACTION_COLUMNS = ('id', 'transaction_type', 'amount', 'description', 'account_id', 'balance_after', 'created_at')
+
+def day_weights(rng, days):
+    """Cumulative βάρη ημερών: paydays x2.5, weekends x0.6, ~3% bursts x4"""
+    start = datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+    start -= timedelta(days=days)
+    cumulative = []
+    total = 0.0
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weight = 1.0
+        if day.weekday() >= 5:
+            weight *= 0.6
+        if day.day in (1, 15):
+            weight *= 2.5
+        if rng.random() < 0.03:
+            weight *= 4.0
+        total += weight
+        cumulative.append(total)
+    return start, cumulative
+
+def allocate_transactions(rng, account_count, total, skew):
+    """
+    Μοιράζει total συναλλαγές σε accounts με Zipf βάρη 1/rank^skew
+    Τα ranks ανακατεύονται, ώστε τα hot accounts να είναι τυχαία
+    """
+    ranks = list(range(1, account_count + 1))
+    rng.shuffle(ranks)
+    weights = [rank ** -skew for rank in ranks]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    remainder = total - sum(counts)
+    # Το υπόλοιπο πάει στα πιο hot accounts
+    for index in sorted(range(account_count), key=ranks.__getitem__)[:remainder]:
+        counts[index] += 1
+    return counts
+
+def _format_cents(cents):
+    return f'{cents // 100}.{cents % 100:02d}'
+
+def generate_chunk(job):
+    """
+    Worker process: παράγει accounts + transactions για ένα εύρος accounts
+    και τα γράφει σε δύο CSV αρχεία. Επιστρέφει (accounts_path, transactions_path, rows)
+    """
+    (seed_value, accounts, transaction_id, start, cumulative, directory, chunk_index) = job
+    seconds_per_day = 86400
+    total_weight = cumulative[-1]
+    days = len(cumulative)
+
+    accounts_path = os.path.join(directory, f'accounts-{chunk_index:05d}.csv')
+    transactions_path = os.path.join(directory, f'transactions-{chunk_index:05d}.csv')
+    rows = 0
+
+    with open(accounts_path, 'w', newline='') as accounts_file, \
+            open(transactions_path, 'w', newline='') as transactions_file:
+        accounts_writer = csv.writer(accounts_file)
+        transactions_writer = csv.writer(transactions_file)
+
+        for account_id, account_index, user_id, account_type, number, count in accounts:
+            rng = random.Random(seed_value * 1000003 + account_index)
+
+            opened_at = rng.randrange(max(1, days // 4) * seconds_per_day)
+            timestamps = sorted(
+                bisect(cumulative, rng.random() * total_weight) * seconds_per_day + rng.randrange(seconds_per_day)
+                for _ in range(count)
+            )
+            if timestamps:
+                opened_at = min(opened_at, timestamps[0])
+
+            balance = 0
+            for timestamp in timestamps:
+                cents = max(1, min(int(rng.lognormvariate(3.5, 1.1) * 100), 1000000))
+                if balance >= cents and rng.random() < 0.55:
+                    balance -= cents
+                    transaction_type = 'withdrawal'
+                    description = rng.choice(WITHDRAWAL_DESCRIPTIONS)
+                else:
+                    # Τα deposits είναι μεγαλύτερα ώστε τα chains να μην κολλάνε στο 0
+                    cents *= 3
+                    balance += cents
+                    transaction_type = 'deposit'
+                    description = rng.choice(DEPOSIT_DESCRIPTIONS)
+
+                transactions_writer.writerow((
+                    transaction_id,
+                    transaction_type,
+                    _format_cents(cents),
+                    description,
+                    account_id,
+                    _format_cents(balance),
+                    (start + timedelta(seconds=timestamp)).isoformat(sep=' ')
+                ))
+                transaction_id += 1
+                rows += 1
+
+            # Denormalized counters: ίδια τιμή με αυτή που θα έδινε το reconcile
+            accounts_writer.writerow((
+                account_id,
+                format_account_number(account_type, number),
+                account_type,
+                _format_cents(balance),
+                user_id,
+                1,
+                count,
+                (start + timedelta(seconds=timestamps[-1])).isoformat(sep=' ') if timestamps else '',
+                (start + timedelta(seconds=opened_at)).isoformat(sep=' ')
+            ))
+
+    return accounts_path, transactions_path, rows
+
+def _load_csv(connection, dialect, table, columns, path, batch_size, empty_as_null=False):
+    """
+    Bulk load ενός CSV: COPY στο PostgreSQL, executemany αλλού
+    empty_as_null: κενά πεδία -> NULL στο executemany (το COPY το κάνει ήδη)
+    """
+    cursor = connection.cursor()
+    try:
+        if dialect == 'postgresql':
+            copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+            if hasattr(cursor, 'copy_expert'):
+                with open(path) as f:
+                    cursor.copy_expert(copy_sql, f)
+                return
+            if hasattr(cursor, 'copy'):
+                with open(path) as f, cursor.copy(copy_sql) as copy:
+                    while data := f.read(1 << 20):
+                        copy.write(data)
+                return
+
+        placeholder = '%s' if dialect == 'postgresql' else '?'
+        insert_sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join([placeholder] * len(columns))})"
+        )
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            while batch := list(islice(reader, batch_size)):
+                if empty_as_null:
+                    batch = [[value if value != '' else None for value in row] for row in batch]
+                cursor.executemany(insert_sql, batch)
+    finally:
+        cursor.close()
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+@click.command('seed')
+@click.option('--users', type=int, default=1000, show_default=True)
+@click.option('--transactions', type=int, default=100000, show_default=True, help='Συνολικές συναλλαγές')
+@click.option('--days', type=int, default=365, show_default=True, help='Χρονικό εύρος συναλλαγών')
+@click.option('--skew', type=float, default=0.8, show_default=True, help='Zipf exponent (0 = ομοιόμορφα)')
+@click.option('--seed', 'seed_value', type=int, default=42, show_default=True)
+@click.option('--workers', type=int, default=os.cpu_count() or 1, show_default=True)
+@click.option('--batch-size', type=int, default=50000, show_default=True, help='Rows ανά executemany (SQLite)')
+@click.option('--skip-stats', is_flag=True, help='Χωρίς rebuild των transaction_daily_stats')
+@with_appcontext
+def seed_command(users, transactions, days, skew, seed_value, workers, batch_size, skip_stats):
+    """Γεμίζει τη βάση με ντετερμινιστικά synthetic δεδομένα"""
+    from app.rollups import backfill_transaction_stats
+
+    started = time.perf_counter()
+    rng = random.Random(seed_value)
+    email_prefix = f'seed{seed_value}-'
+
+    if User.query.filter(User.email == f'{email_prefix}0@example.com').first():
+        raise click.ClickException(f'Database already seeded with --seed {seed_value}, use another seed')
+
+    user_id = _next_id(User)
+    account_id = _next_id(Account)
+    transaction_id = _next_id(Transaction)
+
+    start, cumulative = day_weights(rng, days)
+
+    # Accounts ανά user (το user/account layout εξαρτάται μόνο από το seed)
+    accounts = []
+    for user_index in range(users):
+        for _ in range(rng.choices(ACCOUNTS_PER_USER, ACCOUNTS_PER_USER_WEIGHTS)[0]):
+            account_type = rng.choices(ACCOUNT_TYPES, ACCOUNT_TYPE_WEIGHTS)[0]
+            accounts.append([account_id + len(accounts), len(accounts), user_id + user_index, account_type])
+    counts = allocate_transactions(rng, len(accounts), transactions, skew)
+    
+    # Account numbers από τον ίδιο allocator με το create_account (χωρίς collisions)
+    for account, number in zip(accounts, reserve_numbers(len(accounts))):
+        account.append(number)
+
+    # Chunks με ~ίδιο αριθμό συναλλαγών, ώστε οι workers να ισοβαρούν
+    directory = tempfile.mkdtemp(prefix='bank-seed-')
+    target = max(1, transactions // max(1, workers * 4))
+    jobs, chunk, chunk_rows, next_transaction_id = [], [], 0, transaction_id
+    chunk_start_id = transaction_id
+    for account, count in zip(accounts, counts):
+        chunk.append((*account, count))
+        chunk_rows += count
+        next_transaction_id += count
+        if chunk_rows >= target:
+            jobs.append((seed_value, chunk, chunk_start_id, start, cumulative, directory, len(jobs)))
+            chunk, chunk_rows, chunk_start_id = [], 0, next_transaction_id
+    if chunk:
+        jobs.append((seed_value, chunk, chunk_start_id, start, cumulative, directory, len(jobs)))
+
+    try:
+        users_path = os.path.join(directory, 'users.csv')
+        password_hash = generate_password_hash(SEED_PASSWORD)
+        created_at = start.isoformat(sep=' ')
+        # Όλοι οι seeded λογαριασμοί είναι ενεργοί (accounts_count == active_accounts_count)
+        accounts_per_user = Counter(account[2] for account in accounts)
+        with open(users_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            for user_index in range(users):
+                writer.writerow((
+                    user_id + user_index, f'{email_prefix}{user_index}@example.com',
+                    password_hash, 'Seed', f'User{user_index}',
+                    accounts_per_user[user_id + user_index],
+                    accounts_per_user[user_id + user_index], created_at
+                ))
+
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(generate_chunk, jobs))
+        generated = time.perf_counter()
+        click.echo(f'Generated {len(accounts)} accounts / {transactions} transactions '
+                   f'in {generated - started:.1f}s ({len(jobs)} chunks)')
+
+        # Partitioned transactions (PostgreSQL): ένα partition για κάθε μήνα
+        # του seed, αλλιώς όλες οι γραμμές καταλήγουν στο default partition
+        ensure_partitions(start, datetime.now(timezone.utc))
+
+        dialect = db.engine.dialect.name
+        connection = db.engine.raw_connection()
+        try:
+            if dialect == 'sqlite':
+                previous_sync = connection.execute('PRAGMA synchronous').fetchone()[0]
+                connection.execute('PRAGMA synchronous = OFF')
+            _load_csv(connection, dialect, 'users', USER_COLUMNS, users_path, batch_size)
+            for accounts_path, _, _ in results:
+                _load_csv(connection, dialect, 'accounts', ACCOUNT_COLUMNS, accounts_path, batch_size, empty_as_null=True)
+            for _, transactions_path, _ in results:
+                _load_csv(connection, dialect, 'transactions', TRANSACTION_COLUMNS, transactions_path, batch_size)
+
+            if dialect == 'postgresql':
+                # Explicit ids => τα sequences πρέπει να προχωρήσουν
+                cursor = connection.cursor()
+                for table in ('users', 'accounts', 'transactions'):
+                    cursor.execute(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                    )
+                cursor.close()
+            connection.commit()
+            if dialect == 'sqlite':
+                connection.execute(f'PRAGMA synchronous = {previous_sync}')
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+        click.echo(f'Loaded into {dialect} in {time.perf_counter() - generated:.1f}s')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if not skip_stats:
+        click.echo(f'Rebuilt {backfill_transaction_stats()} daily stat rows')
+
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.connect() as conn:
+            conn.exec_driver_sql('ANALYZE users, accounts, transactions, transaction_daily_stats')
+
+    click.echo(f'Seeded {users} users, {len(accounts)} accounts, {transactions} transactions '
+               f'in {time.perf_counter() - started:.1f}s (password: {SEED_PASSWORD})')
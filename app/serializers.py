@@ -0,0 +1,46 @@
+"""
+Bulk serialization για Transaction / Account / User
+
+Τα to_dict() των models κάνουν lazy loads ανά γραμμή (N+1 queries).
+Εδώ μαζεύουμε όλα τα referenced ids μιας σελίδας και τα φέρνουμε με
+ΕΝΑ query IN (...) ανά entity type, και μετά περνάμε τα έτοιμα
+mappings στα to_dict().
+"""
+from app import db
+from app.models import User, Account
+
+def serialize_transactions(transactions):
+    """Serialize λίστας transactions με ένα query για όλα τα account numbers"""
+    if not transactions:
+        return []
+
+    account_ids = set()
+    for tnx in transactions:
+        account_ids.add(tnx.account_id)
+        if tnx.to_account_id:
+            account_ids.add(tnx.to_account_id)
+
+    # Φέρνουμε μόνο (id, account_number), όχι ολόκληρα Account objects
+    account_numbers = dict(
+        db.session.query(Account.id, Account.account_number).filter(
+            Account.id.in_(account_ids)
+        ).all()
+    )
+
+    return [tnx.to_dict(account_numbers=account_numbers) for tnx in transactions]
+
+def serialize_accounts(accounts):
+    """Serialize λίστας accounts με ένα query για όλα τα user emails"""
+    if not accounts:
+        return []
+
+    user_ids = {account.user_id for account in accounts}
+    user_emails = dict(
+        db.session.query(User.id, User.email).filter(User.id.in_(user_ids)).all()
+    )
+
+    return [account.to_dict(user_emails=user_emails) for account in accounts]
+
+def serialize_users(users):
+    """Serialize λίστας users - το accounts_count είναι denormalized στο User"""
+    return [user.to_dict() for user in users]
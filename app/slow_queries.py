@@ -0,0 +1,130 @@
+"""
+Slow-query log για την Bank API
+
+Αντί για SQLALCHEMY_ECHO (που γράφει ΚΑΘΕ statement), καταγράφουμε μόνο
+όσα statements ξεπερνούν το SLOW_QUERY_THRESHOLD_MS, μαζί με parameters,
+διάρκεια και το endpoint από το οποίο ήρθαν. Για ένα δείγμα από αυτά
+(SLOW_QUERY_EXPLAIN_SAMPLE_RATE) κρατάμε και το EXPLAIN (ANALYZE) output.
+Όλα γράφονται ως JSON lines σε rotating αρχείο.
+"""
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from flask import request, has_request_context
+from sqlalchemy import event
+
+logger = logging.getLogger('bank.slow_queries')
+
+MAX_PARAMETERS_LENGTH = 2000
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+class SlowQueryLogger:
+    """Engine listeners που καταγράφουν τα αργά statements"""
+
+    def __init__(self, threshold_ms, explain_sample_rate=0.0, explain_analyze=False):
+        self.threshold = threshold_ms / 1000.0
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_analyze = explain_analyze
+
+    def install(self, engine):
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('slow_query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if elapsed < self.threshold:
+            return
+
+        record = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(elapsed * 1000, 3),
+            'statement': statement,
+            'parameters': repr(parameters)[:MAX_PARAMETERS_LENGTH],
+            'executemany': executemany
+        }
+        if has_request_context():
+            record['endpoint'] = request.endpoint
+            record['method'] = request.method
+            record['path'] = request.path
+
+        explainable = statement.lstrip().upper().startswith(EXPLAINABLE)
+        if explainable and not executemany and self.explain_sample_rate and random.random() < self.explain_sample_rate:
+            record['explain'] = self.explain(conn, cursor, statement, parameters)
+
+        logger.warning(json.dumps(record, default=str))
+
+    def explain(self, conn, cursor, statement, parameters):
+        """
+        EXPLAIN στο ίδιο DBAPI connection (ίδιο transaction, χωρίς engine events)
+        ANALYZE μόνο για SELECT - ξανατρέχει το query, οπότε ποτέ σε writes
+        (ούτε WITH, που μπορεί να περιέχει INSERT/UPDATE/DELETE)
+        Στο PostgreSQL μέσα σε SAVEPOINT: ένα αποτυχημένο EXPLAIN θα έκανε
+        abort όλο το transaction του request
+        """
+        try:
+            dialect = conn.dialect.name
+            is_select = statement.lstrip().upper().startswith('SELECT')
+            if dialect == 'postgresql':
+                options = 'ANALYZE, BUFFERS, ' if self.explain_analyze and is_select else ''
+                prefix = f'EXPLAIN ({options}FORMAT TEXT) '
+            elif dialect == 'sqlite':
+                prefix = 'EXPLAIN QUERY PLAN '
+            else:
+                prefix = 'EXPLAIN '
+
+            use_savepoint = dialect == 'postgresql'
+            explain_cursor = cursor.connection.cursor()
+            try:
+                if use_savepoint:
+                    explain_cursor.execute('SAVEPOINT slow_query_explain')
+                try:
+                    explain_cursor.execute(prefix + statement, parameters)
+                    return '\n'.join(str(row[-1]) for row in explain_cursor.fetchall())
+                finally:
+                    if use_savepoint:
+                        # Και στην επιτυχία: ό,τι έκανε το EXPLAIN δεν μένει στο transaction
+                        explain_cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                        explain_cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            finally:
+                explain_cursor.close()
+        except Exception as e:
+            return f'EXPLAIN failed: {e}'
+
+def init_slow_query_log(app, *engines):
+    """Ενεργοποιείται μόνο αν SLOW_QUERY_THRESHOLD_MS > 0"""
+    threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', 0)
+    if not threshold_ms or threshold_ms <= 0:
+        return
+
+    log_file = app.config['SLOW_QUERY_LOG_FILE']
+    if not logger.handlers:
+        log_dir = os.path.dirname(log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        handler = RotatingFileHandler(
+            log_file,
+            maxBytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024),
+            backupCount=app.config.get('SLOW_QUERY_LOG_BACKUP_COUNT', 5)
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+
+    slow_query_logger = SlowQueryLogger(
+        threshold_ms,
+        explain_sample_rate=app.config.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.0),
+        explain_analyze=app.config.get('SLOW_QUERY_EXPLAIN_ANALYZE', False)
+    )
+    for engine in engines:
+        slow_query_logger.install(engine)
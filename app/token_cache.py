@@ -0,0 +1,111 @@
+"""
+In-process cache για decoded JWT tokens και user snapshots
+
+Το token_required κάνει jwt.decode + User.query.get σε κάθε request.
+Εδώ κρατάμε (bounded LRU με TTL) τα verified claims και ένα ελαφρύ
+snapshot των στηλών του user, ώστε τα επόμενα requests με το ίδιο token
+να μην κάνουν κανένα DB round-trip πριν τον handler.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Οι στήλες του User που κρατάμε στο snapshot (όχι password_hash)
+SNAPSHOT_FIELDS = ('id', 'email', 'first_name', 'last_name', 'phone', 'version', 'accounts_count', 'active_accounts_count', 'created_at', 'updated_at')
+
+class TokenCache:
+    """Thread-safe LRU cache με TTL, keyed by sha256 του token"""
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tokens_by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_size, ttl):
+        """Ρυθμίσεις από το app config (καλείται από το create_app)"""
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and self.ttl > 0
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token):
+        """Επιστρέφει (claims, user_snapshot) ή None αν δεν υπάρχει/έληξε"""
+        if not self.enabled:
+            return None
+
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, token, claims, user):
+        """Αποθηκεύει claims + snapshot του user. Δεν ξεπερνάει ποτέ το exp του token"""
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl
+        if 'exp' in claims:
+            expires_at = min(expires_at, float(claims['exp']))
+
+        snapshot = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+        key = self._key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, claims, snapshot)
+            self._tokens_by_user.setdefault(snapshot['id'], set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def invalidate_user(self, user_id):
+        """Σβήνει όλα τα cached tokens ενός user (π.χ. μετά από update_profile)"""
+        with self._lock:
+            for key in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[2]['id']
+        keys = self._tokens_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tokens_by_user[user_id]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+token_cache = TokenCache()
@@ -1,44 +1,73 @@
 # Bank API - Transactions SQLAlchemy Examples
 # Βάσει των δικών σου models: User, Account, Transaction
 
-from flask import Blueprint, request, jsonify, current_app, g
+from flask import Blueprint, request, jsonify, current_app, g, Response, stream_with_context
 from app import db
-from app.models import User, Account, Transaction
+from app.models import User, Account, Transaction, TransactionDailyStat
 from app.decorators import token_required
+from app.query_budget import query_budget
+from app.pagination import is_cursor_mode, keyset_paginate
+from app.serializers import serialize_transactions
+from app.rollups import record_transaction_stats, record_batch_stats
+from app.balances import credit_account, debit_account, lock_accounts
+from app.retry import run_with_retry
+from app.idempotency import idempotent, record_idempotent_response, store_idempotent_response
+from app.group_commit import group_committer
+from app.search import description_condition
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
-from sqlalchemy.orm import joinedload
-from sqlalchemy import func, and_, or_, desc, asc, text
+from sqlalchemy import func, and_, or_, desc, asc, text, insert
 from sqlalchemy.exc import IntegrityError
+import csv
+import io
+import json
 
 transactions_bp = Blueprint('transactions', __name__, url_prefix='/api/transactions')
 
 # ==================== ΒΑΣΙΚΕΣ QUERIES ΓΙΑ TRANSACTIONS ====================
 
 @transactions_bp.route('/', methods=['GET'])
+@query_budget(4)
 @token_required
 def get_user_transactions():
     """Παίρνει όλες τις transactions όλων των accounts του user"""
     try:
         user = g.current_user
         
-        # Πάρε όλες τις transactions των accounts του user με JOIN
-        transactions = db.session.query(Transaction).join(Account).filter(
+        # Πάρε τις transactions των accounts του user με JOIN
+        query = db.session.query(Transaction).join(Account).filter(
             Account.user_id == user.id
-        ).order_by(desc(Transaction.created_at)).all()
+        )
+        
+        # Cursor mode: seek στο (created_at, id) αντί για OFFSET, χωρίς COUNT(*)
+        if is_cursor_mode(request.args):
+            per_page = request.args.get('per_page', 10, type=int)
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            try:
+                items, pagination = keyset_paginate(
+                    query,
+                    per_page=per_page,
+                    cursor=request.args.get('cursor'),
+                    include_total=include_total
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            return jsonify({
+                'transactions': serialize_transactions(items),
+                'pagination': pagination
+            }), 200
         
         # Με pagination
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         
-        transactions_paginated = db.session.query(Transaction).join(Account).filter(
-            Account.user_id == user.id
-        ).order_by(desc(Transaction.created_at)).paginate(
+        transactions_paginated = query.order_by(desc(Transaction.created_at)).paginate(
             page=page, per_page=per_page, error_out=False
         )
         
         return jsonify({
-            'transactions': [tnx.to_dict() for tnx in transactions_paginated.items],
+            'transactions': serialize_transactions(transactions_paginated.items),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -54,6 +83,7 @@ def get_user_transactions():
         return jsonify({'error': 'Internal server error'}), 500
 
 @transactions_bp.route('/account/<int:account_id>', methods=['GET'])
+@query_budget(4)
 @token_required
 def get_account_transactions(account_id):
     """Παίρνει transactions συγκεκριμένου account"""
@@ -106,7 +136,7 @@ def get_account_transactions(account_id):
         
         return jsonify({
             'account_number': account.account_number,
-            'transactions': [tnx.to_dict() for tnx in transactions],
+            'transactions': serialize_transactions(transactions),
             'total_transactions': len(transactions),
             'filters_applied': {
                 'transaction_type': transaction_type,
@@ -124,69 +154,73 @@ def get_account_transactions(account_id):
 # ==================== STATISTICS & AGGREGATIONS ====================
 
 @transactions_bp.route('/stats', methods=['GET'])
+@query_budget(3)
 @token_required
 def get_transaction_statistics():
     """Statistics για όλες τις transactions του user"""
     try:
         user = g.current_user
         
-        # Join με Account για να πάρουμε μόνο τις transactions του user
-        base_query = db.session.query(Transaction).join(Account).filter(Account.user_id == user.id)
-        
-        # Συνολικά στατιστικά
-        total_transactions = base_query.count()
+        # Διαβάζουμε από τα ημερήσια rollups (transaction_daily_stats) αντί να
+        # σκανάρουμε όλο το ledger - λίγες εκατοντάδες μικρές γραμμές
+        user_account_ids = db.session.query(Account.id).filter(Account.user_id == user.id)
         
         # Group by transaction type
         stats_by_type = db.session.query(
-            Transaction.transaction_type,
-            func.count(Transaction.id).label('count'),
-            func.sum(Transaction.amount).label('total_amount'),
-            func.avg(Transaction.amount).label('avg_amount'),
-            func.max(Transaction.amount).label('max_amount'),
-            func.min(Transaction.amount).label('min_amount')
-        ).join(Account).filter(Account.user_id == user.id).group_by(Transaction.transaction_type).all()
-        
-        # Μηνιαίες statistics (τελευταίοι 6 μήνες)
-        six_months_ago = datetime.now(timezone.utc) - timedelta(days=180)
-        monthly_stats = db.session.query(
-            func.date_trunc('month', Transaction.created_at).label('month'),
-            func.count(Transaction.id).label('count'),
-            func.sum(Transaction.amount).label('total_amount')
-        ).join(Account).filter(
-            Account.user_id == user.id,
-            Transaction.created_at >= six_months_ago
-        ).group_by(func.date_trunc('month', Transaction.created_at)).order_by('month').all()
+            TransactionDailyStat.transaction_type,
+            func.sum(TransactionDailyStat.transaction_count).label('count'),
+            func.sum(TransactionDailyStat.total_amount).label('total_amount'),
+            func.max(TransactionDailyStat.max_amount).label('max_amount'),
+            func.min(TransactionDailyStat.min_amount).label('min_amount')
+        ).filter(
+            TransactionDailyStat.account_id.in_(user_account_ids)
+        ).group_by(TransactionDailyStat.transaction_type).all()
+        
+        # Συνολικά στατιστικά
+        total_transactions = sum(int(stat[1]) for stat in stats_by_type)
+        
+        # Ημερήσια rollups των τελευταίων 6 μηνών (ενωμένα για όλα τα accounts)
+        six_months_ago = (datetime.now(timezone.utc) - timedelta(days=180)).date()
+        thirty_days_ago = (datetime.now(timezone.utc) - timedelta(days=30)).date()
+        daily_rows = db.session.query(
+            TransactionDailyStat.day,
+            func.sum(TransactionDailyStat.transaction_count).label('count'),
+            func.sum(TransactionDailyStat.total_amount).label('total_amount')
+        ).filter(
+            TransactionDailyStat.account_id.in_(user_account_ids),
+            TransactionDailyStat.day >= six_months_ago
+        ).group_by(TransactionDailyStat.day).order_by(TransactionDailyStat.day).all()
+        
+        # Μηνιαίες statistics (τελευταίοι 6 μήνες) - aggregation στην Python
+        monthly_totals = {}
+        for day, count, total_amount in daily_rows:
+            month = day.strftime('%Y-%m')
+            month_count, month_amount = monthly_totals.get(month, (0, Decimal('0.00')))
+            monthly_totals[month] = (month_count + int(count), month_amount + Decimal(total_amount or 0))
         
         # Daily activity (τελευταίες 30 ημέρες)
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        daily_activity = db.session.query(
-            func.date(Transaction.created_at).label('date'),
-            func.count(Transaction.id).label('count')
-        ).join(Account).filter(
-            Account.user_id == user.id,
-            Transaction.created_at >= thirty_days_ago
-        ).group_by(func.date(Transaction.created_at)).order_by('date').all()
+        daily_activity = [(day, int(count)) for day, count, _ in daily_rows if day >= thirty_days_ago]
         
         return jsonify({
             'total_transactions': total_transactions,
             'stats_by_type': [
                 {
                     'transaction_type': stat[0],
-                    'count': stat[1],
+                    'count': int(stat[1]),
                     'total_amount': str(stat[2]) if stat[2] else '0',
-                    'avg_amount': str(round(stat[3], 2)) if stat[3] else '0',
-                    'max_amount': str(stat[4]) if stat[4] else '0',
-                    'min_amount': str(stat[5]) if stat[5] else '0'
+                    'avg_amount': str(round(Decimal(stat[2]) / int(stat[1]), 2)) if stat[2] else '0',
+                    'max_amount': str(stat[3]) if stat[3] else '0',
+                    'min_amount': str(stat[4]) if stat[4] else '0'
                 }
                 for stat in stats_by_type
             ],
             'monthly_stats': [
                 {
-                    'month': stat[0].strftime('%Y-%m'),
-                    'count': stat[1],
-                    'total_amount': str(stat[2]) if stat[2] else '0'
+                    'month': month,
+                    'count': count,
+                    'total_amount': str(total_amount) if total_amount else '0'
                 }
-                for stat in monthly_stats
+                for month, (count, total_amount) in monthly_totals.items()
             ],
             'daily_activity': [
                 {
@@ -203,10 +237,123 @@ def get_transaction_statistics():
 
 # ==================== TRANSACTION OPERATIONS ====================
 
+def _apply_deposit(user_id, account_id, amount, description, idempotency=None):
+    """
+    Deposit μέσα στο τρέχον DB transaction (χωρίς commit/rollback)
+    Επιστρέφει (body, status) - καλείται από τον handler ή το group commit
+    """
+    # Atomic UPDATE ... RETURNING - ο έλεγχος ownership/is_active
+    # γίνεται στο ίδιο statement, χωρίς ξεχωριστό SELECT
+    now = datetime.now(timezone.utc)
+    new_balance = credit_account(account_id, amount, user_id=user_id, at=now)
+    if new_balance is None:
+        return {'error': 'Account not found or inactive'}, 404
+    old_balance = new_balance - amount
+    
+    # Δημιουργία transaction record
+    transaction = Transaction(
+        transaction_type='deposit',
+        amount=amount,
+        description=description,
+        account_id=account_id,
+        balance_after=new_balance,
+        created_at=now
+    )
+    
+    db.session.add(transaction)
+    record_transaction_stats(transaction)
+    db.session.flush()
+    
+    body = {
+        'message': 'Deposit successful',
+        'transaction': transaction.to_dict(),
+        'account_balance': str(new_balance),
+        'previous_balance': str(old_balance)
+    }
+    # Η απάντηση αποθηκεύεται στο ίδιο commit (Idempotency-Key)
+    store_idempotent_response(user_id, idempotency, body, 201)
+    return body, 201
+
+def _apply_withdrawal(user_id, account_id, amount, description, idempotency=None):
+    """
+    Withdrawal μέσα στο τρέχον DB transaction (χωρίς commit/rollback)
+    Επιστρέφει (body, status) - καλείται από τον handler ή το group commit
+    """
+    # Atomic conditional UPDATE: χρεώνει μόνο αν balance >= amount
+    now = datetime.now(timezone.utc)
+    new_balance = debit_account(account_id, amount, user_id=user_id, at=now)
+    if new_balance is None:
+        # Μόνο στο failure path: βρες αν φταίει ο λογαριασμός ή το υπόλοιπο
+        # (το UPDATE δεν άλλαξε τίποτα, οπότε δεν χρειάζεται rollback εδώ)
+        account = Account.query.filter_by(id=account_id, user_id=user_id, is_active=True).first()
+        if not account:
+            return {'error': 'Account not found or inactive'}, 404
+        return {
+            'error': 'Insufficient funds',
+            'current_balance': str(account.balance),
+            'requested_amount': str(amount)
+        }, 400
+    old_balance = new_balance + amount
+    
+    # Δημιουργία transaction record
+    transaction = Transaction(
+        transaction_type='withdrawal',
+        amount=amount,
+        description=description,
+        account_id=account_id,
+        balance_after=new_balance,
+        created_at=now
+    )
+    
+    db.session.add(transaction)
+    record_transaction_stats(transaction)
+    db.session.flush()
+    
+    body = {
+        'message': 'Withdrawal successful',
+        'transaction': transaction.to_dict(),
+        'account_balance': str(new_balance),
+        'previous_balance': str(old_balance)
+    }
+    # Η απάντηση αποθηκεύεται στο ίδιο commit (Idempotency-Key)
+    store_idempotent_response(user_id, idempotency, body, 201)
+    return body, 201
+
+def _post_balance_operation(apply, user_id, account_id, amount, description):
+    """
+    Τρέχει ένα _apply_deposit/_apply_withdrawal είτε με δικό του commit
+    είτε μέσω του group commit (GROUP_COMMIT_ENABLED)
+    """
+    idempotency = g.get('idempotency')
+    
+    if group_committer.enabled:
+        # Αποδεσμεύουμε το connection του request πριν περιμένουμε το batch,
+        # αλλιώς τα requests που περιμένουν θα άδειαζαν το pool
+        db.session.rollback()
+        body, status = group_committer.submit(apply, user_id, account_id, amount, description, idempotency)
+        return jsonify(body), status
+    
+    # Transaction με rollback support
+    try:
+        body, status = apply(user_id, account_id, amount, description, idempotency)
+        if status == 201:
+            db.session.commit()
+        else:
+            db.session.rollback()
+        return jsonify(body), status
+    except Exception as e:
+        db.session.rollback()
+        raise e
+
 @transactions_bp.route('/deposit', methods=['POST'])
+@query_budget(8)
 @token_required
+@idempotent
 def deposit_money():
-    """Κατάθεση χρημάτων σε λογαριασμό"""
+    """
+    Κατάθεση χρημάτων σε λογαριασμό
+    Προαιρετικό header Idempotency-Key για ασφαλή retries
+    """
     try:
         user = g.current_user
         data = request.get_json()
@@ -226,40 +373,7 @@ def deposit_money():
         except (ValueError, TypeError):
             return jsonify({'error': 'Invalid amount format'}), 400
         
-        # Έλεγχος ότι ο account ανήκει στον user
-        account = Account.query.filter_by(id=account_id, user_id=user.id, is_active=True).first()
-        if not account:
-            return jsonify({'error': 'Account not found or inactive'}), 404
-        
-        # Transaction με rollback support
-        try:
-            # Ενημέρωση balance
-            old_balance = account.balance
-            account.balance += amount
-            new_balance = account.balance
-            
-            # Δημιουργία transaction record
-            transaction = Transaction(
-                transaction_type='deposit',
-                amount=amount,
-                description=description,
-                account_id=account_id,
-                balance_after=new_balance
-            )
-            
-            db.session.add(transaction)
-            db.session.commit()
-            
-            return jsonify({
-                'message': 'Deposit successful',
-                'transaction': transaction.to_dict(),
-                'account_balance': str(new_balance),
-                'previous_balance': str(old_balance)
-            }), 201
-            
-        except Exception as e:
-            db.session.rollback()
-            raise e
+        return _post_balance_operation(_apply_deposit, user.id, account_id, amount, description)
         
     except Exception as e:
         db.session.rollback()
@@ -267,9 +381,14 @@ def deposit_money():
         return jsonify({'error': 'Internal server error'}), 500
 
 @transactions_bp.route('/withdraw', methods=['POST'])
+@query_budget(8)
 @token_required
+@idempotent
 def withdraw_money():
-    """Ανάληψη χρημάτων από λογαριασμό"""
+    """
+    Ανάληψη χρημάτων από λογαριασμό
+    Προαιρετικό header Idempotency-Key για ασφαλή retries
+    """
     try:
         user = g.current_user
         data = request.get_json()
@@ -289,58 +408,132 @@ def withdraw_money():
         except (ValueError, TypeError):
             return jsonify({'error': 'Invalid amount format'}), 400
         
-        # Έλεγχος ότι ο account ανήκει στον user
-        account = Account.query.filter_by(id=account_id, user_id=user.id, is_active=True).first()
-        if not account:
-            return jsonify({'error': 'Account not found or inactive'}), 404
+        return _post_balance_operation(_apply_withdrawal, user.id, account_id, amount, description)
         
-        # Έλεγχος επαρκούς υπολοίπου
-        if account.balance < amount:
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Withdrawal error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def _perform_transfer(user_id, from_account_id, to_account_number, amount, description):
+    """
+    Ένα ολόκληρο transfer DB transaction (lookups, locks, updates, commit)
+    Τρέχει μέσα από το run_with_retry, οπότε πρέπει να είναι re-runnable
+    """
+    # Έλεγχος source account (πρέπει να ανήκει στον user)
+    from_account = Account.query.filter_by(
+        id=from_account_id, 
+        user_id=user_id, 
+        is_active=True
+    ).first()
+    if not from_account:
+        return jsonify({'error': 'Source account not found or inactive'}), 404
+    
+    # Έλεγχος destination account (μπορεί να ανήκει σε οποιονδήποτε)
+    to_account = Account.query.filter_by(
+        account_number=to_account_number, 
+        is_active=True
+    ).first()
+    if not to_account:
+        return jsonify({'error': 'Destination account not found or inactive'}), 404
+    
+    # Έλεγχος ότι δεν είναι ο ίδιος λογαριασμός
+    if from_account.id == to_account.id:
+        return jsonify({'error': 'Cannot transfer to the same account'}), 400
+    
+    # Atomic transaction με rollback support
+    try:
+        # Κλειδώνουμε ΠΑΝΤΑ με αύξουσα σειρά id ώστε τα A->B και B->A
+        # να μην κάνουν deadlock μεταξύ τους
+        lock_accounts([from_account.id, to_account.id])
+        
+        # Conditional UPDATEs - ο έλεγχος υπολοίπου γίνεται ατομικά στη βάση
+        now = datetime.now(timezone.utc)
+        from_new_balance = debit_account(from_account.id, amount, at=now)
+        if from_new_balance is None:
+            # Το balance του from_account φορτώθηκε πριν το lock - το
+            # ξαναδιαβάζουμε όσο κρατάμε ακόμα το lock (αυτό απέρριψε το UPDATE)
+            db.session.refresh(from_account)
+            current_balance = from_account.balance
+            db.session.rollback()
             return jsonify({
                 'error': 'Insufficient funds',
-                'current_balance': str(account.balance),
+                'current_balance': str(current_balance),
                 'requested_amount': str(amount)
             }), 400
         
-        # Transaction με rollback support
-        try:
-            # Ενημέρωση balance
-            old_balance = account.balance
-            account.balance -= amount
-            new_balance = account.balance
-            
-            # Δημιουργία transaction record
-            transaction = Transaction(
-                transaction_type='withdrawal',
-                amount=amount,
-                description=description,
-                account_id=account_id,
-                balance_after=new_balance
-            )
-            
-            db.session.add(transaction)
-            db.session.commit()
-            
-            return jsonify({
-                'message': 'Withdrawal successful',
-                'transaction': transaction.to_dict(),
-                'account_balance': str(new_balance),
-                'previous_balance': str(old_balance)
-            }), 201
-            
-        except Exception as e:
+        to_new_balance = credit_account(to_account.id, amount, at=now)
+        if to_new_balance is None:
             db.session.rollback()
-            raise e
+            return jsonify({'error': 'Destination account not found or inactive'}), 404
+        
+        from_old_balance = from_new_balance + amount
+        to_old_balance = to_new_balance - amount
+        
+        # Δημιουργία transaction records
+        # Outgoing transaction (για τον αποστολέα)
+        outgoing_transaction = Transaction(
+            transaction_type='transfer',
+            amount=amount,
+            description=f"Transfer to {to_account.account_number}: {description}",
+            account_id=from_account.id,
+            to_account_id=to_account.id,
+            balance_after=from_new_balance,
+            created_at=now
+        )
+        
+        # Incoming transaction (για τον παραλήπτη)
+        incoming_transaction = Transaction(
+            transaction_type='transfer',
+            amount=amount,
+            description=f"Transfer from {from_account.account_number}: {description}",
+            account_id=to_account.id,
+            to_account_id=from_account.id,  # Reference στον sender
+            balance_after=to_new_balance,
+            created_at=now
+        )
+        
+        db.session.add(outgoing_transaction)
+        db.session.add(incoming_transaction)
+        record_transaction_stats(outgoing_transaction)
+        record_transaction_stats(incoming_transaction)
+        db.session.flush()
+        
+        body = {
+            'message': 'Transfer successful',
+            'from_account': {
+                'account_number': from_account.account_number,
+                'previous_balance': str(from_old_balance),
+                'new_balance': str(from_new_balance),
+                'transaction_id': outgoing_transaction.id
+            },
+            'to_account': {
+                'account_number': to_account.account_number,
+                'previous_balance': str(to_old_balance),
+                'new_balance': str(to_new_balance),
+                'transaction_id': incoming_transaction.id
+            },
+            'transfer_amount': str(amount)
+        }
+        # Η απάντηση αποθηκεύεται στο ίδιο commit (Idempotency-Key)
+        record_idempotent_response(body, 201)
+        db.session.commit()
+        
+        return jsonify(body), 201
         
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Withdrawal error: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        raise e
 
 @transactions_bp.route('/transfer', methods=['POST'])
+@query_budget(17)
 @token_required
+@idempotent
 def transfer_money():
-    """Μεταφορά χρημάτων μεταξύ λογαριασμών"""
+    """
+    Μεταφορά χρημάτων μεταξύ λογαριασμών
+    Προαιρετικό header Idempotency-Key για ασφαλή retries
+    """
     try:
         user = g.current_user
         data = request.get_json()
@@ -361,152 +554,381 @@ def transfer_money():
         except (ValueError, TypeError):
             return jsonify({'error': 'Invalid amount format'}), 400
         
-        # Έλεγχος source account (πρέπει να ανήκει στον user)
-        from_account = Account.query.filter_by(
-            id=from_account_id, 
-            user_id=user.id, 
-            is_active=True
-        ).first()
-        if not from_account:
-            return jsonify({'error': 'Source account not found or inactive'}), 404
-        
-        # Έλεγχος destination account (μπορεί να ανήκει σε οποιονδήποτε)
-        to_account = Account.query.filter_by(
-            account_number=to_account_number, 
-            is_active=True
-        ).first()
-        if not to_account:
-            return jsonify({'error': 'Destination account not found or inactive'}), 404
+        # Deadlocks/serialization failures ξανατρέχουν με backoff + jitter
+        return run_with_retry(
+            _perform_transfer, user.id, from_account_id, to_account_number, amount, description
+        )
         
-        # Έλεγχος ότι δεν είναι ο ίδιος λογαριασμός
-        if from_account.id == to_account.id:
-            return jsonify({'error': 'Cannot transfer to the same account'}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Transfer error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+# ==================== BATCH POSTING ====================
+
+BATCH_ITEM_TYPES = {'deposit': 'deposit', 'withdraw': 'withdrawal', 'withdrawal': 'withdrawal', 'transfer': 'transfer'}
+
+def _batch_query_budget():
+    """
+    Σταθερό κόστος + έως 4 statements ανά item (ένα conditional UPDATE ανά
+    λογαριασμό του item - δύο στα transfers - και έως δύο stats upserts)
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('items') if isinstance(data, dict) else None
+    return 5 + 4 * (len(items) if isinstance(items, list) else 0)
+
+def _parse_batch_item(item):
+    """
+    Validation ενός batch item χωρίς DB
+    Επιστρέφει (parsed_item, None) ή (None, error_message)
+    """
+    if not isinstance(item, dict):
+        return None, 'Item must be an object'
+    
+    item_type = BATCH_ITEM_TYPES.get(str(item.get('type', '')).lower())
+    if not item_type:
+        return None, 'type must be one of deposit, withdrawal, transfer'
+    
+    if not item.get('amount'):
+        return None, 'amount is required'
+    try:
+        amount = Decimal(str(item['amount']))
+    except (ArithmeticError, ValueError, TypeError):
+        return None, 'Invalid amount format'
+    if amount <= 0:
+        return None, 'Amount must be positive'
+    
+    parsed = {'type': item_type, 'amount': amount, 'description': item.get('description')}
+    try:
+        if item_type == 'transfer':
+            if not item.get('from_account_id') or not item.get('to_account_number'):
+                return None, 'from_account_id and to_account_number are required'
+            parsed['from_account_id'] = int(str(item['from_account_id']))
+            parsed['to_account_number'] = str(item['to_account_number'])
+        else:
+            if not item.get('account_id'):
+                return None, 'account_id is required'
+            parsed['account_id'] = int(str(item['account_id']))
+    except ValueError:
+        return None, 'Invalid account id format'
+    
+    return parsed, None
+
+def _perform_batch(user_id, parsed_items, atomic):
+    """
+    Εφαρμόζει όλα τα batch items σε ΕΝΑ DB transaction
+    - ένα query (με FOR UPDATE, αύξουσα σειρά id) για όλους τους λογαριασμούς
+    - κάθε αλλαγή υπολοίπου είναι conditional UPDATE (app/balances.py): ο
+      έλεγχος υπολοίπου και τα counters γίνονται στη βάση, όχι στη μνήμη
+      (στο SQLite το FOR UPDATE δεν κλειδώνει τίποτα)
+    - ένα bulk INSERT για όλα τα Transaction rows
+    """
+    account_ids = set()
+    account_numbers = set()
+    for parsed, _ in parsed_items:
+        if parsed is None:
+            continue
+        if parsed['type'] == 'transfer':
+            account_ids.add(parsed['from_account_id'])
+            account_numbers.add(parsed['to_account_number'])
+        else:
+            account_ids.add(parsed['account_id'])
+    
+    # Lookups (owner, account_number) και locks με σταθερή σειρά - τα
+    # balances που φορτώνονται εδώ δεν χρησιμοποιούνται
+    accounts = Account.query.filter(
+        or_(Account.id.in_(account_ids), Account.account_number.in_(account_numbers))
+    ).order_by(Account.id).with_for_update().all()
+    by_id = {account.id: account for account in accounts}
+    by_number = {account.account_number: account for account in accounts}
+    
+    def owned(account):
+        return account is not None and account.user_id == user_id and account.is_active
+    
+    now = datetime.now(timezone.utc)
+    rows = []
+    row_items = []  # index του item για κάθε row
+    results = []
+    
+    for index, (parsed, error) in enumerate(parsed_items):
+        result = {'index': index}
+        results.append(result)
+        
+        if error is None and parsed['type'] in ('deposit', 'withdrawal'):
+            account = by_id.get(parsed['account_id'])
+            amount = parsed['amount']
+            new_balance = None
+            if owned(account):
+                if parsed['type'] == 'deposit':
+                    new_balance = credit_account(account.id, amount, user_id=user_id, at=now)
+                else:
+                    new_balance = debit_account(account.id, amount, user_id=user_id, at=now)
+            if new_balance is None:
+                # Το UPDATE δεν άλλαξε τίποτα - μόνο το μήνυμα λάθους μένει
+                if not owned(account) or parsed['type'] == 'deposit':
+                    error = 'Account not found or inactive'
+                else:
+                    error = 'Insufficient funds'
+            else:
+                rows.append({
+                    'transaction_type': parsed['type'],
+                    'amount': amount,
+                    'description': parsed['description'] or parsed['type'].capitalize(),
+                    'account_id': account.id,
+                    'to_account_id': None,
+                    'balance_after': new_balance,
+                    'created_at': now
+                })
+                row_items.append(index)
+                result['account_number'] = account.account_number
+                result['balance_after'] = str(new_balance)
+        
+        elif error is None:
+            from_account = by_id.get(parsed['from_account_id'])
+            to_account = by_number.get(parsed['to_account_number'])
+            amount = parsed['amount']
+            description = parsed['description'] or 'Transfer'
+            if not owned(from_account):
+                error = 'Source account not found or inactive'
+            elif to_account is None or not to_account.is_active:
+                error = 'Destination account not found or inactive'
+            elif from_account.id == to_account.id:
+                error = 'Cannot transfer to the same account'
+            else:
+                from_new_balance = debit_account(from_account.id, amount, user_id=user_id, at=now)
+                if from_new_balance is None:
+                    error = 'Insufficient funds'
+                else:
+                    to_new_balance = credit_account(to_account.id, amount, at=now)
+                    if to_new_balance is None:
+                        # Ο παραλήπτης έγινε inactive μετά το lookup (στο SQLite
+                        # δεν υπάρχει row lock): το debit έχει ήδη γίνει, οπότε
+                        # ξανατρέχει όλο το batch και το item θα αποτύχει καθαρά
+                        db.session.rollback()
+                        return _perform_batch(user_id, parsed_items, atomic)
+                    rows.append({
+                        'transaction_type': 'transfer',
+                        'amount': amount,
+                        'description': f"Transfer to {to_account.account_number}: {description}",
+                        'account_id': from_account.id,
+                        'to_account_id': to_account.id,
+                        'balance_after': from_new_balance,
+                        'created_at': now
+                    })
+                    rows.append({
+                        'transaction_type': 'transfer',
+                        'amount': amount,
+                        'description': f"Transfer from {from_account.account_number}: {description}",
+                        'account_id': to_account.id,
+                        'to_account_id': from_account.id,
+                        'balance_after': to_new_balance,
+                        'created_at': now
+                    })
+                    row_items.extend([index, index])
+                    result['account_number'] = from_account.account_number
+                    result['balance_after'] = str(from_new_balance)
+        
+        if error is not None:
+            result['status'] = 'failed'
+            result['error'] = error
+        else:
+            result['status'] = 'success'
+            result['transaction_ids'] = []
+    
+    failed = sum(1 for result in results if result['status'] == 'failed')
+    
+    # All-or-nothing: ένα αποτυχημένο item ακυρώνει όλο το batch
+    if atomic and failed:
+        db.session.rollback()
+        for result in results:
+            if result['status'] == 'success':
+                result['status'] = 'rolled_back'
+                result.pop('transaction_ids', None)
+                result.pop('balance_after', None)
+        return jsonify({
+            'message': 'Batch rejected, no items were applied',
+            'mode': 'atomic',
+            'applied': 0,
+            'failed': failed,
+            'results': results
+        }), 400
+    
+    try:
+        if rows:
+            transaction_ids = db.session.scalars(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            for index, transaction_id in zip(row_items, transaction_ids):
+                results[index]['transaction_ids'].append(transaction_id)
+            record_batch_stats(rows)
+        
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    
+    applied = len(results) - failed
+    return jsonify({
+        'message': 'Batch processed',
+        'mode': 'atomic' if atomic else 'best_effort',
+        'applied': applied,
+        'failed': failed,
+        'results': results
+    }), 201 if applied else 400
+
+@transactions_bp.route('/batch', methods=['POST'])
+@query_budget(_batch_query_budget)
+@token_required
+def batch_transactions():
+    """
+    Bulk posting deposits/withdrawals/transfers σε ένα DB transaction
+    POST /api/transactions/batch
+    {
+        "mode": "atomic" | "best_effort",
+        "items": [
+            {"type": "deposit", "account_id": 1, "amount": "10.00"},
+            {"type": "transfer", "from_account_id": 1, "to_account_number": "SAV123456", "amount": "5.00"}
+        ]
+    }
+    """
+    try:
+        user = g.current_user
+        data = request.get_json()
         
-        # Έλεγχος επαρκούς υπολοίπου
-        if from_account.balance < amount:
+        mode = data.get('mode', 'atomic')
+        if mode not in ('atomic', 'best_effort'):
+            return jsonify({'error': 'mode must be atomic or best_effort'}), 400
+        
+        items = data.get('items')
+        max_items = current_app.config.get('BATCH_MAX_ITEMS', 1000)
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty list'}), 400
+        if len(items) > max_items:
+            return jsonify({'error': f'A batch can contain at most {max_items} items'}), 400
+        
+        parsed_items = [_parse_batch_item(item) for item in items]
+        
+        # Validation errors στο atomic mode απορρίπτουν το batch πριν το DB
+        if mode == 'atomic' and any(error for _, error in parsed_items):
             return jsonify({
-                'error': 'Insufficient funds',
-                'current_balance': str(from_account.balance),
-                'requested_amount': str(amount)
+                'message': 'Batch rejected, no items were applied',
+                'mode': 'atomic',
+                'results': [
+                    {'index': index, 'status': 'failed', 'error': error}
+                    for index, (_, error) in enumerate(parsed_items) if error
+                ]
             }), 400
         
-        # Atomic transaction με rollback support
-        try:
-            # Ενημέρωση balances
-            from_old_balance = from_account.balance
-            to_old_balance = to_account.balance
-            
-            from_account.balance -= amount
-            to_account.balance += amount
-            
-            from_new_balance = from_account.balance
-            to_new_balance = to_account.balance
-            
-            # Δημιουργία transaction records
-            # Outgoing transaction (για τον αποστολέα)
-            outgoing_transaction = Transaction(
-                transaction_type='transfer',
-                amount=amount,
-                description=f"Transfer to {to_account.account_number}: {description}",
-                account_id=from_account.id,
-                to_account_id=to_account.id,
-                balance_after=from_new_balance
-            )
-            
-            # Incoming transaction (για τον παραλήπτη)
-            incoming_transaction = Transaction(
-                transaction_type='transfer',
-                amount=amount,
-                description=f"Transfer from {from_account.account_number}: {description}",
-                account_id=to_account.id,
-                to_account_id=from_account.id,  # Reference στον sender
-                balance_after=to_new_balance
-            )
-            
-            db.session.add(outgoing_transaction)
-            db.session.add(incoming_transaction)
-            db.session.commit()
-            
-            return jsonify({
-                'message': 'Transfer successful',
-                'from_account': {
-                    'account_number': from_account.account_number,
-                    'previous_balance': str(from_old_balance),
-                    'new_balance': str(from_new_balance),
-                    'transaction_id': outgoing_transaction.id
-                },
-                'to_account': {
-                    'account_number': to_account.account_number,
-                    'previous_balance': str(to_old_balance),
-                    'new_balance': str(to_new_balance),
-                    'transaction_id': incoming_transaction.id
-                },
-                'transfer_amount': str(amount)
-            }), 201
-            
-        except Exception as e:
-            db.session.rollback()
-            raise e
+        return run_with_retry(_perform_batch, user.id, parsed_items, mode == 'atomic')
         
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Transfer error: {str(e)}")
+        current_app.logger.error(f"Batch transactions error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 # ==================== ADVANCED QUERIES ====================
 
+def build_search_query(user, args):
+    """
+    Χτίζει το filtered query της αναζήτησης από τα query parameters
+    Κοινό για το /search και το /export ώστε να υποστηρίζουν τα ίδια φίλτρα
+    Επιστρέφει (query, filters_applied)
+    """
+    # Query parameters
+    transaction_type = args.get('type')
+    account_number = args.get('account_number')
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    min_amount = args.get('min_amount', type=float)
+    max_amount = args.get('max_amount', type=float)
+    description_contains = args.get('description')
+    
+    # Base query με JOIN
+    query = db.session.query(Transaction).join(Account).filter(Account.user_id == user.id)
+    
+    # Conditional φίλτρα
+    if transaction_type:
+        query = query.filter(Transaction.transaction_type == transaction_type)
+    
+    if account_number:
+        query = query.filter(Account.account_number == account_number)
+    
+    if start_date:
+        start_datetime = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        query = query.filter(Transaction.created_at >= start_datetime)
+    
+    if end_date:
+        end_datetime = datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
+        query = query.filter(Transaction.created_at < end_datetime)
+    
+    if min_amount is not None:
+        query = query.filter(Transaction.amount >= min_amount)
+    
+    if max_amount is not None:
+        query = query.filter(Transaction.amount <= max_amount)
+    
+    if description_contains:
+        # Indexed path (pg_trgm / FTS5) όταν υπάρχει, αλλιώς ILIKE
+        query = query.filter(description_condition(description_contains))
+    
+    # Σύνθετα φίλτρα
+    high_value = args.get('high_value', type=bool)
+    if high_value:
+        query = query.filter(Transaction.amount > 1000)
+    
+    filters_applied = {
+        'transaction_type': transaction_type,
+        'account_number': account_number,
+        'start_date': start_date,
+        'end_date': end_date,
+        'min_amount': min_amount,
+        'max_amount': max_amount,
+        'description_contains': description_contains,
+        'high_value': high_value
+    }
+    
+    return query, filters_applied
+
 @transactions_bp.route('/search', methods=['GET'])
+# 4 + FTS5 candidates και (μία φορά ανά engine) ο έλεγχος του FTS5 table
+@query_budget(6)
 @token_required
 def search_transactions():
     """Σύνθετη αναζήτηση transactions"""
     try:
         user = g.current_user
         
-        # Query parameters
-        transaction_type = request.args.get('type')
-        account_number = request.args.get('account_number')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
-        min_amount = request.args.get('min_amount', type=float)
-        max_amount = request.args.get('max_amount', type=float)
-        description_contains = request.args.get('description')
-        
-        # Base query με JOIN
-        query = db.session.query(Transaction).join(Account).filter(Account.user_id == user.id)
-        
-        # Conditional φίλτρα
-        if transaction_type:
-            query = query.filter(Transaction.transaction_type == transaction_type)
-        
-        if account_number:
-            query = query.filter(Account.account_number == account_number)
-        
-        if start_date:
-            start_datetime = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-            query = query.filter(Transaction.created_at >= start_datetime)
-        
-        if end_date:
-            end_datetime = datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
-            query = query.filter(Transaction.created_at < end_datetime)
-        
-        if min_amount is not None:
-            query = query.filter(Transaction.amount >= min_amount)
-        
-        if max_amount is not None:
-            query = query.filter(Transaction.amount <= max_amount)
-        
-        if description_contains:
-            query = query.filter(Transaction.description.ilike(f'%{description_contains}%'))
+        query, filters_applied = build_search_query(user, request.args)
         
-        # Σύνθετα φίλτρα
-        high_value = request.args.get('high_value', type=bool)
-        if high_value:
-            query = query.filter(Transaction.amount > 1000)
-        
-        # Ordering
         sort_by = request.args.get('sort', 'created_at')
         sort_order = request.args.get('order', 'desc')
         
+        # Cursor mode - υποστηρίζεται μόνο για ordering κατά created_at
+        if is_cursor_mode(request.args):
+            if sort_by != 'created_at':
+                return jsonify({'error': 'Cursor pagination is only supported with sort=created_at'}), 400
+            
+            per_page = request.args.get('per_page', 20, type=int)
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            try:
+                items, pagination = keyset_paginate(
+                    query,
+                    per_page=per_page,
+                    cursor=request.args.get('cursor'),
+                    order=sort_order,
+                    include_total=include_total
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            return jsonify({
+                'transactions': serialize_transactions(items),
+                'pagination': pagination,
+                'filters_applied': filters_applied
+            }), 200
+        
+        # Ordering
         if sort_by == 'amount':
             if sort_order == 'asc':
                 query = query.order_by(asc(Transaction.amount))
@@ -525,7 +947,7 @@ def search_transactions():
         transactions_paginated = query.paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
-            'transactions': [tnx.to_dict() for tnx in transactions_paginated.items],
+            'transactions': serialize_transactions(transactions_paginated.items),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -534,38 +956,114 @@ def search_transactions():
                 'has_next': transactions_paginated.has_next,
                 'has_prev': transactions_paginated.has_prev
             },
-            'filters_applied': {
-                'transaction_type': transaction_type,
-                'account_number': account_number,
-                'start_date': start_date,
-                'end_date': end_date,
-                'min_amount': min_amount,
-                'max_amount': max_amount,
-                'description_contains': description_contains,
-                'high_value': high_value
-            }
+            'filters_applied': filters_applied
         }), 200
         
     except Exception as e:
         current_app.logger.error(f"Search transactions error: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = [
+    'id', 'transaction_type', 'amount', 'description', 'balance_after',
+    'created_at', 'account_number', 'to_account_number'
+]
+
+def _iter_export_batches(query):
+    """
+    Διατρέχει το query με yield_per ώστε η μνήμη να μένει σταθερή
+    (server-side cursor στο PostgreSQL) και επιστρέφει serialized batches
+    """
+    batch = []
+    for tnx in query.yield_per(EXPORT_BATCH_SIZE):
+        batch.append(tnx)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield serialize_transactions(batch)
+            batch = []
+    if batch:
+        yield serialize_transactions(batch)
+
+def _generate_ndjson(query):
+    for rows in _iter_export_batches(query):
+        yield ''.join(json.dumps(row) + '\n' for row in rows)
+
+def _generate_csv(query):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for rows in _iter_export_batches(query):
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+@transactions_bp.route('/export', methods=['GET'])
+# 2 + FTS5 candidates και (μία φορά ανά engine) ο έλεγχος του FTS5 table
+@query_budget(4)
+@token_required
+def export_transactions():
+    """
+    Streaming export του ιστορικού συναλλαγών σε NDJSON ή CSV
+    Υποστηρίζει τα ίδια φίλτρα με το /search, χωρίς pagination
+    GET /api/transactions/export?format=csv&start_date=2024-01-01
+    """
+    try:
+        user = g.current_user
+        
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in ('ndjson', 'csv'):
+            return jsonify({'error': 'format must be ndjson or csv'}), 400
+        
+        try:
+            query, _ = build_search_query(user, request.args)
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        if request.args.get('order', 'desc') == 'asc':
+            query = query.order_by(asc(Transaction.created_at), asc(Transaction.id))
+        else:
+            query = query.order_by(desc(Transaction.created_at), desc(Transaction.id))
+        
+        if export_format == 'csv':
+            generator = _generate_csv(query)
+            mimetype = 'text/csv'
+        else:
+            generator = _generate_ndjson(query)
+            mimetype = 'application/x-ndjson'
+        
+        # stream_with_context κρατάει το request/app context (και το db session)
+        # ζωντανό όσο ο generator στέλνει δεδομένα
+        return Response(
+            stream_with_context(generator),
+            mimetype=mimetype,
+            headers={
+                'Content-Disposition': f'attachment; filename=transactions.{export_format}'
+            }
+        )
+        
+    except Exception as e:
+        current_app.logger.error(f"Export transactions error: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @transactions_bp.route('/recent', methods=['GET'])
+@query_budget(3)
 @token_required
 def get_recent_transactions():
     """Πρόσφατες transactions (τελευταίες 10)"""
     try:
         user = g.current_user
         
-        # Eager loading για να αποφύγουμε N+1 queries
-        recent_transactions = db.session.query(Transaction).join(Account).options(
-            joinedload(Transaction.account)
-        ).filter(Account.user_id == user.id).order_by(
+        # Τα account numbers τα φέρνει το serialize_transactions με ένα IN query
+        recent_transactions = db.session.query(Transaction).join(Account).filter(
+            Account.user_id == user.id
+        ).order_by(
             desc(Transaction.created_at)
         ).limit(10).all()
         
         return jsonify({
-            'recent_transactions': [tnx.to_dict() for tnx in recent_transactions],
+            'recent_transactions': serialize_transactions(recent_transactions),
             'count': len(recent_transactions)
         }), 200
         
@@ -615,7 +1113,7 @@ def get_recent_transactions():
 - Πάντα χρησιμοποιείς try/except με rollback για transactions
 - Για transfers, δημιουργείς 2 transaction records
 - Χρησιμοποιείς Decimal για amounts, όχι float
-- Eager loading με joinedload() για related data
+- Eager loading με joinedload() ή bulk serialization (app/serializers.py) για related data
 - Pagination για μεγάλες λίστες
 - Validation στα input data
 """
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Κοινά helpers για τα benchmarks της Bank API
+
+Τα benchmarks τρέχουν την εφαρμογή in-process μέσω του Flask test client
+πάνω σε πραγματική βάση: SQLite αρχείο (default) ή ό,τι δίνει το
+DATABASE_URL (π.χ. local PostgreSQL).
+"""
+import os
+import tempfile
+import time
+import uuid
+
+def create_bench_app(database_url=None):
+    """
+    Δημιουργεί app με production config πάνω στη βάση του benchmark
+    Χωρίς database_url χρησιμοποιείται ένα νέο SQLite αρχείο στο tempdir
+    """
+    if database_url is None:
+        database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        path = os.path.join(tempfile.mkdtemp(prefix='bank-bench-'), 'bench.db')
+        database_url = f'sqlite:///{path}'
+    os.environ['DATABASE_URL'] = database_url
+
+    from app import create_app, db
+    from app.config import ProductionConfig
+    ProductionConfig.SQLALCHEMY_DATABASE_URI = database_url
+
+    app = create_app('production')
+    with app.app_context():
+        # Μόνο στο primary - ένα read replica (DATABASE_REPLICA_URL) παίρνει
+        # το schema από το primary (flask replica sync / streaming replication)
+        db.create_all(bind_key=None)
+    return app
+
+def register_user(client, password='BenchPass1'):
+    """Δημιουργεί νέο user και επιστρέφει το token του"""
+    email = f'bench-{uuid.uuid4().hex[:12]}@example.com'
+    response = client.post('/api/auth/register', json={
+        'email': email,
+        'password': password,
+        'first_name': 'Bench',
+        'last_name': 'User'
+    })
+    return response.get_json()['token']
+
+def create_account(client, token, account_type='savings', balance='0.00'):
+    response = client.post('/api/accounts/create', json={
+        'account_type': account_type,
+        'balance': balance
+    }, headers=auth_headers(token))
+    return response.get_json()['account']
+
+def auth_headers(token):
+    return {'Authorization': f'Bearer {token}'}
+
+class Timer:
+    """Απλό context manager για wall-clock μέτρηση"""
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,78 @@
+"""
+Concurrency benchmark για τα atomic balance updates
+
+Ρίχνει χιλιάδες παράλληλα withdrawals στον ΙΔΙΟ λογαριασμό και ελέγχει
+ότι δεν χάθηκε κανένα update:
+    τελικό balance == αρχικό balance - (επιτυχημένα withdrawals * amount)
+    αριθμός withdrawal transactions == επιτυχημένα withdrawals
+
+Χρήση:
+    python -m benchmarks.concurrent_withdrawals --requests 2000 --workers 16
+    DATABASE_URL=postgresql://localhost/bank_bench python -m benchmarks.concurrent_withdrawals
+"""
+import argparse
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from benchmarks.common import create_bench_app, register_user, create_account, auth_headers, Timer
+
+def run(requests_count, workers, amount, initial_balance, database_url=None):
+    app = create_bench_app(database_url)
+    client = app.test_client()
+    token = register_user(client)
+    account = create_account(client, token, balance=str(initial_balance))
+    headers = auth_headers(token)
+
+    def withdraw(_):
+        # Ένας client ανά κλήση - ο test client δεν είναι thread-safe
+        response = app.test_client().post('/api/transactions/withdraw', json={
+            'account_id': account['id'],
+            'amount': str(amount)
+        }, headers=headers)
+        return response.status_code
+
+    with Timer() as timer:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            statuses = Counter(pool.map(withdraw, range(requests_count)))
+
+    from app import db
+    from app.models import Account, Transaction
+    with app.app_context():
+        final_balance = db.session.get(Account, account['id']).balance
+        withdrawals = Transaction.query.filter_by(
+            account_id=account['id'], transaction_type='withdrawal'
+        ).count()
+
+    succeeded = statuses.get(201, 0)
+    expected_balance = Decimal(str(initial_balance)) - succeeded * Decimal(str(amount))
+
+    return {
+        'requests': requests_count,
+        'workers': workers,
+        'elapsed_seconds': round(timer.elapsed, 3),
+        'throughput_rps': round(requests_count / timer.elapsed, 1),
+        'status_codes': dict(statuses),
+        'succeeded': succeeded,
+        'final_balance': str(final_balance),
+        'expected_balance': str(expected_balance),
+        'withdrawal_rows': withdrawals,
+        'lost_updates': final_balance != expected_balance or withdrawals != succeeded
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--amount', type=Decimal, default=Decimal('1.00'))
+    parser.add_argument('--initial-balance', type=Decimal, default=Decimal('1500.00'))
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    report = run(args.requests, args.workers, args.amount, args.initial_balance, args.database_url)
+    print(json.dumps(report, indent=2))
+    if report['lost_updates']:
+        raise SystemExit('Lost updates detected')
+
+if __name__ == '__main__':
+    main()
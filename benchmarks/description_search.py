@@ -0,0 +1,134 @@
+"""
+Description search benchmark: indexed path vs ILIKE scan
+
+1. Γεμίζει τη βάση με `flask seed` (default 10M transactions)
+2. Προσθέτει μερικές σπάνιες συναλλαγές ("Invoice INV-...") στον πιο
+   hot user, ώστε να υπάρχουν και επιλεκτικοί όροι (το seed έχει λίγες,
+   πολύ συχνές περιγραφές)
+3. Για κάθε user (hot / median) και όρο τρέχει το GET /api/transactions/search
+   με SEARCH_INDEX_ENABLED on και off και μετράει p50/p95 latency
+
+Path ανά βάση: pg_trgm GIN στο PostgreSQL, FTS5 trigram στο SQLite
+(βλ. app/search.py). Με --reuse η ίδια βάση ξαναχρησιμοποιείται χωρίς seed.
+
+Χρήση:
+    python -m benchmarks.description_search --database-url sqlite:////tmp/search.db
+    DATABASE_URL=postgresql://localhost/bank_bench python -m benchmarks.description_search --workers 8
+    python -m benchmarks.description_search --transactions 1000000 --users 10000 --repeat 50
+"""
+import argparse
+import json
+from benchmarks.common import create_bench_app, auth_headers, Timer
+from benchmarks.load_test import percentile
+
+NEEDLES = 20
+DEFAULT_TERMS = 'Salary,ATM withdrawal,INV-0000,INV-000007,zzqqxx,ca'
+
+def prepare(app, users, transactions, workers, reuse):
+    """Seed (αν χρειάζεται) + needles στον hot user. Επιστρέφει {label: token}"""
+    from app import db
+    from app.models import User, Account, Transaction
+    from app.seed import seed_command, SEED_PASSWORD
+
+    with app.app_context():
+        seeded = db.session.query(db.func.count(Transaction.id)).scalar()
+    if not (reuse and seeded):
+        result = app.test_cli_runner().invoke(seed_command, [
+            '--users', str(users), '--transactions', str(transactions), '--workers', str(workers)
+        ])
+        if result.exit_code != 0:
+            raise SystemExit(result.output)
+
+    with app.app_context():
+        per_user = db.session.query(
+            Account.user_id, db.func.count(Transaction.id).label('n')
+        ).join(Transaction, Transaction.account_id == Account.id).group_by(Account.user_id).order_by('n').all()
+        picks = {'hot': per_user[-1], 'median': per_user[len(per_user) // 2]}
+        emails = {label: db.session.get(User, user_id).email for label, (user_id, _) in picks.items()}
+        hot_account = Account.query.filter_by(user_id=picks['hot'][0], is_active=True).first()
+        ledger_sizes = {label: count for label, (_, count) in picks.items()}
+
+    client = app.test_client()
+    tokens = {}
+    for label, email in emails.items():
+        response = client.post('/api/auth/login', json={'email': email, 'password': SEED_PASSWORD})
+        tokens[label] = response.get_json()['token']
+
+    headers = auth_headers(tokens['hot'])
+    for index in range(NEEDLES):
+        client.post('/api/transactions/deposit', json={
+            'account_id': hot_account.id,
+            'amount': '1.00',
+            'description': f'Invoice INV-{index:06d}'
+        }, headers=headers)
+    return tokens, ledger_sizes
+
+def measure(app, token, term, repeat, indexed):
+    from app.search import search_path
+
+    app.config['SEARCH_INDEX_ENABLED'] = indexed
+    with app.test_request_context():
+        path = search_path(term)
+    client = app.test_client()
+    headers = auth_headers(token)
+    timings = []
+    total = None
+    for _ in range(repeat):
+        with Timer() as timer:
+            response = client.get('/api/transactions/search', query_string={
+                'description': term, 'per_page': 20
+            }, headers=headers)
+        timings.append(timer.elapsed)
+        total = response.get_json()['pagination']['total']
+    timings.sort()
+    return {
+        'path': path,
+        'matches': total,
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3)
+    }
+
+def run(users, transactions, terms, repeat, workers, reuse=False, database_url=None):
+    app = create_bench_app(database_url)
+    tokens, ledger_sizes = prepare(app, users, transactions, workers, reuse)
+
+    results = []
+    for label, token in tokens.items():
+        for term in terms:
+            # Ένα warm-up request ανά path, ώστε να μη μετράει το cold cache
+            measure(app, token, term, 1, True)
+            indexed = measure(app, token, term, repeat, True)
+            measure(app, token, term, 1, False)
+            scan = measure(app, token, term, repeat, False)
+            results.append({
+                'user': label,
+                'ledger_rows': ledger_sizes[label],
+                'term': term,
+                'indexed': indexed,
+                'scan': scan,
+                'speedup_p50': round(scan['p50_ms'] / indexed['p50_ms'], 2) if indexed['p50_ms'] else None
+            })
+    app.config['SEARCH_INDEX_ENABLED'] = True
+
+    with app.app_context():
+        from app import db
+        dialect = db.engine.dialect.name
+    return {'dialect': dialect, 'transactions': transactions, 'repeat': repeat, 'results': results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=10000000)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--terms', default=DEFAULT_TERMS, help='Comma-separated όροι αναζήτησης')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=4, help='Seed workers')
+    parser.add_argument('--reuse', action='store_true', help='Χωρίς seed αν η βάση έχει ήδη δεδομένα')
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    terms = [term for term in args.terms.split(',') if term]
+    report = run(args.users, args.transactions, terms, args.repeat, args.workers, args.reuse, args.database_url)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+EXPLAIN check για όλα τα queries των transactions/accounts endpoints
+
+1. Γεμίζει τη βάση με synthetic users/accounts/transactions
+2. Τρέχει κάθε endpoint των app/transactions.py και app/accounts.py
+   (και του savings calculator) και καταγράφει κάθε SQL statement
+3. Τρέχει EXPLAIN σε κάθε statement και αποτυγχάνει αν κάποιο κάνει
+   sequential scan στον πίνακα transactions
+
+Στο PostgreSQL γίνεται SET enable_seqscan = off: σε μικρό seeded dataset ο
+planner διαλέγει seq scan ακόμα κι όταν υπάρχει index, ενώ με το setting
+αυτό seq scan εμφανίζεται ΜΟΝΟ όταν δεν υπάρχει κατάλληλο index.
+
+Χρήση:
+    python -m benchmarks.explain_queries --users 50 --transactions-per-account 200
+    DATABASE_URL=postgresql://localhost/bank_bench python -m benchmarks.explain_queries
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import event, insert
+from werkzeug.security import generate_password_hash
+from benchmarks.common import create_bench_app, auth_headers
+
+def seed(app, users, transactions_per_account, seed_value=7):
+    """Bulk seed - επιστρέφει (email, password) ενός user και τα account ids του"""
+    from app import db
+    from app.models import User, Account, Transaction
+    from app.rollups import backfill_transaction_stats
+
+    rng = random.Random(seed_value)
+    password = 'ExplainPass1'
+    password_hash = generate_password_hash(password)
+    now = datetime.now(timezone.utc)
+
+    with app.app_context():
+        db.session.execute(insert(User), [
+            {
+                'email': f'explain-{i}@example.com',
+                'password_hash': password_hash,
+                'first_name': 'Explain',
+                'last_name': str(i),
+                'created_at': now
+            }
+            for i in range(users)
+        ])
+        user_ids = [u.id for u in User.query.filter(User.email.like('explain-%')).order_by(User.id)]
+
+        db.session.execute(insert(Account), [
+            {
+                'account_number': f'{account_type[:3].upper()}{user_id:07d}',
+                'account_type': account_type,
+                'balance': Decimal('100000.00'),
+                'user_id': user_id,
+                'is_active': True,
+                'created_at': now
+            }
+            for user_id in user_ids for account_type in ('savings', 'checking')
+        ])
+        account_ids = [a.id for a in Account.query.filter(Account.user_id.in_(user_ids))]
+
+        rows = []
+        for account_id in account_ids:
+            balance = Decimal('0.00')
+            for _ in range(transactions_per_account):
+                amount = Decimal(rng.randint(100, 50000)).scaleb(-2)
+                balance += amount
+                rows.append({
+                    'transaction_type': 'deposit',
+                    'amount': amount,
+                    'description': 'Seeded deposit',
+                    'account_id': account_id,
+                    'balance_after': balance,
+                    'created_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+                })
+            if len(rows) >= 10000:
+                db.session.execute(insert(Transaction), rows)
+                rows = []
+        if rows:
+            db.session.execute(insert(Transaction), rows)
+        db.session.commit()
+        backfill_transaction_stats()
+
+        if db.engine.dialect.name == 'postgresql':
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql('ANALYZE')
+
+        user_accounts = Account.query.filter_by(user_id=user_ids[0]).order_by(Account.id).all()
+        other_account = Account.query.filter_by(user_id=user_ids[1]).first()
+        return (
+            'explain-0@example.com', password,
+            [a.id for a in user_accounts], other_account.account_number
+        )
+
+def exercise_endpoints(client, token, account_ids, other_account_number):
+    """Καλεί όλα τα endpoints των transactions/accounts blueprints"""
+    headers = auth_headers(token)
+    account_id = account_ids[0]
+    gets = [
+        '/api/transactions/?per_page=20',
+        '/api/transactions/?page=5&per_page=20',
+        '/api/transactions/?pagination=cursor&per_page=20&include_total=true',
+        f'/api/transactions/account/{account_id}',
+        f'/api/transactions/account/{account_id}?type=deposit&start_date=2024-01-01&min_amount=10',
+        '/api/transactions/stats',
+        '/api/transactions/search?type=deposit&min_amount=10&per_page=50',
+        '/api/transactions/search?start_date=2024-01-01&end_date=2030-01-01&sort=amount',
+        '/api/transactions/search?description=seeded&pagination=cursor',
+        '/api/transactions/export?start_date=2024-01-01',
+        '/api/transactions/recent',
+        '/api/accounts/',
+        f'/api/accounts/{account_id}',
+        '/api/accounts/search?type=savings&min_balance=10',
+    ]
+    for url in gets:
+        client.get(url, headers=headers).get_data()
+
+    client.get('/api/accounts/high_value', json={'threshold': 10}, headers=headers)
+    client.post('/api/transactions/deposit', json={'account_id': account_id, 'amount': '10.00'}, headers=headers)
+    client.post('/api/transactions/withdraw', json={'account_id': account_id, 'amount': '5.00'}, headers=headers)
+    client.post('/api/transactions/transfer', json={
+        'from_account_id': account_id, 'to_account_number': other_account_number, 'amount': '1.00'
+    }, headers=headers)
+    client.post('/api/transactions/batch', json={'items': [
+        {'type': 'deposit', 'account_id': account_id, 'amount': '2.00'},
+        {'type': 'transfer', 'from_account_id': account_id, 'to_account_number': other_account_number, 'amount': '1.00'}
+    ]}, headers=headers)
+    client.post('/api/accounts/deactivate_account', json={'account_id': account_ids[1]}, headers=headers)
+    client.post('/api/accounts/activate_account', json={'account_id': account_ids[1]}, headers=headers)
+    client.post('/api/accounts/create', json={'account_type': 'business'}, headers=headers)
+    client.post('/api/savings-calc/calculate', json={
+        'account_id': account_id, 'rules': ['roundup', 'percentage', 'smart'], 'period_days': 90
+    }, headers=headers)
+
+def _walk_pg_plan(node, found):
+    if node.get('Node Type') == 'Seq Scan':
+        found.append(node.get('Relation Name'))
+    for child in node.get('Plans', []):
+        _walk_pg_plan(child, found)
+
+def explain(engine, statement, parameters):
+    """Επιστρέφει (plan_text, tables με sequential scan)"""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if engine.dialect.name == 'postgresql':
+            cursor.execute('SET enable_seqscan = off')
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + statement, parameters)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            seq_scans = []
+            _walk_pg_plan(plan[0]['Plan'], seq_scans)
+            return json.dumps(plan[0]['Plan']), seq_scans
+
+        cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+        details = [row[-1] for row in cursor.fetchall()]
+        seq_scans = []
+        for detail in details:
+            words = detail.split()
+            # "SCAN transactions" χωρίς index = full table scan
+            if words[0] == 'SCAN' and 'INDEX' not in detail:
+                seq_scans.append(words[1])
+        return '; '.join(details), seq_scans
+    finally:
+        raw.rollback()
+        raw.close()
+
+def run(users, transactions_per_account, database_url=None, verbose=False):
+    from app import db
+
+    app = create_bench_app(database_url)
+    email, password, account_ids, other_account_number = seed(app, users, transactions_per_account)
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'email': email, 'password': password}).get_json()['token']
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split()[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH'):
+            captured.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        exercise_endpoints(client, token, account_ids, other_account_number)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+
+    # Ίδιο statement με άλλα parameters έχει (πρακτικά) το ίδιο plan
+    unique = {}
+    for statement, parameters in captured:
+        unique.setdefault(statement, parameters)
+
+    failures = []
+    for statement, parameters in unique.items():
+        plan, seq_scans = explain(engine, statement, parameters)
+        if verbose:
+            print(f'--- {statement}\n    {plan}\n')
+        if 'transactions' in seq_scans:
+            failures.append({'statement': statement, 'plan': plan})
+
+    return {
+        'dialect': engine.dialect.name,
+        'statements_captured': len(captured),
+        'unique_statements': len(unique),
+        'transactions_seq_scans': len(failures),
+        'failures': failures
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--transactions-per-account', type=int, default=200)
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    report = run(args.users, args.transactions_per_account, args.database_url, args.verbose)
+    print(json.dumps(report, indent=2))
+    if report['failures']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
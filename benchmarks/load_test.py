@@ -0,0 +1,341 @@
+"""
+Load test της Bank API με ρεαλιστικό traffic mix
+
+1. Γεμίζει τη βάση (users x accounts x transactions) με bulk inserts
+2. Κάνει login ένα σύνολο ενεργών users
+3. Παράλληλοι workers ξαναπαίζουν weighted mix από requests:
+   login, accounts list, deposit, transfer, search, stats, savings calc
+4. Γράφει JSON report με p50/p95/p99 latency, throughput και queries ανά
+   request για κάθε endpoint - με sort_keys ώστε να γίνεται diff ανάμεσα
+   σε commits
+
+Χρήση:
+    python -m benchmarks.load_test --users 200 --requests 5000 --workers 8 --output before.json
+    DATABASE_URL=postgresql://localhost/bank_bench python -m benchmarks.load_test --output pg.json
+    python -m benchmarks.load_test --mix "accounts=50,search=30,deposit=20"
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from benchmarks.common import create_bench_app, auth_headers, Timer
+
+PASSWORD = 'LoadTestPass1'
+
+DEFAULT_MIX = {
+    'login': 3,
+    'accounts': 20,
+    'transactions': 10,
+    'deposit': 15,
+    'transfer': 10,
+    'search': 17,
+    'stats': 15,
+    'savings': 10
+}
+
+SEARCH_QUERIES = (
+    'type=deposit&min_amount=10&per_page=20',
+    'start_date={since}&sort=amount&per_page=50',
+    'description=payroll&pagination=cursor',
+    'type=withdrawal&max_amount=200'
+)
+
+DESCRIPTIONS = ('Payroll', 'Groceries', 'Rent', 'Coffee', 'Utilities', 'Transfer in', 'Card payment')
+
+def seed(app, users, transactions_per_account, seed_value=42):
+    """
+    Bulk seed για το load test
+    Επιστρέφει λίστα από dicts (email, accounts: [(id, account_number)])
+    """
+    from app import db
+    from app.models import User, Account, Transaction
+    from app.rollups import backfill_transaction_stats
+
+    rng = random.Random(seed_value)
+    password_hash = generate_password_hash(PASSWORD)
+    now = datetime.now(timezone.utc)
+
+    with app.app_context():
+        db.session.execute(insert(User), [
+            {
+                'email': f'load-{i}@example.com',
+                'password_hash': password_hash,
+                'first_name': 'Load',
+                'last_name': str(i),
+                'created_at': now
+            }
+            for i in range(users)
+        ])
+        user_rows = User.query.filter(User.email.like('load-%')).order_by(User.id).all()
+        emails = {u.id: u.email for u in user_rows}
+
+        db.session.execute(insert(Account), [
+            {
+                'account_number': f'{account_type[:3].upper()}L{user_id:06d}',
+                'account_type': account_type,
+                'balance': Decimal('1000000.00'),
+                'user_id': user_id,
+                'is_active': True,
+                'created_at': now
+            }
+            for user_id in emails for account_type in ('savings', 'checking')
+        ])
+        accounts = Account.query.filter(Account.user_id.in_(list(emails))).order_by(Account.id).all()
+
+        rows = []
+        for account in accounts:
+            balance = Decimal('0.00')
+            for _ in range(transactions_per_account):
+                amount = Decimal(rng.randint(100, 50000)).scaleb(-2)
+                balance += amount
+                rows.append({
+                    'transaction_type': 'deposit',
+                    'amount': amount,
+                    'description': rng.choice(DESCRIPTIONS),
+                    'account_id': account.id,
+                    'balance_after': balance,
+                    'created_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+                })
+            if len(rows) >= 10000:
+                db.session.execute(insert(Transaction), rows)
+                rows = []
+        if rows:
+            db.session.execute(insert(Transaction), rows)
+        db.session.commit()
+        backfill_transaction_stats()
+
+        if db.engine.dialect.name == 'postgresql':
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql('ANALYZE')
+
+        by_user = defaultdict(list)
+        for account in accounts:
+            by_user[account.user_id].append((account.id, account.account_number))
+        return [{'email': emails[user_id], 'accounts': by_user[user_id]} for user_id in emails]
+
+def parse_mix(value):
+    """'accounts=50,search=30' -> {'accounts': 50, 'search': 30}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'Unknown operation: {name}')
+        mix[name] = int(weight)
+    return mix
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile σε ήδη ταξινομημένη λίστα"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Recorder:
+    """Thread-safe συλλογή latency/queries/status ανά operation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, operation, latency, queries, status):
+        with self._lock:
+            self.latencies[operation].append(latency)
+            self.queries[operation].append(queries)
+            self.statuses[operation][status] += 1
+
+    def report(self, elapsed):
+        operations = {}
+        for operation, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            queries = self.queries[operation]
+            statuses = self.statuses[operation]
+            errors = sum(count for status, count in statuses.items() if status >= 500)
+            operations[operation] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'status_codes': {str(status): count for status, count in statuses.items()},
+                'throughput_rps': round(len(latencies) / elapsed, 2),
+                'latency_ms': {
+                    'mean': round(sum(latencies) / len(latencies) * 1000, 3),
+                    'p50': round(percentile(latencies, 50) * 1000, 3),
+                    'p95': round(percentile(latencies, 95) * 1000, 3),
+                    'p99': round(percentile(latencies, 99) * 1000, 3),
+                    'max': round(latencies[-1] * 1000, 3)
+                },
+                'queries_per_request': {
+                    'mean': round(sum(queries) / len(queries), 2),
+                    'max': max(queries)
+                }
+            }
+        return operations
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_request(operation, user, tokens, users, rng):
+    """Επιστρέφει (method, url, kwargs) για μία operation του mix"""
+    headers = auth_headers(tokens[user['email']])
+    account_id, _ = rng.choice(user['accounts'])
+
+    if operation == 'login':
+        return 'post', '/api/auth/login', {'json': {'email': user['email'], 'password': PASSWORD}}
+    if operation == 'accounts':
+        return 'get', '/api/accounts/', {'headers': headers}
+    if operation == 'transactions':
+        return 'get', f'/api/transactions/account/{account_id}?per_page=20', {'headers': headers}
+    if operation == 'deposit':
+        amount = str(Decimal(rng.randint(100, 20000)).scaleb(-2))
+        return 'post', '/api/transactions/deposit', {
+            'headers': headers, 'json': {'account_id': account_id, 'amount': amount, 'description': 'Load deposit'}
+        }
+    if operation == 'transfer':
+        other = rng.choice(users)
+        while other is user and len(users) > 1:
+            other = rng.choice(users)
+        _, to_account_number = rng.choice(other['accounts'])
+        amount = str(Decimal(rng.randint(100, 5000)).scaleb(-2))
+        return 'post', '/api/transactions/transfer', {
+            'headers': headers,
+            'json': {'from_account_id': account_id, 'to_account_number': to_account_number, 'amount': amount}
+        }
+    if operation == 'search':
+        since = (datetime.now(timezone.utc) - timedelta(days=90)).date().isoformat()
+        query = rng.choice(SEARCH_QUERIES).format(since=since)
+        return 'get', f'/api/transactions/search?{query}', {'headers': headers}
+    if operation == 'stats':
+        return 'get', '/api/transactions/stats', {'headers': headers}
+    if operation == 'savings':
+        return 'post', '/api/savings-calc/calculate', {
+            'headers': headers,
+            'json': {'account_id': account_id, 'rules': ['roundup', 'percentage', 'smart'], 'period_days': 90}
+        }
+    raise ValueError(f'Unknown operation: {operation}')
+
+def run(users, transactions_per_account, requests_count, workers, mix=None,
+        active_users=50, warmup=100, seed_value=42, database_url=None):
+    from app import db
+    from app.query_budget import count_queries, install_query_counter
+
+    mix = mix or DEFAULT_MIX
+    app = create_bench_app(database_url)
+    with Timer() as seed_timer:
+        seeded = seed(app, users, transactions_per_account, seed_value)
+
+    with app.app_context():
+        engine = db.engine
+    install_query_counter(engine)
+
+    client = app.test_client()
+    active = seeded[:max(1, min(active_users, len(seeded)))]
+    tokens = {}
+    for user in active:
+        response = client.post('/api/auth/login', json={'email': user['email'], 'password': PASSWORD})
+        tokens[user['email']] = response.get_json()['token']
+
+    operations = list(mix)
+    weights = [mix[name] for name in operations]
+    recorder = Recorder()
+
+    def worker(worker_id, count, record):
+        # Ένας client και ένα RNG ανά worker - ντετερμινιστικό mix ανά seed
+        rng = random.Random(seed_value * 1000 + worker_id)
+        worker_client = app.test_client()
+        for _ in range(count):
+            operation = rng.choices(operations, weights)[0]
+            user = rng.choice(active)
+            method, url, kwargs = build_request(operation, user, tokens, active, rng)
+            with count_queries() as counter:
+                with Timer() as timer:
+                    response = getattr(worker_client, method)(url, **kwargs)
+                    response.get_data()
+            if record:
+                recorder.record(operation, timer.elapsed, counter.count, response.status_code)
+
+    def run_phase(total, record):
+        per_worker = [total // workers + (1 if i < total % workers else 0) for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(worker, i, n, record) for i, n in enumerate(per_worker)]:
+                future.result()
+
+    if warmup:
+        run_phase(warmup, record=False)
+    with Timer() as timer:
+        run_phase(requests_count, record=True)
+
+    operations_report = recorder.report(timer.elapsed)
+    all_latencies = sorted(l for latencies in recorder.latencies.values() for l in latencies)
+    all_queries = [q for queries in recorder.queries.values() for q in queries]
+    return {
+        'meta': {
+            'git_revision': git_revision(),
+            'dialect': engine.dialect.name,
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'users': users,
+            'active_users': len(active),
+            'transactions_per_account': transactions_per_account,
+            'workers': workers,
+            'warmup_requests': warmup,
+            'seed': seed_value,
+            'mix': mix,
+            'seed_seconds': round(seed_timer.elapsed, 3)
+        },
+        'summary': {
+            'requests': len(all_latencies),
+            'errors': sum(op['errors'] for op in operations_report.values()),
+            'elapsed_seconds': round(timer.elapsed, 3),
+            'throughput_rps': round(len(all_latencies) / timer.elapsed, 2),
+            'latency_ms': {
+                'p50': round(percentile(all_latencies, 50) * 1000, 3),
+                'p95': round(percentile(all_latencies, 95) * 1000, 3),
+                'p99': round(percentile(all_latencies, 99) * 1000, 3)
+            },
+            'queries_per_request': round(sum(all_queries) / len(all_queries), 2) if all_queries else 0.0
+        },
+        'operations': operations_report
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--transactions-per-account', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--active-users', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--mix', type=parse_mix, default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--output', default=None, help='JSON report (default: stdout)')
+    args = parser.parse_args()
+
+    report = run(
+        args.users, args.transactions_per_account, args.requests, args.workers,
+        mix=args.mix, active_users=args.active_users, warmup=args.warmup,
+        seed_value=args.seed, database_url=args.database_url
+    )
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+if __name__ == '__main__':
+    main()
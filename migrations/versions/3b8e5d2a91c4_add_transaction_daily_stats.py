@@ -0,0 +1,46 @@
+"""Add transaction_daily_stats rollup table
+
+Revision ID: 3b8e5d2a91c4
+Revises: 0c7044495ed6
+Create Date: 2026-10-16 10:12:04.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e5d2a91c4'
+down_revision = '0c7044495ed6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('transaction_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('transaction_type', sa.String(length=20), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('min_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('max_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'day', 'transaction_type', name='uq_transaction_daily_stats_account_day_type')
+    )
+
+    # Γέμισμα των rollups από το υπάρχον ledger
+    op.execute("""
+        INSERT INTO transaction_daily_stats
+            (account_id, day, transaction_type, transaction_count, total_amount, min_amount, max_amount)
+        SELECT account_id, date(created_at), transaction_type,
+               count(id), sum(amount), min(amount), max(amount)
+        FROM transactions
+        GROUP BY account_id, date(created_at), transaction_type
+    """)
+
+
+def downgrade():
+    op.drop_table('transaction_daily_stats')
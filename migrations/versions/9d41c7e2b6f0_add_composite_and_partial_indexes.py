@@ -0,0 +1,45 @@
+"""Add composite and partial indexes for hot query shapes
+
+Revision ID: 9d41c7e2b6f0
+Revises: 3b8e5d2a91c4
+Create Date: 2026-10-16 14:36:52.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d41c7e2b6f0'
+down_revision = '3b8e5d2a91c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Transactions: WHERE account_id = ? ORDER BY created_at DESC, id DESC
+    op.create_index(
+        'ix_transactions_account_id_created_at_id',
+        'transactions',
+        ['account_id', sa.text('created_at DESC'), 'id'],
+        unique=False
+    )
+
+    # Accounts: WHERE user_id = ? AND is_active = ?
+    op.create_index('ix_accounts_user_id_is_active', 'accounts', ['user_id', 'is_active'], unique=False)
+
+    # Partial index μόνο για ενεργούς λογαριασμούς
+    op.create_index(
+        'ix_accounts_active_user_id_account_type',
+        'accounts',
+        ['user_id', 'account_type'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+        sqlite_where=sa.text('is_active')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_accounts_active_user_id_account_type', table_name='accounts')
+    op.drop_index('ix_accounts_user_id_is_active', table_name='accounts')
+    op.drop_index('ix_transactions_account_id_created_at_id', table_name='transactions')
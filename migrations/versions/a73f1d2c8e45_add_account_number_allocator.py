@@ -0,0 +1,35 @@
+"""Add account number sequence / counter table for block allocation
+
+Revision ID: a73f1d2c8e45
+Revises: 5e2a7c9d4b18
+Create Date: 2026-10-17 11:03:27.640914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a73f1d2c8e45'
+down_revision = '5e2a7c9d4b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('account_number_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO account_number_counters (name, next_value) VALUES ('account_number', 1)")
+
+    # PostgreSQL: hi/lo sequence - κάθε nextval() = block 100 αριθμών
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE SEQUENCE account_number_seq START WITH 1 INCREMENT BY 100')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP SEQUENCE account_number_seq')
+    op.drop_table('account_number_counters')
@@ -0,0 +1,118 @@
+"""Convert transactions into a monthly range-partitioned table (PostgreSQL)
+
+Revision ID: b8d2f4a61c07
+Revises: c41e8b7f2a93
+Create Date: 2026-10-17 15:02:13.551890
+
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d2f4a61c07'
+down_revision = 'c41e8b7f2a93'
+branch_labels = None
+depends_on = None
+
+# Partitions για τους επόμενους μήνες (μετά: flask partitions create)
+MONTHS_AHEAD = 3
+
+COLUMNS = 'id, transaction_type, amount, description, account_id, to_account_id, balance_after, created_at'
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes():
+    # Partitioned indexes - δημιουργούνται και σε κάθε partition
+    op.create_index(
+        'ix_transactions_account_id_created_at_id',
+        'transactions',
+        ['account_id', sa.text('created_at DESC'), 'id'],
+        unique=False
+    )
+    op.create_index('ix_transactions_to_account_id', 'transactions', ['to_account_id'], unique=False)
+
+
+def _rename_old_table(suffix):
+    op.execute(f'ALTER TABLE transactions RENAME TO transactions_{suffix}')
+    op.execute(f'ALTER INDEX ix_transactions_account_id_created_at_id RENAME TO ix_transactions_{suffix}_account_id_created_at_id')
+    op.execute(f'ALTER INDEX ix_transactions_to_account_id RENAME TO ix_transactions_{suffix}_to_account_id')
+    op.execute(f'ALTER TABLE transactions_{suffix} RENAME CONSTRAINT transactions_pkey TO transactions_{suffix}_pkey')
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite/άλλα: ο πίνακας μένει ως έχει
+        return
+
+    _rename_old_table('unpartitioned')
+
+    # Το PK ενός partitioned table πρέπει να περιέχει το partition key.
+    # Το id παραμένει μοναδικό από το sequence (το ORM το βλέπει ως PK)
+    op.execute("""
+        CREATE TABLE transactions (
+            id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'),
+            transaction_type VARCHAR(20) NOT NULL,
+            amount NUMERIC(12, 2) NOT NULL,
+            description VARCHAR(255),
+            account_id INTEGER NOT NULL REFERENCES accounts (id),
+            to_account_id INTEGER,
+            balance_after NUMERIC(12, 2) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT transactions_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+
+    # Ένα partition ανά μήνα από την παλαιότερη συναλλαγή έως MONTHS_AHEAD μήνες μπροστά
+    oldest = bind.execute(sa.text('SELECT min(created_at) FROM transactions_unpartitioned')).scalar()
+    now = datetime.now(timezone.utc)
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_{month:%Y_%m} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        month = end
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions DEFAULT')
+
+    op.execute(f'INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned')
+    op.drop_table('transactions_unpartitioned')
+    _create_indexes()
+    op.execute('ANALYZE transactions')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # Τα detached partitions (flask partitions detach) ΔΕΝ επιστρέφουν
+    _rename_old_table('partitioned')
+
+    op.execute("""
+        CREATE TABLE transactions (
+            id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'),
+            transaction_type VARCHAR(20) NOT NULL,
+            amount NUMERIC(12, 2) NOT NULL,
+            description VARCHAR(255),
+            account_id INTEGER NOT NULL REFERENCES accounts (id),
+            to_account_id INTEGER,
+            balance_after NUMERIC(12, 2) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT transactions_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+    op.execute(f'INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_partitioned')
+    # DROP του parent σβήνει και όλα τα attached partitions
+    op.drop_table('transactions_partitioned')
+    _create_indexes()
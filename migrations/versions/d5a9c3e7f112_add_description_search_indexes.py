@@ -0,0 +1,61 @@
+"""Add indexed description search (pg_trgm GIN / SQLite FTS5 trigram)
+
+Revision ID: d5a9c3e7f112
+Revises: b8d2f4a61c07
+Create Date: 2026-10-17 16:48:05.217364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9c3e7f112'
+down_revision = 'b8d2f4a61c07'
+branch_labels = None
+depends_on = None
+
+
+def _sqlite_trigram_fts(bind):
+    # Ο trigram tokenizer υπάρχει από το SQLite 3.34
+    return bind.dialect.name == 'sqlite' and bind.dialect.dbapi.sqlite_version_info >= (3, 34, 0)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        # Partitioned index - δημιουργείται και σε κάθε μηνιαίο partition
+        op.create_index(
+            'ix_transactions_description_trgm',
+            'transactions',
+            ['description'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'}
+        )
+    elif _sqlite_trigram_fts(bind):
+        op.execute(
+            "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+            "description, content='transactions', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+            "INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+            "INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description); END"
+        )
+        # Index των υπαρχουσών γραμμών
+        op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_transactions_description_trgm', table_name='transactions')
+    elif _sqlite_trigram_fts(bind):
+        op.execute('DROP TRIGGER IF EXISTS transactions_fts_delete')
+        op.execute('DROP TRIGGER IF EXISTS transactions_fts_insert')
+        op.execute('DROP TABLE IF EXISTS transactions_fts')
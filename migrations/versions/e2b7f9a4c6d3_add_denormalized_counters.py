@@ -0,0 +1,46 @@
+"""Add denormalized transaction/account counters to accounts and users
+
+Revision ID: e2b7f9a4c6d3
+Revises: d5a9c3e7f112
+Create Date: 2026-10-17 18:21:44.730512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7f9a4c6d3'
+down_revision = 'd5a9c3e7f112'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('transaction_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_transaction_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('active_accounts_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Αρχικές τιμές από τα υπάρχοντα δεδομένα (ίδια λογική με το flask counters reconcile)
+    op.execute("""
+        UPDATE accounts SET
+            transaction_count = (SELECT count(*) FROM transactions WHERE transactions.account_id = accounts.id),
+            last_transaction_at = (SELECT max(created_at) FROM transactions WHERE transactions.account_id = accounts.id)
+    """)
+    op.execute("""
+        UPDATE users SET active_accounts_count = (
+            SELECT count(*) FROM accounts WHERE accounts.user_id = users.id AND accounts.is_active
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('active_accounts_count')
+
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.drop_column('last_transaction_at')
+        batch_op.drop_column('transaction_count')
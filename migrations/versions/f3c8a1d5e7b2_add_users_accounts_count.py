@@ -0,0 +1,33 @@
+"""Add denormalized total accounts_count to users
+
+Revision ID: f3c8a1d5e7b2
+Revises: e2b7f9a4c6d3
+Create Date: 2026-10-18 10:12:37.214903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8a1d5e7b2'
+down_revision = 'e2b7f9a4c6d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('accounts_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Όλοι οι λογαριασμοί του user, και οι inactive (ίδια λογική με το flask counters reconcile)
+    op.execute("""
+        UPDATE users SET accounts_count = (
+            SELECT count(*) FROM accounts WHERE accounts.user_id = users.id
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('accounts_count')
@@ -0,0 +1,81 @@
+"""
+Concurrency test για το POST /api/transactions/batch
+
+Πολλά ταυτόχρονα batches στον ίδιο λογαριασμό, σε SQLite αρχείο (το
+in-memory του TestingConfig είναι ένα μόνο connection): κανένα update δεν
+χάνεται, το balance δεν γίνεται αρνητικό και το transaction_count
+συμφωνεί με τις γραμμές του transactions. Τρέχει με:
+    python -m unittest tests.test_batch
+    python -m pytest -q tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from app import create_app, db
+from app.config import config, TestingConfig
+from app.models import Account, Transaction
+
+PASSWORD = 'TestPass123'
+REQUESTS = 300
+THREADS = 16
+
+class ConcurrentBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='bank-test-')
+        config['testing_file'] = type('FileTestingConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(self.tmpdir, 'bank.db')}",
+            # Στα concurrent requests μετράει η ορθότητα, όχι το budget
+            'QUERY_BUDGET_MODE': 'off'
+        })
+        self.app = create_app('testing_file')
+        with self.app.app_context():
+            db.create_all()
+
+        client = self.app.test_client()
+        response = client.post('/api/auth/register', json={
+            'email': 'batch@example.com',
+            'password': PASSWORD,
+            'first_name': 'Test',
+            'last_name': 'User'
+        })
+        self.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        response = client.post('/api/accounts/create', json={
+            'account_type': 'checking',
+            'balance': '100.00'
+        }, headers=self.headers)
+        self.account_id = response.get_json()['account']['id']
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        config.pop('testing_file', None)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def withdraw(self, _):
+        response = self.app.test_client().post('/api/transactions/batch', json={
+            'mode': 'atomic',
+            'items': [{'type': 'withdrawal', 'account_id': self.account_id, 'amount': '1.00'}]
+        }, headers=self.headers)
+        return response.status_code
+
+    def test_concurrent_withdrawals_do_not_overdraw(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            statuses = list(pool.map(self.withdraw, range(REQUESTS)))
+
+        self.assertEqual(statuses.count(201), 100)
+        self.assertEqual(statuses.count(400), REQUESTS - 100)
+
+        with self.app.app_context():
+            account = db.session.get(Account, self.account_id)
+            rows = db.session.query(Transaction).filter_by(account_id=self.account_id).count()
+            self.assertEqual(account.balance, Decimal('0.00'))
+            self.assertEqual(rows, 100)
+            self.assertEqual(account.transaction_count, rows)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Τα denormalized counters (app/counters.py) μένουν ακριβή σε κάθε insert path
+
+Για κάθε τρόπο που γράφονται transactions (deposit/withdraw, group commit,
+transfer, batch, flask seed) το accounts.transaction_count και το
+last_transaction_at πρέπει να συμφωνούν με το COUNT(*)/MAX(created_at)
+του transactions - το account detail βασίζεται σε αυτό. Τρέχει με:
+    python -m unittest tests.test_counters
+    python -m pytest -q tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import func, select
+from app import create_app, db
+from app.config import config, TestingConfig
+from app.counters import reconcile_account_counters, reconcile_user_counters
+from app.models import Account, Transaction, User
+from app.seed import seed_command
+
+PASSWORD = 'TestPass123'
+
+class CounterConsistencyTest(unittest.TestCase):
+
+    group_commit = False
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='bank-test-')
+        config['testing_file'] = type('FileTestingConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(self.tmpdir, 'bank.db')}",
+            'GROUP_COMMIT_ENABLED': self.group_commit
+        })
+        self.app = create_app('testing_file')
+        with self.app.app_context():
+            db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        config.pop('testing_file', None)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def register(self, email):
+        response = self.client.post('/api/auth/register', json={
+            'email': email,
+            'password': PASSWORD,
+            'first_name': 'Test',
+            'last_name': 'User'
+        })
+        return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    def create_account(self, headers, account_type, balance='100.00'):
+        response = self.client.post('/api/accounts/create', json={
+            'account_type': account_type,
+            'balance': balance
+        }, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        return response.get_json()['account']
+
+    def post(self, path, headers, body, status=201):
+        response = self.client.post(path, json=body, headers=headers)
+        self.assertEqual(response.status_code, status, response.get_json())
+        return response.get_json()
+
+    def assert_counters_match(self):
+        with self.app.app_context():
+            actual = dict(db.session.execute(
+                select(
+                    Transaction.account_id,
+                    func.count(Transaction.id)
+                ).group_by(Transaction.account_id)
+            ).all())
+            last = dict(db.session.execute(
+                select(
+                    Transaction.account_id,
+                    func.max(Transaction.created_at)
+                ).group_by(Transaction.account_id)
+            ).all())
+            for account in Account.query.all():
+                self.assertEqual(account.transaction_count, actual.get(account.id, 0), account.account_number)
+                self.assertEqual(account.last_transaction_at, last.get(account.id), account.account_number)
+            # Το reconcile δεν βρίσκει τίποτα να διορθώσει
+            self.assertEqual(reconcile_account_counters(), 0)
+            self.assertEqual(reconcile_user_counters(), 0)
+
+    def test_api_insert_paths(self):
+        owner = self.register('owner@example.com')
+        other = self.register('other@example.com')
+        savings = self.create_account(owner, 'savings')
+        checking = self.create_account(owner, 'checking')
+        target = self.create_account(other, 'savings')
+        empty = self.create_account(other, 'checking')
+
+        # Single deposit / withdraw
+        self.post('/api/transactions/deposit', owner, {'account_id': savings['id'], 'amount': '10.00'})
+        self.post('/api/transactions/withdraw', owner, {'account_id': savings['id'], 'amount': '5.00'})
+        self.post('/api/transactions/withdraw', owner, {'account_id': savings['id'], 'amount': '9999.00'}, status=400)
+
+        # Transfer: μία γραμμή σε κάθε λογαριασμό
+        self.post('/api/transactions/transfer', owner, {
+            'from_account_id': savings['id'],
+            'to_account_number': target['account_number'],
+            'amount': '3.00'
+        })
+        self.post('/api/transactions/transfer', owner, {
+            'from_account_id': checking['id'],
+            'to_account_number': target['account_number'],
+            'amount': '9999.00'
+        }, status=400)
+
+        # Batch: best effort με ένα αποτυχημένο item, atomic που απορρίπτεται
+        self.post('/api/transactions/batch', owner, {
+            'mode': 'best_effort',
+            'items': [
+                {'type': 'deposit', 'account_id': checking['id'], 'amount': '1.00'},
+                {'type': 'withdrawal', 'account_id': checking['id'], 'amount': '9999.00'},
+                {'type': 'transfer', 'from_account_id': checking['id'],
+                 'to_account_number': target['account_number'], 'amount': '2.00'}
+            ]
+        })
+        self.post('/api/transactions/batch', owner, {
+            'mode': 'atomic',
+            'items': [
+                {'type': 'deposit', 'account_id': savings['id'], 'amount': '1.00'},
+                {'type': 'withdrawal', 'account_id': savings['id'], 'amount': '9999.00'}
+            ]
+        }, status=400)
+
+        self.assert_counters_match()
+
+        # Λογαριασμός χωρίς transactions: το detail δεν ψάχνει τις τελευταίες
+        detail = self.client.get(f"/api/accounts/{empty['id']}", headers=other).get_json()
+        self.assertEqual(detail['transactions_count'], 0)
+        self.assertEqual(detail['five_last_transactions'], [])
+        detail = self.client.get(f"/api/accounts/{target['id']}", headers=other).get_json()
+        self.assertEqual(detail['transactions_count'], 2)
+        self.assertEqual(len(detail['five_last_transactions']), 2)
+
+    def test_seed(self):
+        result = self.app.test_cli_runner().invoke(seed_command, [
+            '--users', '20', '--transactions', '500', '--workers', '1'
+        ])
+        self.assertEqual(result.exit_code, 0, result.output)
+        with self.app.app_context():
+            self.assertEqual(db.session.query(func.count(Transaction.id)).scalar(), 500)
+            users = User.query.all()
+            self.assertTrue(all(user.accounts_count == len(user.accounts) for user in users))
+        self.assert_counters_match()
+
+class GroupCommitCounterConsistencyTest(CounterConsistencyTest):
+    """Τα deposit/withdraw περνούν από το group commit"""
+
+    group_commit = True
+
+    def test_seed(self):
+        pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+N+1 regression test για τα bulk serializers (app/serializers.py)
+
+Μια σελίδα με 5 ή με 25 γραμμές πρέπει να κοστίζει τον ίδιο αριθμό
+SQL statements. Τρέχει με:
+    python -m unittest tests.test_serializers
+    python -m pytest -q tests
+"""
+import unittest
+from decimal import Decimal
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Account, Transaction
+
+PASSWORD = 'TestPass123'
+
+def _seed(app, client, rows):
+    """User με `rows` λογαριασμούς και `rows` transactions (μισές transfers)"""
+    response = client.post('/api/auth/register', json={
+        'email': 'serializers@example.com',
+        'password': PASSWORD,
+        'first_name': 'Test',
+        'last_name': 'User'
+    })
+    token = response.get_json()['token']
+
+    with app.app_context():
+        user_id = response.get_json()['user']['id']
+        accounts = [
+            Account(
+                account_number=f'TST{index:010d}',
+                account_type='savings' if index % 2 else 'checking',
+                balance=Decimal('100.00'),
+                user_id=user_id,
+                is_active=True
+            )
+            for index in range(rows)
+        ]
+        db.session.add_all(accounts)
+        db.session.flush()
+        for index, account in enumerate(accounts):
+            target = accounts[(index + 1) % rows]
+            db.session.add(Transaction(
+                transaction_type='transfer' if index % 2 else 'deposit',
+                amount=Decimal('1.00'),
+                description=f'Seed {index}',
+                account_id=account.id,
+                to_account_id=target.id if index % 2 else None,
+                balance_after=Decimal('100.00')
+            ))
+        db.session.commit()
+    return {'Authorization': f'Bearer {token}'}
+
+def _count_queries(app, client, path, headers):
+    """Statements του δεύτερου request (το πρώτο γεμίζει το token cache)"""
+    assert client.get(path, headers=headers).status_code == 200
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+class ConstantQueryCountTest(unittest.TestCase):
+
+    def measure(self, rows, path):
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        headers = _seed(app, client, rows)
+        try:
+            return _count_queries(app, client, path, headers)
+        finally:
+            with app.app_context():
+                db.session.remove()
+                db.drop_all()
+
+    def test_transactions_page(self):
+        small, small_body = self.measure(5, '/api/transactions/?per_page=25')
+        large, large_body = self.measure(25, '/api/transactions/?per_page=25')
+        self.assertEqual(len(small_body['transactions']), 5)
+        self.assertEqual(len(large_body['transactions']), 25)
+        self.assertEqual(small, large)
+
+    def test_accounts_page(self):
+        small, small_body = self.measure(5, '/api/accounts/')
+        large, large_body = self.measure(25, '/api/accounts/')
+        self.assertEqual(len(small_body['accounts']), 5)
+        self.assertEqual(len(large_body['accounts']), 25)
+        self.assertEqual(small, large)
+
+if __name__ == '__main__':
+    unittest.main()